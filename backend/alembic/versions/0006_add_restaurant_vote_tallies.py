@@ -0,0 +1,53 @@
+"""add restaurant vote tallies
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "restaurant_vote_tallies",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("session_id", sa.String(length=36), nullable=False),
+        sa.Column("restaurant_id", sa.Integer(), nullable=False),
+        sa.Column("yes_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("total_count", sa.Integer(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["restaurant_id"], ["restaurants.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["session_id"], ["sessions.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "session_id",
+            "restaurant_id",
+            name="uq_restaurant_vote_tallies_session_restaurant",
+        ),
+    )
+    op.create_index(
+        op.f("ix_restaurant_vote_tallies_session_id"), "restaurant_vote_tallies", ["session_id"], unique=False
+    )
+    op.execute(
+        """
+        INSERT INTO restaurant_vote_tallies (session_id, restaurant_id, yes_count, total_count)
+        SELECT session_id,
+               restaurant_id,
+               SUM(CASE WHEN decision = 'yes' THEN 1 ELSE 0 END),
+               COUNT(*)
+        FROM votes
+        GROUP BY session_id, restaurant_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_restaurant_vote_tallies_session_id"), table_name="restaurant_vote_tallies")
+    op.drop_table("restaurant_vote_tallies")
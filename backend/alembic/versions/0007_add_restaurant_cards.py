@@ -0,0 +1,26 @@
+"""add precomputed restaurant cards
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing rows keep a NULL card and are rebuilt the first time they are served.
+    op.add_column("restaurants", sa.Column("card", sa.JSON(), nullable=True))
+    op.add_column("restaurants", sa.Column("card_version", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("restaurants", "card_version")
+    op.drop_column("restaurants", "card")
@@ -0,0 +1,89 @@
+"""add shared businesses catalog
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "businesses",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("external_id", sa.String(length=128), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("fetched_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("popular_dishes", sa.JSON(), nullable=True),
+        sa.Column("popular_dishes_fetched_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("reviews", sa.JSON(), nullable=True),
+        sa.Column("reviews_fetched_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_businesses_external_id"), "businesses", ["external_id"], unique=True)
+
+    # The most recently ingested copy of each business wins; enrichment that
+    # was merged into source_payload moves to its own columns.
+    op.execute(
+        """
+        INSERT INTO businesses (external_id, payload, fetched_at)
+        SELECT DISTINCT ON (external_id) external_id, COALESCE(source_payload, '{}'::json), created_at
+        FROM restaurants
+        ORDER BY external_id, id DESC
+        """
+    )
+    op.execute(
+        """
+        UPDATE businesses
+        SET popular_dishes = payload -> 'popular_dishes', popular_dishes_fetched_at = fetched_at
+        WHERE payload::jsonb ? 'popular_dishes'
+        """
+    )
+    op.execute(
+        """
+        UPDATE businesses
+        SET reviews = payload -> 'reviews', reviews_fetched_at = fetched_at
+        WHERE payload::jsonb ? 'reviews'
+        """
+    )
+
+    op.add_column("restaurants", sa.Column("business_id", sa.Integer(), nullable=True))
+    op.execute(
+        """
+        UPDATE restaurants
+        SET business_id = businesses.id
+        FROM businesses
+        WHERE businesses.external_id = restaurants.external_id
+        """
+    )
+    op.alter_column("restaurants", "business_id", nullable=False)
+    op.create_foreign_key(
+        "fk_restaurants_business_id_businesses", "restaurants", "businesses", ["business_id"], ["id"]
+    )
+    op.create_index(op.f("ix_restaurants_business_id"), "restaurants", ["business_id"], unique=False)
+    op.drop_column("restaurants", "source_payload")
+
+
+def downgrade() -> None:
+    op.add_column("restaurants", sa.Column("source_payload", sa.JSON(), nullable=True))
+    op.execute(
+        """
+        UPDATE restaurants
+        SET source_payload = businesses.payload
+        FROM businesses
+        WHERE businesses.id = restaurants.business_id
+        """
+    )
+    op.drop_index(op.f("ix_restaurants_business_id"), table_name="restaurants")
+    op.drop_constraint("fk_restaurants_business_id_businesses", "restaurants", type_="foreignkey")
+    op.drop_column("restaurants", "business_id")
+    op.drop_index(op.f("ix_businesses_external_id"), table_name="businesses")
+    op.drop_table("businesses")
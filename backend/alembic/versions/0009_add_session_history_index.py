@@ -0,0 +1,24 @@
+"""add session history index
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_sessions_owner_user_id_created_at", "sessions", ["owner_user_id", "created_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sessions_owner_user_id_created_at", table_name="sessions")
@@ -0,0 +1,24 @@
+"""add session listing indexes
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_sessions_created_at_id", "sessions", ["created_at", "id"], unique=False)
+    op.create_index("ix_sessions_status_created_at", "sessions", ["status", "created_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sessions_status_created_at", table_name="sessions")
+    op.drop_index("ix_sessions_created_at_id", table_name="sessions")
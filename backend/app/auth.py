@@ -0,0 +1,148 @@
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from collections.abc import Callable
+
+import jwt as pyjwt
+from jwt import PyJWK, PyJWKClient, PyJWKSet
+from jwt.exceptions import PyJWKClientError
+
+from .cache import TTLCache
+from .config import env_int
+
+
+JWT_ALGORITHMS = ["RS256", "ES256", "EdDSA"]
+JWT_AUDIENCE = "authenticated"
+
+logger = logging.getLogger(__name__)
+
+# Claims of tokens whose signature has already been checked, keyed by a digest
+# of the token and kept no longer than the token's own exp.
+verified_token_cache = TTLCache(
+    max_bytes=env_int("JWT_CACHE_MAX_BYTES", 1024 * 1024),
+    ttl_seconds=env_int("JWT_CACHE_MAX_TTL_SECONDS", 3600),
+)
+
+
+class JWKSKeyring:
+    """Supabase's signing keys, held in memory and refreshed off the request path.
+
+    ``start`` prefetches the key set and then refreshes it every
+    ``refresh_seconds`` in a background task. A token signed with a key id
+    the ring has not seen, as happens right after a rotation, forces one
+    synchronous refresh, at most once per ``min_refresh_seconds`` while any
+    keys are loaded.
+    """
+
+    def __init__(
+        self,
+        jwks_url: str,
+        *,
+        refresh_seconds: float = 600.0,
+        min_refresh_seconds: float = 30.0,
+        timeout_seconds: float = 5.0,
+        fetch: Callable[[], dict] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.refresh_seconds = refresh_seconds
+        self.min_refresh_seconds = min_refresh_seconds
+        self._fetch = fetch or PyJWKClient(jwks_url, cache_jwk_set=False, timeout=timeout_seconds).fetch_data
+        self._clock = clock
+        self._keys: dict[str, PyJWK] = {}
+        self._lock = threading.Lock()
+        self._last_refresh: float | None = None
+        self._task: asyncio.Task | None = None
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.forced_refreshes = 0
+
+    def refresh(self) -> None:
+        try:
+            key_set = PyJWKSet.from_dict(self._fetch())
+        except Exception:
+            self.refresh_failures += 1
+            raise
+        finally:
+            self._last_refresh = self._clock()
+        self._keys = {key.key_id: key for key in key_set.keys if key.key_id}
+        self.refreshes += 1
+
+    async def start(self) -> None:
+        try:
+            await asyncio.to_thread(self.refresh)
+        except Exception:
+            logger.exception("Failed to prefetch JWKS; keys will be fetched on first use")
+        self._task = asyncio.create_task(self._refresh_periodically())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception:
+                logger.exception("Background JWKS refresh failed")
+
+    def signing_key(self, token: str) -> PyJWK:
+        kid = pyjwt.get_unverified_header(token).get("kid")
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+        with self._lock:
+            key = self._keys.get(kid)
+            since_refresh = None if self._last_refresh is None else self._clock() - self._last_refresh
+            # With no keys at all, as after a failed prefetch, nothing can verify
+            # until a fetch succeeds, so the throttle would only lock users out.
+            throttled = bool(self._keys) and since_refresh is not None and since_refresh < self.min_refresh_seconds
+            if key is None and not throttled:
+                self.forced_refreshes += 1
+                try:
+                    self.refresh()
+                except Exception as exc:
+                    raise PyJWKClientError(f"Failed to fetch JWKS: {exc}") from exc
+                key = self._keys.get(kid)
+        if key is None:
+            raise PyJWKClientError(f"No signing key found for kid {kid!r}")
+        return key
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "keys": len(self._keys),
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "forced_refreshes": self.forced_refreshes,
+        }
+
+
+def verify_token(token: str, keyring: JWKSKeyring) -> dict:
+    """Return the token's claims, checking its signature only the first time it is seen.
+
+    Raises InvalidTokenError for tokens that do not verify, and
+    PyJWKClientError when no key for them can be found; neither is cached.
+    """
+    digest = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    claims = verified_token_cache.get(digest)
+    if claims is not None:
+        return claims
+
+    claims = pyjwt.decode(
+        token,
+        keyring.signing_key(token).key,
+        algorithms=JWT_ALGORITHMS,
+        audience=JWT_AUDIENCE,
+    )
+    exp = claims.get("exp")
+    if isinstance(exp, (int, float)):
+        verified_token_cache.set(digest, claims, ttl_seconds=min(exp - time.time(), verified_token_cache.ttl_seconds))
+    return claims
+
@@ -0,0 +1,286 @@
+import asyncio
+import logging
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta, timezone
+from typing import Literal
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from .cache import SingleFlight, TTLCache
+from .catalog import expire_cards, is_generated_external_id
+from .config import env_int
+from .integrations.yelp_client import YelpClient
+from .models import Business
+from .search_cache import as_utc
+
+
+EnrichmentKind = Literal["popular_dishes", "reviews"]
+
+# Memory tier in front of the businesses catalog's enrichment columns.
+business_enrichment_cache = TTLCache(
+    max_bytes=env_int("BUSINESS_ENRICHMENT_MEMORY_MAX_BYTES", 16 * 1024 * 1024),
+    ttl_seconds=env_int("BUSINESS_ENRICHMENT_TTL_MINUTES", 10080) * 60,
+)
+business_enrichment_flight = SingleFlight()
+business_enrichment_counters: Counter[str] = Counter()
+
+logger = logging.getLogger(__name__)
+
+_refreshing_keys: set[str] = set()
+_refresh_tasks: set[asyncio.Task] = set()
+
+
+def get_enrichment_ttl_minutes() -> int:
+    return env_int("BUSINESS_ENRICHMENT_TTL_MINUTES", 10080)
+
+
+def get_enrichment_negative_ttl_minutes() -> int:
+    return env_int("BUSINESS_ENRICHMENT_NEGATIVE_TTL_MINUTES", 60)
+
+
+def get_enrichment_hard_ttl_minutes() -> int:
+    """Entries past their TTL but younger than this are served stale and refreshed in the background."""
+    return max(env_int("BUSINESS_ENRICHMENT_HARD_TTL_MINUTES", 43200), get_enrichment_ttl_minutes())
+
+
+def get_enrichment_ttl(value: list | None) -> timedelta:
+    """Empty results, which is also how the client reports failed upstream calls, expire sooner."""
+    if value:
+        return timedelta(minutes=get_enrichment_ttl_minutes())
+    return timedelta(minutes=get_enrichment_negative_ttl_minutes())
+
+
+def is_enrichment_fresh(value: list | None, fetched_at: datetime | None, now: datetime) -> bool:
+    return value is not None and fetched_at is not None and as_utc(fetched_at) + get_enrichment_ttl(value) > now
+
+
+def _cache_key(kind: EnrichmentKind, external_id: str) -> str:
+    return f"{kind}:{external_id}"
+
+
+async def _fetch(client: YelpClient, kind: EnrichmentKind, external_id: str) -> list[dict]:
+    if kind == "popular_dishes":
+        return await client.get_popular_dishes_async(external_id)
+    return await client.get_reviews_async(external_id, count=3)
+
+
+async def _store(db: AsyncSession, business_id: int, kind: EnrichmentKind, value: list[dict], now: datetime) -> None:
+    await db.execute(
+        update(Business).where(Business.id == business_id).values({kind: value, f"{kind}_fetched_at": now})
+    )
+    if kind == "popular_dishes":
+        # Cards list popular dishes, so every session dealing this business rebuilds its card.
+        await expire_cards(db, [business_id])
+
+
+def _remember(key: str, value: list[dict], fetched_at: datetime, now: datetime) -> None:
+    remaining = as_utc(fetched_at) + get_enrichment_ttl(value) - now
+    business_enrichment_cache.set(key, value, ttl_seconds=remaining.total_seconds())
+
+
+def _from_memory(business: Business, kind: EnrichmentKind) -> list[dict] | None:
+    cached = business_enrichment_cache.get(_cache_key(kind, business.external_id))
+    if cached is not None:
+        business_enrichment_counters["memory_hits"] += 1
+        if not cached:
+            business_enrichment_counters["negative_hits"] += 1
+    return cached
+
+
+def _from_catalog(
+    db: AsyncSession,
+    get_client: Callable[[], YelpClient],
+    business: Business,
+    kind: EnrichmentKind,
+    now: datetime,
+) -> list[dict] | None:
+    value = getattr(business, kind)
+    fetched_at = getattr(business, f"{kind}_fetched_at")
+    if is_enrichment_fresh(value, fetched_at, now):
+        business_enrichment_counters["db_hits"] += 1
+        if not value:
+            business_enrichment_counters["negative_hits"] += 1
+        _remember(_cache_key(kind, business.external_id), value, fetched_at, now)
+        return value
+
+    hard_ttl = timedelta(minutes=get_enrichment_hard_ttl_minutes())
+    if value is not None and fetched_at is not None and as_utc(fetched_at) + hard_ttl > now:
+        business_enrichment_counters["stale_serves"] += 1
+        _schedule_background_store(
+            db.bind,
+            business.id,
+            business.external_id,
+            kind,
+            lambda: _fetch(get_client(), kind, business.external_id),
+            counter="background_refreshes",
+        )
+        return value
+    return None
+
+
+async def _load_or_fetch(
+    db: AsyncSession,
+    get_client: Callable[[], YelpClient],
+    business: Business,
+    kind: EnrichmentKind,
+) -> list[dict]:
+    now = datetime.now(timezone.utc)
+    value = _from_catalog(db, get_client, business, kind, now)
+    if value is not None:
+        return value
+
+    business_enrichment_counters["misses"] += 1
+    value = await _fetch(get_client(), kind, business.external_id)
+    await _store(db, business.id, kind, value, now)
+    _remember(_cache_key(kind, business.external_id), value, now, now)
+    return value
+
+
+def _schedule_background_store(
+    bind: AsyncEngine,
+    business_id: int,
+    external_id: str,
+    kind: EnrichmentKind,
+    fetch: Callable[[], Awaitable[list[dict]]],
+    *,
+    counter: str,
+) -> bool:
+    """Store ``fetch``'s result in the background; False if the key is already being refreshed."""
+    key = _cache_key(kind, external_id)
+    if key in _refreshing_keys:
+        return False
+    _refreshing_keys.add(key)
+    task = asyncio.create_task(_background_store(bind, business_id, external_id, kind, fetch, counter=counter))
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_tasks.discard)
+    return True
+
+
+def _log_unstored_fetch(task: asyncio.Task) -> None:
+    """Retrieve the outcome of a late fetch that another refresh of the same key made redundant."""
+    if not task.cancelled() and task.exception() is not None:
+        business_enrichment_counters["late_fetches_failures"] += 1
+        logger.error("Late enrichment fetch failed", exc_info=task.exception())
+
+
+async def _background_store(
+    bind: AsyncEngine,
+    business_id: int,
+    external_id: str,
+    kind: EnrichmentKind,
+    fetch: Callable[[], Awaitable[list[dict]]],
+    *,
+    counter: str,
+) -> None:
+    key = _cache_key(kind, external_id)
+    try:
+        value = await fetch()
+        now = datetime.now(timezone.utc)
+        async with AsyncSession(bind=bind, expire_on_commit=False) as refresh_db:
+            await _store(refresh_db, business_id, kind, value, now)
+            await refresh_db.commit()
+        _remember(key, value, now, now)
+        business_enrichment_counters[counter] += 1
+    except Exception:
+        business_enrichment_counters[f"{counter}_failures"] += 1
+        logger.exception("Background enrichment fetch failed for %s", key)
+    finally:
+        _refreshing_keys.discard(key)
+
+
+async def drain_enrichment_refreshes() -> None:
+    """Wait for scheduled enrichment refreshes to finish."""
+    while _refresh_tasks:
+        await asyncio.gather(*list(_refresh_tasks), return_exceptions=True)
+
+
+async def get_business_enrichment(
+    db: AsyncSession,
+    get_client: Callable[[], YelpClient],
+    business: Business,
+    kind: EnrichmentKind,
+) -> list[dict]:
+    """Resolve a business's popular dishes or reviews through memory, the catalog row, then RapidAPI.
+
+    Empty results are cached too, on a shorter TTL, so a business Yelp has
+    nothing for is not re-queried on every request. Callers commit.
+    """
+    if is_generated_external_id(business.external_id):
+        return []
+    cached = _from_memory(business, kind)
+    if cached is not None:
+        return cached
+    key = _cache_key(kind, business.external_id)
+    return await business_enrichment_flight.do(key, lambda: _load_or_fetch(db, get_client, business, kind))
+
+
+async def get_business_enrichment_many(
+    db: AsyncSession,
+    get_client: Callable[[], YelpClient],
+    wanted: list[tuple[Business, EnrichmentKind]],
+    *,
+    concurrency: int,
+    deadline_seconds: float,
+) -> dict[tuple[int, EnrichmentKind], list[dict]]:
+    """Resolve many (business, kind) pairs at once, keyed by (business id, kind).
+
+    Cached pairs resolve without I/O. Misses are fetched with at most
+    ``concurrency`` upstream calls in flight; whatever is still running at
+    the deadline is left out of the result and finishes in the background,
+    so a later request finds it cached.
+    """
+    now = datetime.now(timezone.utc)
+    resolved: dict[tuple[int, EnrichmentKind], list[dict]] = {}
+    missing: list[tuple[Business, EnrichmentKind]] = []
+    for business, kind in wanted:
+        if is_generated_external_id(business.external_id):
+            resolved[(business.id, kind)] = []
+            continue
+        value = _from_memory(business, kind)
+        if value is None:
+            value = _from_catalog(db, get_client, business, kind, now)
+        if value is None:
+            missing.append((business, kind))
+        else:
+            resolved[(business.id, kind)] = value
+    if not missing:
+        return resolved
+
+    client = get_client()
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    business_enrichment_counters["misses"] += len(missing)
+
+    async def fetch_one(external_id: str, kind: EnrichmentKind) -> list[dict]:
+        async with semaphore:
+            return await business_enrichment_flight.do(
+                _cache_key(kind, external_id), lambda: _fetch(client, kind, external_id)
+            )
+
+    tasks = {
+        asyncio.create_task(fetch_one(business.external_id, kind)): (business, kind) for business, kind in missing
+    }
+    _, pending = await asyncio.wait(tasks, timeout=deadline_seconds)
+    for task, (business, kind) in tasks.items():
+        if task in pending:
+            if not _schedule_background_store(
+                db.bind, business.id, business.external_id, kind, lambda task=task: task, counter="late_fetches"
+            ):
+                task.add_done_callback(_log_unstored_fetch)
+            continue
+        if task.cancelled() or task.exception() is not None:
+            continue
+        value = task.result()
+        # One session cannot run statements concurrently, so writes happen here, in turn.
+        await _store(db, business.id, kind, value, now)
+        _remember(_cache_key(kind, business.external_id), value, now, now)
+        resolved[(business.id, kind)] = value
+    return resolved
+
+
+def business_enrichment_stats() -> dict[str, float | int]:
+    counters = dict(business_enrichment_counters)
+    served = sum(counters.get(name, 0) for name in ("memory_hits", "db_hits", "stale_serves"))
+    lookups = served + counters.get("misses", 0)
+    return {**counters, "hit_rate": round(served / lookups, 4) if lookups else 0.0}
@@ -0,0 +1,104 @@
+import json
+import os
+import re
+from pathlib import Path
+
+
+BUNDLED_ALIASES_PATH = Path(__file__).resolve().parent / "data" / "query_aliases.json"
+
+_NON_WORD = re.compile(r"[^\w&]+")
+
+
+def normalize_text(value: str) -> str:
+    """Lowercase, turn punctuation into spaces and collapse runs of whitespace."""
+    return " ".join(_NON_WORD.sub(" ", value.lower()).split())
+
+
+class QueryCanonicalizer:
+    """Maps a search's term and location text onto the form used in cache keys.
+
+    Only the cache key is canonicalized; upstream still receives what the
+    host typed, so a row fetched for one spelling serves every alias of it.
+    """
+
+    def term(self, value: str) -> str:
+        return normalize_text(value)
+
+    def location(self, value: str) -> str:
+        return normalize_text(value)
+
+
+class AliasTableCanonicalizer(QueryCanonicalizer):
+    """Canonicalizes through an offline alias table: ``{"states", "locations", "terms"}``.
+
+    ``locations`` and ``terms`` map a canonical form to its aliases. Full
+    state names trailing a location are shortened to their postal code
+    before the alias lookup, so "Oakland, California" and "oakland ca" agree
+    without listing both.
+    """
+
+    def __init__(self, table: dict) -> None:
+        states = {normalize_text(name): normalize_text(code) for name, code in table.get("states", {}).items()}
+        # Longest names first, so "west virginia" is not read as "virginia".
+        self._states = sorted(states.items(), key=lambda item: len(item[0]), reverse=True)
+        self._locations = self._invert(table.get("locations", {}))
+        self._terms = self._invert(table.get("terms", {}))
+
+    @classmethod
+    def from_paths(cls, *paths: Path | str) -> "AliasTableCanonicalizer":
+        """Load tables in order; later files add aliases and override state codes."""
+        merged: dict[str, dict] = {"states": {}, "locations": {}, "terms": {}}
+        for path in paths:
+            with open(path, encoding="utf-8") as handle:
+                table = json.load(handle)
+            merged["states"].update(table.get("states", {}))
+            for section in ("locations", "terms"):
+                for canonical, names in table.get(section, {}).items():
+                    merged[section].setdefault(canonical, []).extend(names)
+        return cls(merged)
+
+    @staticmethod
+    def _invert(groups: dict[str, list[str]]) -> dict[str, str]:
+        aliases: dict[str, str] = {}
+        for canonical, names in groups.items():
+            canonical = normalize_text(canonical)
+            aliases[canonical] = canonical
+            for name in names:
+                aliases[normalize_text(name)] = canonical
+        return aliases
+
+    def term(self, value: str) -> str:
+        normalized = normalize_text(value)
+        return self._terms.get(normalized, normalized)
+
+    def location(self, value: str) -> str:
+        normalized = normalize_text(value)
+        if normalized in self._locations:
+            return self._locations[normalized]
+        for name, code in self._states:
+            if normalized.endswith(f" {name}"):
+                normalized = f"{normalized[: -len(name)]}{code}"
+                break
+        return self._locations.get(normalized, normalized)
+
+
+def build_canonicalizer_from_env() -> QueryCanonicalizer:
+    """The bundled alias table, extended by QUERY_ALIASES_PATH when set."""
+    paths: list[Path | str] = [BUNDLED_ALIASES_PATH]
+    extra = os.getenv("QUERY_ALIASES_PATH", "").strip()
+    if extra:
+        paths.append(extra)
+    return AliasTableCanonicalizer.from_paths(*paths)
+
+
+_canonicalizer: QueryCanonicalizer = build_canonicalizer_from_env()
+
+
+def get_canonicalizer() -> QueryCanonicalizer:
+    return _canonicalizer
+
+
+def set_canonicalizer(canonicalizer: QueryCanonicalizer) -> None:
+    """Swap the canonicalization used for cache keys, e.g. for a geocoder-backed one."""
+    global _canonicalizer
+    _canonicalizer = canonicalizer
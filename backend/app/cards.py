@@ -0,0 +1,132 @@
+from collections.abc import Mapping
+from typing import Any
+
+from .models import Business, Restaurant
+from .schemas import HoursItem, PhotoItem, PopularDishItem, RestaurantCard
+
+
+# Bump whenever the card shape or the way it is derived from the business
+# payload changes; rows stamped with an older version are rebuilt the next
+# time they are served.
+CARD_SCHEMA_VERSION = 1
+
+
+def _fmt_time(t: str) -> str:
+    h, m = int(t[:2]), int(t[2:])
+    period = "AM" if h < 12 else "PM"
+    h = h % 12 or 12
+    return f"{h}:{m:02d} {period}"
+
+
+CARD_COLUMNS = ("name", "image_url", "address", "price", "rating", "review_count")
+
+
+def normalize_card(columns: Mapping[str, Any], business: Business, restaurant_id: int = 0) -> RestaurantCard:
+    """Derive the swipe card from a restaurant's display columns and its business's raw Yelp payload."""
+    payload = business.payload or {}
+
+    raw_cats = payload.get("categories") or []
+    categories = [c.get("name") or c.get("title") for c in raw_cats if c.get("name") or c.get("title")]
+
+    raw_photos = payload.get("photos") or []
+    photos: list[PhotoItem] = []
+    for p in raw_photos[:6]:
+        prefix = p.get("url_prefix", "")
+        suffix = p.get("url_suffix", ".jpg")
+        if prefix:
+            photos.append(PhotoItem(url=f"{prefix}l{suffix}", caption=p.get("caption") or None))
+
+    hours: list[HoursItem] | None = None
+    raw_hours = payload.get("hours") or []
+    if raw_hours:
+        day_names = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+        regular = next((h for h in raw_hours if h.get("hours_type") == "REGULAR"), raw_hours[0])
+        parsed = []
+        for slot in regular.get("open") or []:
+            start, end = slot.get("start", ""), slot.get("end", "")
+            if start and end:
+                parsed.append(HoursItem(
+                    day=day_names[slot.get("day", 0) % 7],
+                    hours=f"{_fmt_time(start)} – {_fmt_time(end)}",
+                ))
+        if parsed:
+            hours = parsed
+
+    alias = payload.get("alias")
+    yelp_url = f"https://www.yelp.com/biz/{alias}" if alias else None
+
+    phone = payload.get("localized_phone") or payload.get("phone") or None
+
+    short_address = None
+    addresses = payload.get("addresses") or {}
+    primary = addresses.get("primary_language") or {}
+    short_address = primary.get("short_form") or None
+
+    popular_dishes_raw = business.popular_dishes or []
+    popular_dishes = [
+        PopularDishItem(
+            display_name=d.get("display_name", ""),
+            review_count=d.get("review_count", 0),
+            photo_url=d.get("photo_url"),
+            photo_count=d.get("photo_count", 0),
+        )
+        for d in popular_dishes_raw
+    ] or None
+
+    return RestaurantCard(
+        id=restaurant_id,
+        **{column: columns[column] for column in CARD_COLUMNS},
+        categories=categories,
+        photos=photos,
+        hours=hours,
+        yelp_url=yelp_url,
+        phone=phone,
+        short_address=short_address,
+        popular_dishes=popular_dishes,
+    )
+
+
+def normalize_restaurant_card(restaurant: Restaurant) -> RestaurantCard:
+    columns = {column: getattr(restaurant, column) for column in CARD_COLUMNS}
+    return normalize_card(columns, restaurant.business, restaurant.id or 0)
+
+
+def compact_card_for(columns: Mapping[str, Any], business: Business) -> dict:
+    """The stored form of a card: JSON-ready, without the id or fields left at their defaults."""
+    return normalize_card(columns, business).model_dump(mode="json", exclude={"id"}, exclude_defaults=True)
+
+
+def compact_card(restaurant: Restaurant) -> dict:
+    columns = {column: getattr(restaurant, column) for column in CARD_COLUMNS}
+    return compact_card_for(columns, restaurant.business)
+
+
+def stamp_card(restaurant: Restaurant) -> None:
+    restaurant.card = compact_card(restaurant)
+    restaurant.card_version = CARD_SCHEMA_VERSION
+
+
+def card_is_current(restaurant: Restaurant) -> bool:
+    return restaurant.card is not None and restaurant.card_version == CARD_SCHEMA_VERSION
+
+
+async def load_card_sources(restaurants: list[Restaurant]) -> None:
+    """Load the business, and its deferred payload, for rows whose card needs a rebuild.
+
+    Async sessions cannot lazy-load on attribute access, so call this before
+    build_restaurant_card on rows that came from an AsyncSession.
+    """
+    for restaurant in restaurants:
+        if not card_is_current(restaurant):
+            business = await restaurant.awaitable_attrs.business
+            await business.awaitable_attrs.payload
+
+
+def build_restaurant_card(restaurant: Restaurant) -> RestaurantCard:
+    """Serve the precomputed card, rebuilding it first if it predates CARD_SCHEMA_VERSION.
+
+    A rebuild marks the row dirty; callers that want it persisted commit.
+    """
+    if not card_is_current(restaurant):
+        stamp_card(restaurant)
+    return RestaurantCard.model_validate({**restaurant.card, "id": restaurant.id})
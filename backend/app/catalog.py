@@ -0,0 +1,49 @@
+from sqlalchemy import func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from .database import dialect_insert
+from .models import Business, Restaurant
+
+
+# Stand-in ids for results Yelp returned without an id or alias. They are
+# scoped to one session and mean nothing upstream, so they are never enriched.
+GENERATED_ID_PREFIX = "generated-"
+
+
+def is_generated_external_id(external_id: str) -> bool:
+    return external_id.startswith(GENERATED_ID_PREFIX)
+
+
+async def upsert_businesses(db: AsyncSession, payloads: dict[str, dict]) -> dict[str, Business]:
+    """Insert or refresh catalog rows for a batch of Yelp businesses, keyed by external_id.
+
+    A conflict only replaces the payload and its fetch time, so enrichment
+    already stored for a business carries over to the new session. The
+    payload is not sent back by RETURNING; the caller already holds it.
+    """
+    if not payloads:
+        return {}
+    insert = dialect_insert(db)
+    # Rows are locked in statement order; a fixed order keeps two sessions
+    # upserting overlapping decks from deadlocking on each other.
+    stmt = insert(Business).values(
+        [{"external_id": external_id, "payload": payloads[external_id]} for external_id in sorted(payloads)]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["external_id"],
+        set_={"payload": stmt.excluded.payload, "fetched_at": func.now()},
+    )
+    result = await db.scalars(stmt.returning(Business), execution_options={"populate_existing": True})
+    businesses = {business.external_id: business for business in result.all()}
+    for external_id, business in businesses.items():
+        set_committed_value(business, "payload", payloads[external_id])
+    return businesses
+
+
+async def expire_cards(db: AsyncSession, business_ids: list[int]) -> None:
+    """Mark every session's card for these businesses stale so it is rebuilt on next serve."""
+    if business_ids:
+        await db.execute(
+            update(Restaurant).where(Restaurant.business_id.in_(business_ids)).values(card_version=None)
+        )
@@ -0,0 +1,139 @@
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from .cards import CARD_SCHEMA_VERSION, compact_card_for
+from .catalog import GENERATED_ID_PREFIX, upsert_businesses
+from .models import Restaurant
+
+
+def build_yelp_photo_url(photo: dict | None) -> str | None:
+    if not isinstance(photo, dict):
+        return None
+
+    direct_url = photo.get("url") or photo.get("photo_url")
+    if isinstance(direct_url, str) and direct_url.strip():
+        return direct_url.strip()
+
+    url_prefix = photo.get("url_prefix")
+    url_suffix = photo.get("url_suffix")
+    if isinstance(url_prefix, str) and isinstance(url_suffix, str) and url_prefix.strip() and url_suffix.strip():
+        return f"{url_prefix.strip()}o{url_suffix.strip()}"
+
+    return None
+
+
+def extract_business_image_url(item: dict) -> str | None:
+    primary_photo = item.get("primary_photo")
+    if isinstance(primary_photo, str) and primary_photo.strip():
+        return primary_photo.strip()
+
+    primary_photo_url = build_yelp_photo_url(primary_photo if isinstance(primary_photo, dict) else None)
+    if primary_photo_url:
+        return primary_photo_url
+
+    for key in ("photos", "menu_photos"):
+        photos = item.get(key)
+        if isinstance(photos, list):
+            for photo in photos:
+                photo_url = build_yelp_photo_url(photo if isinstance(photo, dict) else None)
+                if photo_url:
+                    return photo_url
+
+    direct_fields = [
+        item.get("image_url"),
+        item.get("photo_url"),
+    ]
+    for value in direct_fields:
+        if isinstance(value, str) and value.strip():
+            return value.strip()
+
+    return None
+
+
+def business_external_id(item: dict, index: int, session_id: str) -> str:
+    """Yelp's id for the business, or one scoped to this session when Yelp gave none.
+
+    The catalog is shared across sessions, so a positional stand-in must not
+    let two sessions' unrelated id-less results land on one businesses row.
+    """
+    return str(item.get("id") or item.get("alias") or f"{GENERATED_ID_PREFIX}{session_id}-{index}")
+
+
+def key_businesses(businesses: list[dict], session_id: str, *, start_index: int = 0) -> dict[str, dict]:
+    """Map each business to its external id, keeping the first of any duplicates.
+
+    Decks appended to an existing one pass a ``start_index`` past it, so
+    generated ids for businesses without one do not collide.
+    """
+    keyed: dict[str, dict] = {}
+    for index, item in enumerate(businesses, start_index):
+        keyed.setdefault(business_external_id(item, index, session_id), item)
+    return keyed
+
+
+def restaurant_columns(item: dict, image_url: str | None) -> dict:
+    location = item.get("location") or {}
+    coordinates = item.get("coordinates") or {}
+    display_address = location.get("display_address")
+    if isinstance(display_address, list):
+        address = ", ".join(str(part) for part in display_address)
+    else:
+        address = location.get("address1")
+
+    return {
+        "name": str(item.get("name") or "Unknown Restaurant"),
+        "image_url": image_url,
+        "address": address,
+        "lat": coordinates.get("latitude"),
+        "lng": coordinates.get("longitude"),
+        "price": item.get("price"),
+        "rating": item.get("rating"),
+        "review_count": item.get("review_count"),
+    }
+
+
+async def persist_deck(
+    db: AsyncSession,
+    session_id: str,
+    payloads: dict[str, dict],
+    *,
+    fallback_image_urls: list[str],
+) -> list[Restaurant]:
+    """Write a deck of Yelp businesses, keyed by external id, in two set-based statements.
+
+    The catalog upsert and the restaurants insert each go out as multi-row
+    INSERT ... RETURNING (batched by SQLAlchemy's insertmanyvalues), so the
+    round trips stay flat as decks grow. Cards are computed up front and
+    written with the rows. ``fallback_image_urls`` is consumed in order for
+    businesses without a photo.
+    """
+    if not payloads:
+        return []
+    catalog = await upsert_businesses(db, payloads)
+
+    rows = []
+    for external_id, item in payloads.items():
+        image_url = extract_business_image_url(item)
+        if image_url is None and fallback_image_urls:
+            image_url = fallback_image_urls.pop(0)
+        columns = restaurant_columns(item, image_url)
+        business = catalog[external_id]
+        rows.append(
+            {
+                "session_id": session_id,
+                "external_id": external_id,
+                "business_id": business.id,
+                "card": compact_card_for(columns, business),
+                "card_version": CARD_SCHEMA_VERSION,
+                **columns,
+            }
+        )
+
+    # Asking RETURNING for parameter order makes SQLite fall back to one
+    # INSERT per row, so rows are matched back up by external_id instead.
+    result = await db.scalars(insert(Restaurant).returning(Restaurant), rows)
+    restaurants = sorted(result.all(), key=lambda restaurant: restaurant.id)
+    for restaurant in restaurants:
+        set_committed_value(restaurant, "business", catalog[restaurant.external_id])
+    return restaurants
@@ -0,0 +1,122 @@
+import asyncio
+from datetime import datetime, timezone
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from .business_cache import EnrichmentKind, is_enrichment_fresh
+from .cards import CARD_SCHEMA_VERSION, compact_card
+from .catalog import expire_cards, is_generated_external_id
+from .integrations.yelp_client import YelpClient
+from .models import Business, Restaurant
+
+
+ENRICHMENT_KINDS: tuple[EnrichmentKind, ...] = ("popular_dishes", "reviews")
+
+
+async def fetch_enrichment(
+    client: YelpClient,
+    wanted: dict[str, list[EnrichmentKind]],
+    *,
+    concurrency: int,
+    time_budget_seconds: float,
+) -> dict[str, dict]:
+    """Fetch the listed kinds of enrichment (popular dishes, reviews) for many businesses at once.
+
+    At most ``concurrency`` businesses are in flight. Whatever has not
+    finished when the time budget runs out is cancelled and left out, so the
+    caller gets a partial result instead of waiting on a slow upstream.
+    """
+    if not wanted:
+        return {}
+
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def fetch_kind(external_id: str, kind: EnrichmentKind) -> list[dict]:
+        if kind == "popular_dishes":
+            return await client.get_popular_dishes_async(external_id)
+        return await client.get_reviews_async(external_id, count=3)
+
+    async def enrich_one(external_id: str, kinds: list[EnrichmentKind]) -> tuple[str, dict]:
+        async with semaphore:
+            values = await asyncio.gather(*(fetch_kind(external_id, kind) for kind in kinds))
+        return external_id, dict(zip(kinds, values))
+
+    tasks = [asyncio.create_task(enrich_one(external_id, kinds)) for external_id, kinds in wanted.items()]
+    done, pending = await asyncio.wait(tasks, timeout=time_budget_seconds)
+    for task in pending:
+        task.cancel()
+
+    enriched: dict[str, dict] = {}
+    for task in done:
+        if task.cancelled() or task.exception() is not None:
+            continue
+        external_id, data = task.result()
+        enriched[external_id] = data
+    return enriched
+
+
+async def enrich_restaurants(
+    db: AsyncSession,
+    client: YelpClient,
+    restaurants: list[Restaurant],
+    *,
+    concurrency: int,
+    time_budget_seconds: float,
+) -> int:
+    """Enrich the deck's businesses whose catalog enrichment is missing or past its TTL.
+
+    Dishes and reviews age separately, so only the stale kind is fetched.
+    Results land on the shared businesses rows with bulk UPDATEs, so later
+    sessions dealing the same business skip the upstream calls. Cards for
+    those businesses are expired everywhere and restamped for this deck.
+    """
+    now = datetime.now(timezone.utc)
+    businesses = {restaurant.business.external_id: restaurant.business for restaurant in restaurants}
+    wanted = {}
+    for external_id, business in businesses.items():
+        if is_generated_external_id(external_id):
+            continue
+        kinds = [
+            kind
+            for kind in ENRICHMENT_KINDS
+            if not is_enrichment_fresh(getattr(business, kind), getattr(business, f"{kind}_fetched_at"), now)
+        ]
+        if kinds:
+            wanted[external_id] = kinds
+    enriched = await fetch_enrichment(
+        client,
+        wanted,
+        concurrency=concurrency,
+        time_budget_seconds=time_budget_seconds,
+    )
+    if not enriched:
+        return 0
+
+    business_rows = []
+    for external_id, data in enriched.items():
+        business = businesses[external_id]
+        values = {}
+        for kind, value in data.items():
+            values[kind] = value
+            values[f"{kind}_fetched_at"] = now
+        # Keep the loaded objects in step without marking them dirty; the bulk
+        # UPDATEs below are the only writes.
+        for key, value in values.items():
+            set_committed_value(business, key, value)
+        business_rows.append({"id": business.id, **values})
+    await db.execute(update(Business), business_rows)
+
+    enriched_ids = {row["id"] for row in business_rows}
+    await expire_cards(db, list(enriched_ids))
+    card_rows = []
+    for restaurant in restaurants:
+        if restaurant.business_id not in enriched_ids:
+            continue
+        card = compact_card(restaurant)
+        set_committed_value(restaurant, "card", card)
+        set_committed_value(restaurant, "card_version", CARD_SCHEMA_VERSION)
+        card_rows.append({"id": restaurant.id, "card": card, "card_version": CARD_SCHEMA_VERSION})
+    await db.execute(update(Restaurant), card_rows)
+    return len(business_rows)
@@ -1,3 +1,6 @@
+import asyncio
+from collections import defaultdict
+
 import httpx
 
 
@@ -9,41 +12,153 @@ class MissingRapidAPIConfigError(YelpClientError):
     pass
 
 
+class HostLimitedTransport(httpx.AsyncBaseTransport):
+    """Caps in-flight requests per host on top of the pool-wide connection limit."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_per_host: int) -> None:
+        self._transport = transport
+        self._max_per_host = max_per_host
+        self._semaphores: dict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(self._max_per_host))
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        async with self._semaphores[request.url.host]:
+            response = await self._transport.handle_async_request(request)
+            await response.aread()
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def build_async_http_client(
+    *,
+    max_connections: int = 20,
+    max_keepalive_connections: int = 10,
+    max_connections_per_host: int = 10,
+    keepalive_expiry: float = 30.0,
+    http2: bool = True,
+    timeout: float = 10.0,
+) -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry,
+    )
+    transport = HostLimitedTransport(
+        httpx.AsyncHTTPTransport(http2=http2, limits=limits),
+        max_per_host=max_connections_per_host,
+    )
+    return httpx.AsyncClient(transport=transport, timeout=timeout)
+
+
+def _extract_businesses(payload) -> list[dict]:
+    # RapidAPI Yelp providers vary in response envelope.
+    businesses = None
+    if isinstance(payload, dict):
+        if isinstance(payload.get("businesses"), list):
+            businesses = payload["businesses"]
+        elif isinstance(payload.get("results"), list):
+            businesses = payload["results"]
+        elif isinstance(payload.get("data"), list):
+            businesses = payload["data"]
+        elif isinstance(payload.get("business_search_result"), list):
+            businesses = payload["business_search_result"]
+        elif isinstance(payload.get("ad_business_search_result"), list):
+            businesses = payload["ad_business_search_result"]
+    elif isinstance(payload, list):
+        businesses = payload
+
+    if not isinstance(businesses, list):
+        if isinstance(payload, dict):
+            keys = ", ".join(sorted(payload.keys()))
+            raise YelpClientError(
+                f"RapidAPI Yelp response missing list field. Top-level keys: [{keys}]"
+            )
+        raise YelpClientError("RapidAPI Yelp response missing list field")
+
+    return businesses
+
+
+def _extract_reviews(payload: dict) -> list[dict]:
+    results = []
+    for r in payload.get("reviews", []):
+        profile_photo = (r.get("author") or {}).get("profilePhoto") or {}
+        photo_url = (profile_photo.get("photoUrl") or {}).get("userSrc")
+        results.append({
+            "text": (r.get("text") or {}).get("full", ""),
+            "rating": r.get("rating", 0),
+            "author_name": (r.get("author") or {}).get("displayName", ""),
+            "author_location": (r.get("author") or {}).get("displayLocation"),
+            "author_photo_url": photo_url,
+            "created_at": r.get("reviewCreatedAt", ""),
+        })
+    return results
+
+
 class YelpClient:
-    def __init__(self, api_key: str, api_host: str, base_url: str) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        api_host: str,
+        base_url: str,
+        http_client: httpx.AsyncClient | None = None,
+    ) -> None:
         self.api_key = api_key
         self.api_host = api_host
         self.base_url = base_url.rstrip("/")
+        self.http_client = http_client
+
+    def _headers(self) -> dict[str, str]:
+        return {
+            "X-RapidAPI-Key": self.api_key,
+            "X-RapidAPI-Host": self.api_host,
+        }
 
-    def search_businesses(
+    def _search_params(
         self,
         *,
         term: str,
         location: str,
         price: str | None,
         radius_meters: int | None,
-        limit: int = 30,
-    ) -> list[dict]:
-        headers = {
-            "X-RapidAPI-Key": self.api_key,
-            "X-RapidAPI-Host": self.api_host,
-        }
+        limit: int,
+        offset: int = 0,
+    ) -> dict[str, str | int]:
         params: dict[str, str | int] = {
             "search_term": term,
             "location": location,
             "limit": limit,
-            "offset": 0,
+            "offset": offset,
             "business_details_type": "basic",
         }
         if price:
             params["price"] = price
         if radius_meters:
             params["radius"] = radius_meters
+        return params
+
+    async def _aget(self, url: str, params: dict) -> httpx.Response:
+        if self.http_client is not None:
+            return await self.http_client.get(url, headers=self._headers(), params=params)
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            return await client.get(url, headers=self._headers(), params=params)
 
+    async def search_businesses_async(
+        self,
+        *,
+        term: str,
+        location: str,
+        price: str | None,
+        radius_meters: int | None,
+        limit: int = 30,
+        offset: int = 0,
+    ) -> list[dict]:
+        params = self._search_params(
+            term=term, location=location, price=price, radius_meters=radius_meters, limit=limit, offset=offset
+        )
         url = f"{self.base_url}/search"
         try:
-            with httpx.Client(timeout=10.0) as client:
-                response = client.get(url, headers=headers, params=params)
+            response = await self._aget(url, params)
             if response.status_code >= 400:
                 detail = response.text[:300]
                 raise YelpClientError(
@@ -52,43 +167,12 @@ class YelpClient:
         except httpx.HTTPError as exc:
             raise YelpClientError("Failed to fetch restaurants from RapidAPI Yelp") from exc
 
-        payload = response.json()
+        return _extract_businesses(response.json())
 
-        # RapidAPI Yelp providers vary in response envelope.
-        businesses = None
-        if isinstance(payload, dict):
-            if isinstance(payload.get("businesses"), list):
-                businesses = payload["businesses"]
-            elif isinstance(payload.get("results"), list):
-                businesses = payload["results"]
-            elif isinstance(payload.get("data"), list):
-                businesses = payload["data"]
-            elif isinstance(payload.get("business_search_result"), list):
-                businesses = payload["business_search_result"]
-            elif isinstance(payload.get("ad_business_search_result"), list):
-                businesses = payload["ad_business_search_result"]
-        elif isinstance(payload, list):
-            businesses = payload
-
-        if not isinstance(businesses, list):
-            if isinstance(payload, dict):
-                keys = ", ".join(sorted(payload.keys()))
-                raise YelpClientError(
-                    f"RapidAPI Yelp response missing list field. Top-level keys: [{keys}]"
-                )
-            raise YelpClientError("RapidAPI Yelp response missing list field")
-
-        return businesses
-
-    def get_popular_dishes(self, business_id: str) -> list[dict]:
-        headers = {
-            "X-RapidAPI-Key": self.api_key,
-            "X-RapidAPI-Host": self.api_host,
-        }
+    async def get_popular_dishes_async(self, business_id: str) -> list[dict]:
         url = f"{self.base_url}/popular_dish"
         try:
-            with httpx.Client(timeout=10.0) as client:
-                response = client.get(url, headers=headers, params={"business_id": business_id})
+            response = await self._aget(url, {"business_id": business_id})
             if response.status_code >= 400:
                 return []
         except httpx.HTTPError:
@@ -96,34 +180,15 @@ class YelpClient:
         payload = response.json()
         return payload.get("data", {}).get("popular_dishes", [])
 
-    def get_reviews(self, business_id: str, count: int = 3) -> list[dict]:
-        headers = {
-            "X-RapidAPI-Key": self.api_key,
-            "X-RapidAPI-Host": self.api_host,
-        }
+    async def get_reviews_async(self, business_id: str, count: int = 3) -> list[dict]:
         url = f"{self.base_url}/reviews"
         try:
-            with httpx.Client(timeout=10.0) as client:
-                response = client.get(
-                    url,
-                    headers=headers,
-                    params={"business_id": business_id, "reviews_per_page": count, "sort_by": "Yelp_sort"},
-                )
+            response = await self._aget(
+                url,
+                {"business_id": business_id, "reviews_per_page": count, "sort_by": "Yelp_sort"},
+            )
             if response.status_code >= 400:
                 return []
         except httpx.HTTPError:
             return []
-        raw = response.json().get("reviews", [])
-        results = []
-        for r in raw:
-            profile_photo = (r.get("author") or {}).get("profilePhoto") or {}
-            photo_url = (profile_photo.get("photoUrl") or {}).get("userSrc")
-            results.append({
-                "text": (r.get("text") or {}).get("full", ""),
-                "rating": r.get("rating", 0),
-                "author_name": (r.get("author") or {}).get("displayName", ""),
-                "author_location": (r.get("author") or {}).get("displayLocation"),
-                "author_photo_url": photo_url,
-                "created_at": r.get("reviewCreatedAt", ""),
-            })
-        return results
+        return _extract_reviews(response.json())
@@ -1,35 +1,59 @@
-import random
-import string
-from collections.abc import Generator
+import asyncio
+import logging
+from collections import Counter
+from collections.abc import AsyncGenerator, AsyncIterator, Generator, Iterator
+from contextlib import asynccontextmanager
+from datetime import datetime
 import os
-from collections import defaultdict
-from datetime import datetime, timedelta, timezone
+from typing import Literal
 
 import httpx
 from fastapi import Depends, FastAPI, HTTPException, Query, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-import jwt as pyjwt
-from jwt import PyJWKClient
-from jwt.exceptions import InvalidTokenError
-from sqlalchemy import case, delete, func, select
-from sqlalchemy.orm import Session
+from anyio import from_thread
+from starlette.concurrency import run_in_threadpool
+from jwt.exceptions import InvalidTokenError, PyJWKClientError
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session, selectinload
 
 from . import config  # noqa: F401
-from .database import SessionLocal
-from .integrations.yelp_client import MissingRapidAPIConfigError, YelpClient, YelpClientError
-from .models import Participant, Restaurant, Session as SessionModel, Vote, YelpQueryCache
+from .auth import JWKSKeyring, verified_token_cache, verify_token
+from .business_cache import (
+    business_enrichment_cache,
+    business_enrichment_stats,
+    drain_enrichment_refreshes,
+    get_business_enrichment,
+    get_business_enrichment_many,
+)
+from .cards import build_restaurant_card, load_card_sources
+from .config import env_flag, env_float, env_int
+from .database import AsyncSessionLocal, SessionLocal
+from .deck import extract_business_image_url, key_businesses, persist_deck
+from .enrichment import enrich_restaurants
+from .integrations.yelp_client import (
+    MissingRapidAPIConfigError,
+    YelpClient,
+    YelpClientError,
+    build_async_http_client,
+)
+from .models import Business, Participant, Restaurant, Session as SessionModel
+from .pagination import InvalidCursorError, encode_cursor, older_than
+from .realtime import ConnectionManager, build_bus_from_env
+from .room_codes import RoomCodeExhaustedError, allocate_room_code, room_code_counters
+from .rooms import ROOM_INVALIDATED, refresh_room, resolve_room, room_cache
 from .schemas import (
     CreateSessionRequest,
-    HoursItem,
     JoinSessionRequest,
     MySessionsResponse,
     NextRestaurantResponse,
     ParticipantSummary,
-    PhotoItem,
-    PopularDishItem,
+    RestaurantEnrichmentItem,
+    RestaurantEnrichmentResponse,
     ReviewItem,
-    RestaurantCard,
+    SessionListResponse,
     SessionResponse,
     SessionResultItem,
     SessionResultsResponse,
@@ -39,8 +63,47 @@ from .schemas import (
     VoteRequest,
     VoteResponse,
 )
+from .search_cache import (
+    drain_background_refreshes,
+    search_businesses_paged,
+    search_cache_stats,
+    yelp_results_cache,
+    yelp_search_flight,
+)
+from .voting import cast_vote, load_next_card, load_ranked_restaurants, remove_participant_votes
+
+yelp_http_client: httpx.AsyncClient | None = None
+deck_extension_counters: Counter[str] = Counter()
+_deck_extension_tasks: set[asyncio.Task] = set()
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    global yelp_http_client
+    yelp_http_client = build_async_http_client(
+        max_connections=env_int("YELP_HTTP_MAX_CONNECTIONS", 20),
+        max_keepalive_connections=env_int("YELP_HTTP_MAX_KEEPALIVE_CONNECTIONS", 10),
+        max_connections_per_host=env_int("YELP_HTTP_MAX_CONNECTIONS_PER_HOST", 10),
+        keepalive_expiry=env_float("YELP_HTTP_KEEPALIVE_EXPIRY_SECONDS", 30.0),
+        http2=env_flag("YELP_HTTP2", default=True),
+    )
+    try:
+        await ws_manager.bus.start()
+        await jwks_keyring.start()
+        yield
+    finally:
+        await jwks_keyring.stop()
+        await drain_deck_extensions()
+        await ws_manager.bus.stop()
+        await drain_background_refreshes()
+        await drain_enrichment_refreshes()
+        await yelp_http_client.aclose()
+        yelp_http_client = None
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 
 def get_allowed_frontend_origins() -> list[str]:
@@ -60,37 +123,34 @@ app.add_middleware(
 )
 
 
-class ConnectionManager:
-    def __init__(self) -> None:
-        self._connections: dict[str, set[WebSocket]] = defaultdict(set)
+ws_manager = ConnectionManager(
+    build_bus_from_env(),
+    max_queue=env_int("WS_SEND_QUEUE_SIZE", 64),
+    close_timeout_seconds=env_float("WS_CLOSE_TIMEOUT_SECONDS", 5.0),
+)
 
-    async def connect(self, room_code: str, websocket: WebSocket) -> None:
-        await websocket.accept()
-        self._connections[room_code].add(websocket)
 
-    def disconnect(self, room_code: str, websocket: WebSocket) -> None:
-        room_connections = self._connections.get(room_code)
-        if not room_connections:
-            return
-        room_connections.discard(websocket)
-        if not room_connections:
-            self._connections.pop(room_code, None)
+def on_room_control(room_code: str, message: dict) -> None:
+    if message.get("event") == ROOM_INVALIDATED:
+        room_cache.invalidate(room_code)
 
-    async def broadcast(self, room_code: str, message: dict) -> None:
-        room_connections = list(self._connections.get(room_code, set()))
-        for connection in room_connections:
-            try:
-                await connection.send_json(message)
-            except RuntimeError:
-                self.disconnect(room_code, connection)
+
+ws_manager.add_control_listener(on_room_control)
 
 
-ws_manager = ConnectionManager()
+async def invalidate_room(room_code: str) -> None:
+    """Drop the room from this worker's room cache, then from every other worker's."""
+    room_cache.invalidate(room_code)
+    await ws_manager.broadcast_control(room_code, {"event": ROOM_INVALIDATED})
 
 SUPABASE_URL = os.getenv("SUPABASE_URL", "")
 if not SUPABASE_URL:
     raise RuntimeError("SUPABASE_URL is not set in the environment")
-_jwks_client = PyJWKClient(f"{SUPABASE_URL}/auth/v1/.well-known/jwks.json")
+jwks_keyring = JWKSKeyring(
+    f"{SUPABASE_URL}/auth/v1/.well-known/jwks.json",
+    refresh_seconds=env_float("JWKS_REFRESH_SECONDS", 600.0),
+    timeout_seconds=env_float("JWKS_FETCH_TIMEOUT_SECONDS", 5.0),
+)
 _http_bearer = HTTPBearer(auto_error=False)
 
 
@@ -100,15 +160,9 @@ def get_current_user(
     if not credentials:
         return None
     try:
-        signing_key = _jwks_client.get_signing_key_from_jwt(credentials.credentials)
-        payload = pyjwt.decode(
-            credentials.credentials,
-            signing_key.key,
-            algorithms=["RS256", "ES256", "EdDSA"],
-            audience="authenticated",
-        )
+        payload = verify_token(credentials.credentials, jwks_keyring)
         return payload["sub"]
-    except InvalidTokenError as exc:
+    except (InvalidTokenError, PyJWKClientError) as exc:
         raise HTTPException(status_code=401, detail=f"Invalid token: {exc}")
 
 
@@ -126,6 +180,11 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def build_response(session: SessionModel) -> SessionResponse:
     participants = [participant.user_name for participant in session.participants]
     return SessionResponse(
@@ -142,24 +201,12 @@ def build_response(session: SessionModel) -> SessionResponse:
     )
 
 
-def generate_room_code(db: Session, length: int = 6) -> str:
-    alphabet = string.ascii_uppercase + string.digits
-    for _ in range(50):
-        code = "".join(random.choice(alphabet) for _ in range(length))
-        existing = db.scalar(select(SessionModel).where(SessionModel.room_code == code))
-        if existing is None:
-            return code
-    raise HTTPException(status_code=500, detail="Failed to generate unique room code")
-
-
 def is_mock_yelp_enabled() -> bool:
     return os.getenv("USE_MOCK_YELP", "").strip().lower() in {"1", "true", "yes", "on"}
 
 
-def build_query_key(*, term: str, location_text: str, price: str | None, radius_meters: int | None) -> str:
-    normalized_price = (price or "").strip()
-    normalized_radius = str(radius_meters or "")
-    return "|".join([term.strip().lower(), location_text.strip().lower(), normalized_price, normalized_radius])
+def is_enrich_on_start_enabled() -> bool:
+    return env_flag("YELP_ENRICH_ON_START") and not is_mock_yelp_enabled()
 
 
 def get_mock_businesses(term: str, location_text: str) -> list[dict]:
@@ -197,64 +244,13 @@ def get_mock_businesses(term: str, location_text: str) -> list[dict]:
     ]
 
 
-def is_cache_row_fresh(created_at: datetime, cutoff: datetime) -> bool:
-    row_time = created_at
-    if row_time.tzinfo is None:
-        row_time = row_time.replace(tzinfo=timezone.utc)
-    return row_time >= cutoff
-
-
 def get_yelp_client_from_env() -> YelpClient:
     api_key = os.getenv("RAPIDAPI_KEY")
     api_host = os.getenv("RAPIDAPI_HOST")
     base_url = os.getenv("RAPIDAPI_YELP_BASE_URL", "https://yelp-business-api.p.rapidapi.com")
     if not api_key or not api_host:
         raise MissingRapidAPIConfigError("Missing RAPIDAPI_KEY or RAPIDAPI_HOST")
-    return YelpClient(api_key=api_key, api_host=api_host, base_url=base_url)
-
-
-def build_yelp_photo_url(photo: dict | None) -> str | None:
-    if not isinstance(photo, dict):
-        return None
-
-    direct_url = photo.get("url") or photo.get("photo_url")
-    if isinstance(direct_url, str) and direct_url.strip():
-        return direct_url.strip()
-
-    url_prefix = photo.get("url_prefix")
-    url_suffix = photo.get("url_suffix")
-    if isinstance(url_prefix, str) and isinstance(url_suffix, str) and url_prefix.strip() and url_suffix.strip():
-        return f"{url_prefix.strip()}o{url_suffix.strip()}"
-
-    return None
-
-
-def extract_business_image_url(item: dict) -> str | None:
-    primary_photo = item.get("primary_photo")
-    if isinstance(primary_photo, str) and primary_photo.strip():
-        return primary_photo.strip()
-
-    primary_photo_url = build_yelp_photo_url(primary_photo if isinstance(primary_photo, dict) else None)
-    if primary_photo_url:
-        return primary_photo_url
-
-    for key in ("photos", "menu_photos"):
-        photos = item.get(key)
-        if isinstance(photos, list):
-            for photo in photos:
-                photo_url = build_yelp_photo_url(photo if isinstance(photo, dict) else None)
-                if photo_url:
-                    return photo_url
-
-    direct_fields = [
-        item.get("image_url"),
-        item.get("photo_url"),
-    ]
-    for value in direct_fields:
-        if isinstance(value, str) and value.strip():
-            return value.strip()
-
-    return None
+    return YelpClient(api_key=api_key, api_host=api_host, base_url=base_url, http_client=yelp_http_client)
 
 
 def search_pexels_fallback_images(query: str, limit: int) -> list[str]:
@@ -294,178 +290,166 @@ def search_pexels_fallback_images(query: str, limit: int) -> list[str]:
     return urls
 
 
-def cache_restaurants_for_session(db: Session, session: SessionModel) -> int:
-    if not session.location_text:
-        raise HTTPException(status_code=400, detail="location_text is required to start a session")
-
+async def search_session_businesses(
+    db: AsyncSession, session: SessionModel, *, pages: int, first_page: int = 0
+) -> list[dict]:
     term = session.cuisine or "restaurants"
     if is_mock_yelp_enabled():
-        businesses = get_mock_businesses(term=term, location_text=session.location_text)
-    else:
-        try:
-            cache_ttl_minutes = int(os.getenv("YELP_CACHE_TTL_MINUTES", "1440"))
-        except ValueError:
-            cache_ttl_minutes = 1440
-        cache_cutoff = datetime.now(timezone.utc) - timedelta(minutes=cache_ttl_minutes)
-        query_key = build_query_key(
-            term=term,
-            location_text=session.location_text,
-            price=session.price,
-            radius_meters=session.radius_meters,
-        )
-        cache_row = db.scalar(select(YelpQueryCache).where(YelpQueryCache.query_key == query_key))
-        if cache_row and is_cache_row_fresh(cache_row.created_at, cache_cutoff) and isinstance(cache_row.results, list):
-            businesses = cache_row.results
-        else:
-            client = get_yelp_client_from_env()
-            businesses = client.search_businesses(
-                term=term,
-                location=session.location_text,
-                price=session.price,
-                radius_meters=session.radius_meters,
-                limit=30,
-            )
-            if cache_row:
-                cache_row.results = businesses
-                cache_row.created_at = datetime.now(timezone.utc)
-            else:
-                db.add(
-                    YelpQueryCache(
-                        query_key=query_key,
-                        term=term,
-                        location_text=session.location_text,
-                        price=session.price,
-                        radius_meters=session.radius_meters,
-                        results=businesses,
-                    )
-                )
+        return get_mock_businesses(term=term, location_text=session.location_text) if first_page == 0 else []
+    return await search_businesses_paged(
+        db,
+        get_yelp_client_from_env,
+        term=term,
+        location_text=session.location_text,
+        price=session.price,
+        radius_meters=session.radius_meters,
+        pages=pages,
+        first_page=first_page,
+        page_size=env_int("YELP_SEARCH_PAGE_SIZE", 30),
+        concurrency=env_int("YELP_SEARCH_CONCURRENCY", 4),
+        page_timeout_seconds=env_float("YELP_SEARCH_PAGE_TIMEOUT_SECONDS", 8.0),
+    )
+
+
+async def fetch_fallback_image_urls(session: SessionModel, missing_image_count: int) -> list[str]:
+    fallback_query = f"{session.cuisine or 'restaurants'} restaurant food"
+    return await run_in_threadpool(search_pexels_fallback_images, fallback_query, missing_image_count)
 
+
+async def cache_restaurants_for_session(
+    db: AsyncSession,
+    session: SessionModel,
+    *,
+    pages: int | None = None,
+    with_fallback_images: bool = True,
+) -> list[Restaurant]:
+    if not session.location_text:
+        raise HTTPException(status_code=400, detail="location_text is required to start a session")
+
+    businesses = await search_session_businesses(
+        db, session, pages=env_int("YELP_SEARCH_PAGES", 1) if pages is None else pages
+    )
     if not businesses:
         raise HTTPException(status_code=404, detail="No restaurants found for this session")
 
-    fallback_query = f"{term} restaurant food"
-    missing_image_count = sum(1 for item in businesses if extract_business_image_url(item) is None)
-    fallback_image_urls = search_pexels_fallback_images(fallback_query, missing_image_count)
-
-    db.execute(delete(Restaurant).where(Restaurant.session_id == session.id))
-    for idx, item in enumerate(businesses):
-        location = item.get("location") or {}
-        coordinates = item.get("coordinates") or {}
-        display_address = location.get("display_address")
-        if isinstance(display_address, list):
-            address = ", ".join(str(part) for part in display_address)
-        else:
-            address = location.get("address1")
-
-        external_id = str(item.get("id") or item.get("alias") or f"generated-{idx}")
-        image_url = extract_business_image_url(item)
-        if image_url is None and fallback_image_urls:
-            image_url = fallback_image_urls.pop(0)
-        db.add(
-            Restaurant(
-                session_id=session.id,
-                external_id=external_id,
-                name=str(item.get("name") or "Unknown Restaurant"),
-                image_url=image_url,
-                address=address,
-                lat=coordinates.get("latitude"),
-                lng=coordinates.get("longitude"),
-                price=item.get("price"),
-                rating=item.get("rating"),
-                review_count=item.get("review_count"),
-                source_payload=item,
-            )
-        )
-    return len(businesses)
-
-
-def _fmt_time(t: str) -> str:
-    h, m = int(t[:2]), int(t[2:])
-    period = "AM" if h < 12 else "PM"
-    h = h % 12 or 12
-    return f"{h}:{m:02d} {period}"
-
-
-def build_restaurant_card(restaurant: Restaurant) -> RestaurantCard:
-    payload = restaurant.source_payload or {}
-
-    raw_cats = payload.get("categories") or []
-    categories = [c.get("name") or c.get("title") for c in raw_cats if c.get("name") or c.get("title")]
-
-    raw_photos = payload.get("photos") or []
-    photos: list[PhotoItem] = []
-    for p in raw_photos[:6]:
-        prefix = p.get("url_prefix", "")
-        suffix = p.get("url_suffix", ".jpg")
-        if prefix:
-            photos.append(PhotoItem(url=f"{prefix}l{suffix}", caption=p.get("caption") or None))
-
-    hours: list[HoursItem] | None = None
-    raw_hours = payload.get("hours") or []
-    if raw_hours:
-        day_names = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-        regular = next((h for h in raw_hours if h.get("hours_type") == "REGULAR"), raw_hours[0])
-        parsed = []
-        for slot in regular.get("open") or []:
-            start, end = slot.get("start", ""), slot.get("end", "")
-            if start and end:
-                parsed.append(HoursItem(
-                    day=day_names[slot.get("day", 0) % 7],
-                    hours=f"{_fmt_time(start)} – {_fmt_time(end)}",
-                ))
-        if parsed:
-            hours = parsed
-
-    alias = payload.get("alias")
-    yelp_url = f"https://www.yelp.com/biz/{alias}" if alias else None
-
-    phone = payload.get("localized_phone") or payload.get("phone") or None
-
-    short_address = None
-    addresses = payload.get("addresses") or {}
-    primary = addresses.get("primary_language") or {}
-    short_address = primary.get("short_form") or None
-
-    popular_dishes_raw = payload.get("popular_dishes") or []
-    popular_dishes = [
-        PopularDishItem(
-            display_name=d.get("display_name", ""),
-            review_count=d.get("review_count", 0),
-            photo_url=d.get("photo_url"),
-            photo_count=d.get("photo_count", 0),
-        )
-        for d in popular_dishes_raw
-    ] or None
-
-    return RestaurantCard(
-        id=restaurant.id,
-        name=restaurant.name,
-        image_url=restaurant.image_url,
-        address=restaurant.address,
-        price=restaurant.price,
-        rating=restaurant.rating,
-        review_count=restaurant.review_count,
-        categories=categories,
-        photos=photos,
-        hours=hours,
-        yelp_url=yelp_url,
-        phone=phone,
-        short_address=short_address,
-        popular_dishes=popular_dishes,
+    fallback_image_urls: list[str] = []
+    if with_fallback_images:
+        missing_image_count = sum(1 for item in businesses if extract_business_image_url(item) is None)
+        fallback_image_urls = await fetch_fallback_image_urls(session, missing_image_count)
+
+    await db.execute(delete(Restaurant).where(Restaurant.session_id == session.id))
+    return await persist_deck(
+        db, session.id, key_businesses(businesses, session.id), fallback_image_urls=fallback_image_urls
     )
 
 
-def get_next_restaurant_for_user(db: Session, session_id: str, user_name: str) -> Restaurant | None:
-    voted_restaurant_ids = select(Vote.restaurant_id).where(
-        Vote.session_id == session_id,
-        Vote.participant_name == user_name,
-    )
-    return db.scalar(
-        select(Restaurant)
-        .where(Restaurant.session_id == session_id, ~Restaurant.id.in_(voted_restaurant_ids))
-        .order_by(Restaurant.id.asc())
-        .limit(1)
-    )
+def is_progressive_start_enabled() -> bool:
+    return env_flag("PROGRESSIVE_SESSION_START")
+
+
+def schedule_deck_extension(bind: AsyncEngine, session_id: str, room_code: str) -> None:
+    task = asyncio.create_task(extend_deck(bind, session_id, room_code))
+    _deck_extension_tasks.add(task)
+    task.add_done_callback(_deck_extension_tasks.discard)
+
+
+async def extend_deck(bind: AsyncEngine, session_id: str, room_code: str) -> None:
+    """Finish a progressively started deck: later result pages, fallback images, then enrichment.
+
+    Each step commits on its own and is announced with a ``deck_extended``
+    event, so voters pick up new cards without waiting for the whole deck.
+    """
+    try:
+        async with AsyncSession(bind=bind, expire_on_commit=False) as db:
+            session = await db.get(SessionModel, session_id)
+            if session is None or session.status != "active":
+                return
+
+            dealt = list(await db.scalars(select(Restaurant).where(Restaurant.session_id == session_id)))
+            known = {restaurant.external_id for restaurant in dealt}
+            businesses: list[dict] = []
+            # A short first page means Yelp had nothing further to give.
+            if len(dealt) >= env_int("YELP_SEARCH_PAGE_SIZE", 30):
+                try:
+                    businesses = await search_session_businesses(
+                        db, session, pages=env_int("YELP_SEARCH_PAGES", 1), first_page=1
+                    )
+                except Exception:
+                    # The dealt cards still need their fallback photos and enrichment.
+                    deck_extension_counters["page_failures"] += 1
+                    logger.exception("Failed to fetch later result pages for room %s", room_code)
+            payloads = {
+                external_id: item
+                for external_id, item in key_businesses(businesses, session_id, start_index=len(known)).items()
+                if external_id not in known
+            }
+
+            unpictured = [restaurant for restaurant in dealt if restaurant.image_url is None]
+            missing_image_count = len(unpictured) + sum(
+                1 for item in payloads.values() if extract_business_image_url(item) is None
+            )
+            fallback_image_urls = await fetch_fallback_image_urls(session, missing_image_count)
+            # Cards already on screen get the first pick of fallback photos.
+            repictured = [
+                {"id": restaurant.id, "image_url": fallback_image_urls.pop(0), "card_version": None}
+                for restaurant in unpictured
+                if fallback_image_urls
+            ]
+            if repictured:
+                await db.execute(update(Restaurant), repictured)
+            added = await persist_deck(db, session_id, payloads, fallback_image_urls=fallback_image_urls)
+            await db.commit()
+            deck_extension_counters["restaurants_added"] += len(added)
+            if added or repictured:
+                await ws_manager.broadcast(
+                    room_code,
+                    {
+                        "event": "deck_extended",
+                        "reason": "pages",
+                        "added": len(added),
+                        "updated": len(repictured),
+                        "restaurant_count": len(dealt) + len(added),
+                    },
+                )
+
+            if is_enrich_on_start_enabled():
+                deck = list(
+                    await db.scalars(
+                        select(Restaurant)
+                        .options(selectinload(Restaurant.business).undefer(Business.payload))
+                        .where(Restaurant.session_id == session_id)
+                        .execution_options(populate_existing=True)
+                    )
+                )
+                enriched = await enrich_restaurants(
+                    db,
+                    get_yelp_client_from_env(),
+                    deck,
+                    concurrency=env_int("YELP_ENRICH_CONCURRENCY", 8),
+                    time_budget_seconds=env_float("YELP_ENRICH_TIME_BUDGET_SECONDS", 5.0),
+                )
+                await db.commit()
+                if enriched:
+                    await ws_manager.broadcast(
+                        room_code,
+                        {
+                            "event": "deck_extended",
+                            "reason": "enrichment",
+                            "added": 0,
+                            "updated": enriched,
+                            "restaurant_count": len(deck),
+                        },
+                    )
+        deck_extension_counters["completed"] += 1
+    except Exception:
+        deck_extension_counters["failures"] += 1
+        logger.exception("Failed to extend the deck for room %s", room_code)
+
+
+async def drain_deck_extensions() -> None:
+    """Wait for background deck extensions to finish."""
+    while _deck_extension_tasks:
+        await asyncio.gather(*list(_deck_extension_tasks), return_exceptions=True)
 
 
 @app.get("/health")
@@ -473,76 +457,134 @@ def health():
     return {"ok": True}
 
 
+@app.get("/metrics")
+def metrics():
+    return {
+        "yelp_query_cache": yelp_results_cache.stats(),
+        "yelp_search_flight": yelp_search_flight.stats(),
+        "yelp_search": search_cache_stats(),
+        "business_enrichment_cache": business_enrichment_cache.stats(),
+        "business_enrichment": business_enrichment_stats(),
+        "websocket": ws_manager.stats(),
+        "deck_extension": dict(deck_extension_counters),
+        "jwt_cache": verified_token_cache.stats(),
+        "jwks": jwks_keyring.stats(),
+        "room_cache": room_cache.stats(),
+        "room_codes": dict(room_code_counters),
+    }
+
+
 @app.post("/sessions", response_model=SessionResponse)
 def create_session(
     req: CreateSessionRequest,
     db: Session = Depends(get_db),
     owner_user_id: str = Depends(require_auth),
 ):
-    room_code = generate_room_code(db)
-    session = SessionModel(
-        room_code=room_code,
-        host_name=req.host_name,
-        status="waiting",
-        cuisine=req.cuisine,
-        price=req.price,
-        radius_meters=req.radius_meters,
-        location_text=req.location_text,
-        owner_user_id=owner_user_id,
-    )
-    session.participants.append(Participant(user_name=req.host_name, user_id=owner_user_id))
-    db.add(session)
+    values = {
+        "host_name": req.host_name,
+        "status": "waiting",
+        "cuisine": req.cuisine,
+        "price": req.price,
+        "radius_meters": req.radius_meters,
+        "location_text": req.location_text,
+        "owner_user_id": owner_user_id,
+    }
+    recycled: list[str] = []
+    try:
+        session = allocate_room_code(db, values, on_recycled=recycled.append)
+    except RoomCodeExhaustedError as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+    db.add(Participant(session_id=session.id, user_name=req.host_name, user_id=owner_user_id))
     db.commit()
+    for room_code in recycled:
+        # The expired session that held this code now answers to another one.
+        from_thread.run(invalidate_room, room_code)
     db.refresh(session)
     return build_response(session)
 
 
+MY_SESSIONS_INCLUDES = {"hosted", "joined", "participants"}
+
+
 @app.get("/sessions/my", response_model=MySessionsResponse)
-def my_sessions(user_id: str = Depends(require_auth), db: Session = Depends(get_db)):
-    def to_hosted(s: SessionModel) -> SessionSummary:
-        return SessionSummary(
-            room_code=s.room_code,
-            host_name=s.host_name,
-            status=s.status,
-            location_text=s.location_text,
-            created_at=s.created_at,
-            participant_count=len(s.participants),
-            cuisine=s.cuisine,
-            price=s.price,
-            radius_meters=s.radius_meters,
-            participants=[ParticipantSummary(user_name=p.user_name) for p in s.participants],
-        )
+def my_sessions(
+    user_id: str = Depends(require_auth),
+    db: Session = Depends(get_db),
+    limit: int = Query(20, ge=1, le=100),
+    hosted_cursor: str | None = Query(None),
+    joined_cursor: str | None = Query(None),
+    include: str = Query("hosted,joined", description="hosted, joined and/or participants (names of hosted)"),
+):
+    selectors = {part.strip() for part in include.split(",") if part.strip()}
+    if not selectors & {"hosted", "joined"} or selectors - MY_SESSIONS_INCLUDES:
+        raise HTTPException(status_code=400, detail="include must list hosted and/or joined, optionally participants.")
 
-    def to_joined(s: SessionModel) -> SessionSummary:
-        my_p = next((p for p in s.participants if p.user_id == user_id), None)
+    participant_count = (
+        select(func.count(Participant.id)).where(Participant.session_id == SessionModel.id).scalar_subquery()
+    )
+
+    def page(stmt, cursor: str | None) -> tuple[list, str | None]:
+        if cursor:
+            try:
+                stmt = stmt.where(older_than(SessionModel.created_at, SessionModel.id, cursor))
+            except InvalidCursorError:
+                raise HTTPException(status_code=400, detail="Invalid cursor.")
+        rows = db.execute(
+            stmt.order_by(SessionModel.created_at.desc(), SessionModel.id.desc()).limit(limit + 1)
+        ).all()
+        if len(rows) <= limit:
+            return rows, None
+        last = rows[limit - 1][0]
+        return rows[:limit], encode_cursor(last.created_at, last.id)
+
+    def to_summary(s: SessionModel, count: int, **extra) -> SessionSummary:
         return SessionSummary(
             room_code=s.room_code,
             host_name=s.host_name,
             status=s.status,
             location_text=s.location_text,
             created_at=s.created_at,
-            participant_count=len(s.participants),
+            participant_count=count,
             cuisine=s.cuisine,
             price=s.price,
             radius_meters=s.radius_meters,
-            my_participant_name=my_p.user_name if my_p else None,
+            **extra,
         )
 
-    hosted = db.scalars(
-        select(SessionModel).where(SessionModel.owner_user_id == user_id).order_by(SessionModel.created_at.desc())
-    ).all()
-
-    joined = db.scalars(
-        select(SessionModel)
-        .join(Participant, Participant.session_id == SessionModel.id)
-        .where(Participant.user_id == user_id, SessionModel.owner_user_id != user_id)
-        .order_by(SessionModel.created_at.desc())
-    ).all()
+    response = MySessionsResponse(hosted=[], joined=[])
+
+    if "hosted" in selectors:
+        stmt = select(SessionModel, participant_count).where(SessionModel.owner_user_id == user_id)
+        with_names = "participants" in selectors
+        if with_names:
+            stmt = stmt.options(selectinload(SessionModel.participants))
+        rows, response.hosted_next_cursor = page(stmt, hosted_cursor)
+        response.hosted = [
+            to_summary(
+                s,
+                count,
+                participants=[ParticipantSummary(user_name=p.user_name) for p in s.participants] if with_names else None,
+            )
+            for s, count in rows
+        ]
+
+    if "joined" in selectors:
+        # One row per session even if the user joined it under several names.
+        mine = (
+            select(Participant.session_id, func.min(Participant.user_name).label("user_name"))
+            .where(Participant.user_id == user_id)
+            .group_by(Participant.session_id)
+            .subquery()
+        )
+        stmt = (
+            select(SessionModel, participant_count, mine.c.user_name)
+            .join(mine, mine.c.session_id == SessionModel.id)
+            .where(SessionModel.owner_user_id != user_id)
+        )
+        rows, response.joined_next_cursor = page(stmt, joined_cursor)
+        response.joined = [to_summary(s, count, my_participant_name=name) for s, count, name in rows]
 
-    return MySessionsResponse(
-        hosted=[to_hosted(s) for s in hosted],
-        joined=[to_joined(s) for s in joined],
-    )
+    return response
 
 
 @app.delete("/sessions/{room_code}")
@@ -554,6 +596,7 @@ def delete_session(room_code: str, user_id: str = Depends(require_auth), db: Ses
         raise HTTPException(status_code=403, detail="Not the session owner")
     db.delete(session)
     db.commit()
+    from_thread.run(invalidate_room, room_code)
     return {"deleted": True}
 
 
@@ -582,6 +625,7 @@ def update_session_filters(
         session.radius_meters = req.radius_meters
 
     db.commit()
+    from_thread.run(invalidate_room, room_code)
     db.refresh(session)
     return build_response(session)
 
@@ -590,34 +634,29 @@ def update_session_filters(
 async def remove_participant(
     room_code: str,
     user_name: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(require_auth),
 ):
-    session = db.scalar(select(SessionModel).where(SessionModel.room_code == room_code))
-    if not session:
+    room = await resolve_room(db, room_code)
+    if not room:
         raise HTTPException(status_code=404, detail="Session not found")
-    if session.owner_user_id != user_id:
+    if room.owner_user_id != user_id:
         raise HTTPException(status_code=403, detail="Only the host can remove participants")
 
-    participant = db.scalar(
+    participant = await db.scalar(
         select(Participant).where(
-            Participant.session_id == session.id,
+            Participant.session_id == room.session_id,
             Participant.user_name == user_name,
         )
     )
     if not participant:
         raise HTTPException(status_code=404, detail="Participant not found")
 
-    db.execute(
-        delete(Vote).where(
-            Vote.session_id == session.id,
-            Vote.participant_name == user_name,
-        )
-    )
-    db.delete(participant)
-    db.commit()
+    await remove_participant_votes(db, room.session_id, user_name)
+    await db.delete(participant)
+    await db.commit()
 
-    await manager.broadcast(room_code, {
+    await ws_manager.broadcast(room_code, {
         "event": "participant_removed",
         "user_name": user_name,
     })
@@ -660,8 +699,12 @@ def join_session(
 
 
 @app.post("/sessions/{room_code}/start", response_model=SessionResponse)
-async def start_session(room_code: str, req: StartSessionRequest, db: Session = Depends(get_db)):
-    session = db.scalar(select(SessionModel).where(SessionModel.room_code == room_code))
+async def start_session(room_code: str, req: StartSessionRequest, db: AsyncSession = Depends(get_async_db)):
+    session = await db.scalar(
+        select(SessionModel)
+        .options(selectinload(SessionModel.participants))
+        .where(SessionModel.room_code == room_code)
+    )
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     if req.host_name != session.host_name:
@@ -669,64 +712,72 @@ async def start_session(room_code: str, req: StartSessionRequest, db: Session =
     if session.status != "waiting":
         raise HTTPException(status_code=409, detail="Session can only be started from waiting state")
 
+    progressive = is_progressive_start_enabled()
     try:
-        cache_restaurants_for_session(db, session)
+        if progressive:
+            # Deal the first page straight away; extend_deck appends the rest.
+            await cache_restaurants_for_session(db, session, pages=1, with_fallback_images=False)
+        else:
+            restaurants = await cache_restaurants_for_session(db, session)
+        if not progressive and is_enrich_on_start_enabled():
+            await enrich_restaurants(
+                db,
+                get_yelp_client_from_env(),
+                restaurants,
+                concurrency=env_int("YELP_ENRICH_CONCURRENCY", 8),
+                time_budget_seconds=env_float("YELP_ENRICH_TIME_BUDGET_SECONDS", 5.0),
+            )
     except MissingRapidAPIConfigError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
     except YelpClientError as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
 
     session.status = "active"
-    db.commit()
-    db.refresh(session)
+    await db.commit()
+    await invalidate_room(room_code)
     response = build_response(session)
     await ws_manager.broadcast(
         room_code,
         {"event": "session_started", "session": response.model_dump()},
     )
+    if progressive:
+        schedule_deck_extension(db.bind, session.id, room_code)
     return response
 
 
 @app.get("/sessions/{room_code}/restaurants/next", response_model=NextRestaurantResponse)
-def get_next_restaurant(room_code: str, user_name: str, db: Session = Depends(get_db)):
-    session = db.scalar(select(SessionModel).where(SessionModel.room_code == room_code))
-    if not session:
+async def get_next_restaurant(room_code: str, user_name: str, db: AsyncSession = Depends(get_async_db)):
+    room = await resolve_room(db, room_code)
+    if room and room.status != "active":
+        # The cached status may predate a start on another worker.
+        room = await refresh_room(db, room_code)
+    if not room:
         raise HTTPException(status_code=404, detail="Session not found")
-    if session.status != "active":
+    if room.status != "active":
         raise HTTPException(status_code=409, detail="Session is not active")
 
-    participant = db.scalar(
+    participant = await db.scalar(
         select(Participant).where(
-            Participant.session_id == session.id,
+            Participant.session_id == room.session_id,
             Participant.user_name == user_name,
         )
     )
     if not participant:
         raise HTTPException(status_code=404, detail="Participant not found in session")
 
-    next_restaurant = get_next_restaurant_for_user(db, session.id, user_name)
+    next_restaurant, yes_votes, total_votes, total_participants = await load_next_card(
+        db, room.session_id, user_name
+    )
     if not next_restaurant:
         return NextRestaurantResponse(restaurant=None)
 
-    total_participants = db.scalar(
-        select(func.count(Participant.id)).where(Participant.session_id == session.id)
-    ) or 0
-    yes_votes = db.scalar(
-        select(func.count(Vote.id)).where(
-            Vote.session_id == session.id,
-            Vote.restaurant_id == next_restaurant.id,
-            Vote.decision == "yes",
-        )
-    ) or 0
-    total_votes = db.scalar(
-        select(func.count(Vote.id)).where(
-            Vote.session_id == session.id,
-            Vote.restaurant_id == next_restaurant.id,
-        )
-    ) or 0
-
+    await load_card_sources([next_restaurant])
+    card = build_restaurant_card(next_restaurant)
+    if db.dirty:
+        # Persist a card rebuilt from an older schema version.
+        await db.commit()
     return NextRestaurantResponse(
-        restaurant=build_restaurant_card(next_restaurant),
+        restaurant=card,
         total_participants=total_participants,
         yes_votes=yes_votes,
         total_votes=total_votes,
@@ -734,103 +785,29 @@ def get_next_restaurant(room_code: str, user_name: str, db: Session = Depends(ge
 
 
 @app.post("/sessions/{room_code}/votes", response_model=VoteResponse)
-async def submit_vote(room_code: str, req: VoteRequest, db: Session = Depends(get_db)):
-    session = db.scalar(select(SessionModel).where(SessionModel.room_code == room_code))
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
-    if session.status != "active":
-        raise HTTPException(status_code=409, detail="Session is not active")
-
-    participant = db.scalar(
-        select(Participant).where(
-            Participant.session_id == session.id,
-            Participant.user_name == req.user_name,
-        )
-    )
-    if not participant:
-        raise HTTPException(status_code=404, detail="Participant not found in session")
-
-    restaurant = db.scalar(
-        select(Restaurant).where(
-            Restaurant.id == req.restaurant_id,
-            Restaurant.session_id == session.id,
-        )
-    )
-    if not restaurant:
-        raise HTTPException(status_code=404, detail="Restaurant not found in session")
-
-    existing_vote = db.scalar(
-        select(Vote).where(
-            Vote.session_id == session.id,
-            Vote.participant_name == req.user_name,
-            Vote.restaurant_id == req.restaurant_id,
-        )
+async def submit_vote(room_code: str, req: VoteRequest, db: AsyncSession = Depends(get_async_db)):
+    outcome = await cast_vote(
+        db,
+        room_code=room_code,
+        user_name=req.user_name,
+        restaurant_id=req.restaurant_id,
+        decision=req.decision,
     )
-    duplicate = False
-    if existing_vote:
-        if existing_vote.decision != req.decision:
-            raise HTTPException(status_code=409, detail="Vote already exists with different decision")
-        duplicate = True
-    else:
-        db.add(
-            Vote(
-                session_id=session.id,
-                participant_name=req.user_name,
-                restaurant_id=req.restaurant_id,
-                decision=req.decision,
-            )
-        )
-        db.flush()
-
-    total_participants = db.scalar(
-        select(func.count(Participant.id)).where(Participant.session_id == session.id)
-    ) or 0
-    votes_submitted_for_restaurant = db.scalar(
-        select(func.count(Vote.id)).where(
-            Vote.session_id == session.id,
-            Vote.restaurant_id == req.restaurant_id,
-        )
-    ) or 0
-    yes_votes_for_restaurant = db.scalar(
-        select(func.count(Vote.id)).where(
-            Vote.session_id == session.id,
-            Vote.restaurant_id == req.restaurant_id,
-            Vote.decision == "yes",
-        )
-    ) or 0
-
-    matched = total_participants > 0 and yes_votes_for_restaurant == total_participants
-    matched_restaurant_id = req.restaurant_id if matched else None
-
-    next_restaurant = get_next_restaurant_for_user(db, session.id, req.user_name)
-
-    next_yes_votes = 0
-    next_total_votes = 0
-    if next_restaurant:
-        next_yes_votes = db.scalar(
-            select(func.count(Vote.id)).where(
-                Vote.session_id == session.id,
-                Vote.restaurant_id == next_restaurant.id,
-                Vote.decision == "yes",
-            )
-        ) or 0
-        next_total_votes = db.scalar(
-            select(func.count(Vote.id)).where(
-                Vote.session_id == session.id,
-                Vote.restaurant_id == next_restaurant.id,
-            )
-        ) or 0
-
-    db.commit()
+    # Build the card before commit so expiry doesn't trigger a reload of the row.
+    if outcome.next_restaurant:
+        await load_card_sources([outcome.next_restaurant])
+    next_card = build_restaurant_card(outcome.next_restaurant) if outcome.next_restaurant else None
+    await db.commit()
 
+    matched = outcome.matched
     await ws_manager.broadcast(
         room_code,
         {
             "event": "vote_progress",
             "restaurant_id": req.restaurant_id,
-            "votes_submitted_for_restaurant": votes_submitted_for_restaurant,
-            "yes_votes_for_restaurant": yes_votes_for_restaurant,
-            "total_participants": total_participants,
+            "votes_submitted_for_restaurant": outcome.votes_submitted,
+            "yes_votes_for_restaurant": outcome.yes_votes,
+            "total_participants": outcome.total_participants,
         },
     )
     if matched:
@@ -839,22 +816,22 @@ async def submit_vote(room_code: str, req: VoteRequest, db: Session = Depends(ge
             {
                 "event": "match_found",
                 "restaurant_id": req.restaurant_id,
-                "restaurant_name": restaurant.name,
-                "restaurant_image_url": restaurant.image_url,
-                "total_participants": total_participants,
+                "restaurant_name": outcome.restaurant_name,
+                "restaurant_image_url": outcome.restaurant_image_url,
+                "total_participants": outcome.total_participants,
             },
         )
 
     return VoteResponse(
-        duplicate=duplicate,
+        duplicate=outcome.duplicate,
         matched=matched,
-        matched_restaurant_id=matched_restaurant_id,
-        total_participants=total_participants,
-        votes_submitted_for_restaurant=votes_submitted_for_restaurant,
-        yes_votes_for_restaurant=yes_votes_for_restaurant,
-        next_restaurant=build_restaurant_card(next_restaurant) if next_restaurant else None,
-        next_yes_votes=next_yes_votes,
-        next_total_votes=next_total_votes,
+        matched_restaurant_id=req.restaurant_id if matched else None,
+        total_participants=outcome.total_participants,
+        votes_submitted_for_restaurant=outcome.votes_submitted,
+        yes_votes_for_restaurant=outcome.yes_votes,
+        next_restaurant=next_card,
+        next_yes_votes=outcome.next_yes_votes,
+        next_total_votes=outcome.next_total_votes,
     )
 
 
@@ -866,124 +843,194 @@ def get_session(room_code: str, db: Session = Depends(get_db)):
     return build_response(session)
 
 
-@app.get("/sessions", response_model=list[SessionResponse])
-def list_sessions(db: Session = Depends(get_db)):
-    sessions = db.scalars(select(SessionModel)).all()
-    return [build_response(session) for session in sessions]
+SESSION_STREAM_BATCH_SIZE = 500
+
+
+def stream_sessions_ndjson(bind, stmt) -> Iterator[str]:
+    """Every session matching ``stmt``, one JSON object per line.
+
+    Rows are fetched in batches of SESSION_STREAM_BATCH_SIZE through a
+    server-side cursor, each batch's participants in one selectinload, so
+    memory holds one batch however large the table is. The stream owns its
+    database session because it outlives the request's.
+    """
+    with Session(bind) as db:
+        result = db.scalars(stmt.execution_options(yield_per=SESSION_STREAM_BATCH_SIZE))
+        for batch in result.partitions():
+            yield "".join(build_response(session).model_dump_json() + "\n" for session in batch)
+
+
+@app.get("/sessions", response_model=SessionListResponse)
+def list_sessions(
+    db: Session = Depends(get_db),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None),
+    status: str | None = Query(None),
+    created_after: datetime | None = Query(None),
+    created_before: datetime | None = Query(None),
+    output: Literal["json", "ndjson"] = Query(
+        "json", alias="format", description="ndjson streams every match and ignores limit"
+    ),
+):
+    stmt = select(SessionModel).options(selectinload(SessionModel.participants))
+    if status is not None:
+        stmt = stmt.where(SessionModel.status == status)
+    if created_after is not None:
+        stmt = stmt.where(SessionModel.created_at >= created_after)
+    if created_before is not None:
+        stmt = stmt.where(SessionModel.created_at < created_before)
+    if cursor:
+        try:
+            stmt = stmt.where(older_than(SessionModel.created_at, SessionModel.id, cursor))
+        except InvalidCursorError:
+            raise HTTPException(status_code=400, detail="Invalid cursor.")
+    stmt = stmt.order_by(SessionModel.created_at.desc(), SessionModel.id.desc())
+
+    if output == "ndjson":
+        return StreamingResponse(stream_sessions_ndjson(db.get_bind(), stmt), media_type="application/x-ndjson")
+
+    sessions = db.scalars(stmt.limit(limit + 1)).all()
+    next_cursor = None
+    if len(sessions) > limit:
+        sessions = sessions[:limit]
+        next_cursor = encode_cursor(sessions[-1].created_at, sessions[-1].id)
+    return SessionListResponse(sessions=[build_response(session) for session in sessions], next_cursor=next_cursor)
 
 
 @app.get("/sessions/{room_code}/results", response_model=SessionResultsResponse)
-def get_session_results(room_code: str, db: Session = Depends(get_db)):
-    session = db.scalar(select(SessionModel).where(SessionModel.room_code == room_code))
-    if not session:
+async def get_session_results(room_code: str, db: AsyncSession = Depends(get_async_db)):
+    room = await resolve_room(db, room_code)
+    if not room:
         raise HTTPException(status_code=404, detail="Session not found")
 
     total_participants = (
-        db.scalar(select(func.count(Participant.id)).where(Participant.session_id == session.id)) or 0
+        await db.scalar(select(func.count(Participant.id)).where(Participant.session_id == room.session_id)) or 0
     )
 
-    yes_votes = func.coalesce(
-        func.sum(
-            case(
-                (Vote.decision == "yes", 1),
-                else_=0,
-            )
-        ),
-        0,
-    ).label("yes_votes")
-    total_votes = func.count(Vote.id).label("total_votes")
-
-    ranking = db.execute(
-        select(Restaurant, yes_votes, total_votes)
-        .outerjoin(
-            Vote,
-            (Vote.restaurant_id == Restaurant.id) & (Vote.session_id == session.id),
+    ranking = await load_ranked_restaurants(db, room.session_id)
+    await load_card_sources([restaurant for restaurant, _, _ in ranking])
+    results = [
+        SessionResultItem(
+            restaurant=build_restaurant_card(restaurant),
+            yes_votes=yes_votes_count,
+            total_votes=total_votes_count,
+        )
+        for restaurant, yes_votes_count, total_votes_count in ranking
+    ]
+    if db.dirty:
+        await db.commit()
+
+    return SessionResultsResponse(total_participants=total_participants, results=results)
+
+
+ENRICHMENT_INCLUDES = {"dishes": "popular_dishes", "reviews": "reviews"}
+MAX_ENRICHMENT_BATCH = 50
+
+
+@app.get("/sessions/{room_code}/restaurants/enrichment", response_model=RestaurantEnrichmentResponse)
+async def get_restaurants_enrichment(
+    room_code: str,
+    ids: str = Query(..., description="Comma-separated restaurant ids"),
+    include: str = Query("dishes,reviews"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        restaurant_ids = list(dict.fromkeys(int(part) for part in ids.split(",") if part.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers.")
+    if not restaurant_ids or len(restaurant_ids) > MAX_ENRICHMENT_BATCH:
+        raise HTTPException(status_code=400, detail=f"Request between 1 and {MAX_ENRICHMENT_BATCH} restaurants.")
+    selectors = [part.strip() for part in include.split(",") if part.strip()]
+    if not selectors or any(selector not in ENRICHMENT_INCLUDES for selector in selectors):
+        raise HTTPException(status_code=400, detail="include must list dishes and/or reviews.")
+    kinds = [ENRICHMENT_INCLUDES[selector] for selector in dict.fromkeys(selectors)]
+
+    room = await resolve_room(db, room_code)
+    if not room:
+        raise HTTPException(status_code=404, detail="Session not found.")
+    rows = (
+        await db.execute(
+            select(Restaurant.id, Business)
+            .join(Business, Restaurant.business_id == Business.id)
+            .where(Restaurant.session_id == room.session_id, Restaurant.id.in_(restaurant_ids))
         )
-        .where(Restaurant.session_id == session.id)
-        .group_by(Restaurant.id)
-        .order_by(yes_votes.desc(), total_votes.desc(), Restaurant.id.asc())
     ).all()
 
-    return SessionResultsResponse(
-        total_participants=total_participants,
-        results=[
-            SessionResultItem(
-                restaurant=build_restaurant_card(restaurant),
-                yes_votes=int(yes_votes_count or 0),
-                total_votes=int(total_votes_count or 0),
-            )
-            for restaurant, yes_votes_count, total_votes_count in ranking
-        ],
-    )
+    try:
+        resolved = await get_business_enrichment_many(
+            db,
+            get_yelp_client_from_env,
+            [(business, kind) for _, business in rows for kind in kinds],
+            concurrency=env_int("YELP_ENRICH_CONCURRENCY", 8),
+            deadline_seconds=env_float("ENRICHMENT_BATCH_DEADLINE_SECONDS", 4.0),
+        )
+    except MissingRapidAPIConfigError:
+        raise HTTPException(status_code=500, detail="Yelp API not configured.")
+    await db.commit()
+
+    results: list[RestaurantEnrichmentItem] = []
+    pending: list[int] = []
+    for restaurant_id, business in rows:
+        values = {kind: resolved.get((business.id, kind)) for kind in kinds}
+        if any(value is None for value in values.values()):
+            pending.append(restaurant_id)
+        results.append(RestaurantEnrichmentItem(restaurant_id=restaurant_id, **values))
+    return RestaurantEnrichmentResponse(results=results, pending=pending)
 
 
 @app.get("/sessions/{room_code}/restaurants/{restaurant_id}/popular_dishes")
-def get_restaurant_popular_dishes(
+async def get_restaurant_popular_dishes(
     room_code: str,
     restaurant_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    session = db.scalar(select(SessionModel).where(SessionModel.room_code == room_code))
-    if not session:
+    room = await resolve_room(db, room_code)
+    if not room:
         raise HTTPException(status_code=404, detail="Session not found.")
-    restaurant = db.scalar(
-        select(Restaurant).where(
+    business = await db.scalar(
+        select(Business)
+        .join(Restaurant, Restaurant.business_id == Business.id)
+        .where(
             Restaurant.id == restaurant_id,
-            Restaurant.session_id == session.id,
+            Restaurant.session_id == room.session_id,
         )
     )
-    if not restaurant:
+    if not business:
         raise HTTPException(status_code=404, detail="Restaurant not found.")
 
-    payload = restaurant.source_payload or {}
-    if "popular_dishes" in payload:
-        return {"popular_dishes": payload["popular_dishes"]}
-
     try:
-        client = get_yelp_client_from_env()
+        dishes = await get_business_enrichment(db, get_yelp_client_from_env, business, "popular_dishes")
     except MissingRapidAPIConfigError:
         raise HTTPException(status_code=500, detail="Yelp API not configured.")
-
-    dishes = client.get_popular_dishes(restaurant.external_id)
-    payload = dict(payload)
-    payload["popular_dishes"] = dishes
-    restaurant.source_payload = payload
-    db.commit()
+    await db.commit()
     return {"popular_dishes": dishes}
 
 
 @app.get("/sessions/{room_code}/restaurants/{restaurant_id}/reviews")
-def get_restaurant_reviews(
+async def get_restaurant_reviews(
     room_code: str,
     restaurant_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    session = db.scalar(select(SessionModel).where(SessionModel.room_code == room_code))
-    if not session:
+    room = await resolve_room(db, room_code)
+    if not room:
         raise HTTPException(status_code=404, detail="Session not found.")
-    restaurant = db.scalar(
-        select(Restaurant).where(
+    business = await db.scalar(
+        select(Business)
+        .join(Restaurant, Restaurant.business_id == Business.id)
+        .where(
             Restaurant.id == restaurant_id,
-            Restaurant.session_id == session.id,
+            Restaurant.session_id == room.session_id,
         )
     )
-    if not restaurant:
+    if not business:
         raise HTTPException(status_code=404, detail="Restaurant not found.")
 
-    payload = restaurant.source_payload or {}
-    if "reviews" in payload:
-        return {"reviews": payload["reviews"]}
-
     try:
-        client = get_yelp_client_from_env()
+        reviews = await get_business_enrichment(db, get_yelp_client_from_env, business, "reviews")
     except MissingRapidAPIConfigError:
         raise HTTPException(status_code=500, detail="Yelp API not configured.")
-
-    reviews = client.get_reviews(restaurant.external_id, count=3)
-    payload = dict(payload)
-    payload["reviews"] = reviews
-    restaurant.source_payload = payload
-    db.commit()
+    await db.commit()
     return {"reviews": reviews}
 
 
@@ -993,7 +1040,7 @@ async def validate_location(location_text: str = Query(...)):
         client = get_yelp_client_from_env()
     except MissingRapidAPIConfigError:
         raise HTTPException(status_code=500, detail="Yelp API not configured.")
-    results = client.search_businesses(
+    results = await client.search_businesses_async(
         term="restaurants",
         location=location_text,
         price=None,
@@ -1005,14 +1052,13 @@ async def validate_location(location_text: str = Query(...)):
 
 @app.websocket("/ws/sessions/{room_code}")
 async def session_updates_socket(websocket: WebSocket, room_code: str):
-    db = SessionLocal()
-    try:
-        session = db.scalar(select(SessionModel).where(SessionModel.room_code == room_code))
-        if not session:
-            await websocket.close(code=1008, reason="Session not found")
-            return
-    finally:
-        db.close()
+    room = room_cache.get(room_code)
+    if room is None:
+        async with AsyncSessionLocal() as db:
+            room = await resolve_room(db, room_code)
+    if not room:
+        await websocket.close(code=1008, reason="Session not found")
+        return
 
     await ws_manager.connect(room_code, websocket)
     try:
@@ -1,15 +1,21 @@
 import uuid
 
-from sqlalchemy import JSON, DateTime, Float, ForeignKey, Integer, String, UniqueConstraint, func
+from sqlalchemy import JSON, DateTime, Float, ForeignKey, Index, Integer, String, UniqueConstraint, func
+from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
-class Base(DeclarativeBase):
+class Base(AsyncAttrs, DeclarativeBase):
     pass
 
 
 class Session(Base):
     __tablename__ = "sessions"
+    __table_args__ = (
+        Index("ix_sessions_owner_user_id_created_at", "owner_user_id", "created_at"),
+        Index("ix_sessions_created_at_id", "created_at", "id"),
+        Index("ix_sessions_status_created_at", "status", "created_at"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     room_code: Mapped[str] = mapped_column(String(8), unique=True, index=True, nullable=False)
@@ -37,6 +43,11 @@ class Session(Base):
         cascade="all, delete-orphan",
         passive_deletes=True,
     )
+    vote_tallies: Mapped[list["RestaurantVoteTally"]] = relationship(
+        back_populates="session",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
 
 
 class Participant(Base):
@@ -81,13 +92,35 @@ class Restaurant(Base):
     price: Mapped[str | None] = mapped_column(String(16), nullable=True)
     rating: Mapped[float | None] = mapped_column(Float, nullable=True)
     review_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
-    source_payload: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    business_id: Mapped[int] = mapped_column(ForeignKey("businesses.id"), nullable=False, index=True)
+    card: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    card_version: Mapped[int | None] = mapped_column(Integer, nullable=True)
     created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     session: Mapped[Session] = relationship(back_populates="restaurants")
+    business: Mapped["Business"] = relationship(back_populates="restaurants")
     votes: Mapped[list["Vote"]] = relationship(back_populates="restaurant")
 
 
+class Business(Base):
+    """One row per Yelp business, shared by every session that deals it."""
+
+    __tablename__ = "businesses"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    external_id: Mapped[str] = mapped_column(String(128), unique=True, index=True, nullable=False)
+    # The raw Yelp business is large and only needed to (re)build cards, so it
+    # is left out of ordinary row loads.
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False, deferred=True)
+    fetched_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    popular_dishes: Mapped[list | None] = mapped_column(JSON, nullable=True)
+    popular_dishes_fetched_at: Mapped[DateTime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    reviews: Mapped[list | None] = mapped_column(JSON, nullable=True)
+    reviews_fetched_at: Mapped[DateTime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    restaurants: Mapped[list[Restaurant]] = relationship(back_populates="business")
+
+
 class YelpQueryCache(Base):
     __tablename__ = "yelp_query_cache"
 
@@ -125,3 +158,26 @@ class Vote(Base):
 
     session: Mapped[Session] = relationship(back_populates="votes")
     restaurant: Mapped[Restaurant] = relationship(back_populates="votes")
+
+
+class RestaurantVoteTally(Base):
+    __tablename__ = "restaurant_vote_tallies"
+    __table_args__ = (
+        UniqueConstraint("session_id", "restaurant_id", name="uq_restaurant_vote_tallies_session_restaurant"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    session_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("sessions.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    restaurant_id: Mapped[int] = mapped_column(
+        ForeignKey("restaurants.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    yes_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    total_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+    session: Mapped[Session] = relationship(back_populates="vote_tallies")
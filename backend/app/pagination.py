@@ -0,0 +1,36 @@
+import base64
+from datetime import datetime
+
+from sqlalchemy import ColumnElement, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    """An opaque cursor pointing just past the row with this (created_at, id)."""
+    raw = f"{created_at.isoformat()}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        created_at, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), row_id
+    except ValueError as exc:
+        raise InvalidCursorError("Malformed cursor") from exc
+
+
+def older_than(
+    created_at: InstrumentedAttribute, row_id: InstrumentedAttribute, cursor: str
+) -> ColumnElement[bool]:
+    """Rows after ``cursor`` in (created_at, id) descending order.
+
+    Ties on created_at are broken by id, so a page boundary that falls
+    inside a burst of rows created in the same instant skips and repeats
+    nothing.
+    """
+    return tuple_(created_at, row_id) < decode_cursor(cursor)
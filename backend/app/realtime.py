@@ -0,0 +1,362 @@
+import abc
+import asyncio
+import json
+import logging
+import os
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+
+from fastapi import WebSocket
+
+from .database import DATABASE_URL
+
+
+logger = logging.getLogger(__name__)
+
+Deliver = Callable[[str, dict], Awaitable[None]]
+ControlListener = Callable[[str, dict], None]
+
+# Messages carrying this key are for the workers themselves, not for sockets.
+CONTROL_KEY = "_control"
+
+
+def encode_envelope(room_code: str, message: dict) -> str:
+    return json.dumps({"room_code": room_code, "message": message}, separators=(",", ":"))
+
+
+def decode_envelope(raw: str | bytes) -> tuple[str, dict]:
+    envelope = json.loads(raw)
+    return envelope["room_code"], envelope["message"]
+
+
+class BroadcastBus(abc.ABC):
+    """Fans room messages out to every worker's ConnectionManager.
+
+    Network-backed buses echo a worker's own messages back to it, so local
+    sockets are always fed from the subscription and never twice. Their
+    subscriptions are supervised: a dropped connection is re-established
+    with exponential backoff instead of silently ending delivery.
+    """
+
+    reconnect_min_seconds = 0.5
+    reconnect_max_seconds = 30.0
+    reconnects = 0
+
+    def attach(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    @abc.abstractmethod
+    async def publish(self, room_code: str, message: dict) -> None:
+        ...
+
+
+class InMemoryBus(BroadcastBus):
+    async def publish(self, room_code: str, message: dict) -> None:
+        await self._deliver(room_code, message)
+
+
+class PostgresNotifyBus(BroadcastBus):
+    # NOTIFY payloads are capped at 8000 bytes by Postgres.
+    max_payload_bytes = 7999
+
+    def __init__(self, dsn: str, channel: str = "grubble_ws") -> None:
+        self.dsn = dsn
+        self.channel = channel
+        self._listener = None
+        self._publisher = None
+        self._publish_lock = asyncio.Lock()
+        self._deliveries: set[asyncio.Task] = set()
+        self._supervisor: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        await self._listen()
+        self._publisher = await self._connect()
+        self._supervisor = asyncio.create_task(self._supervise())
+
+    async def stop(self) -> None:
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            try:
+                await self._supervisor
+            except asyncio.CancelledError:
+                pass
+        for connection in (self._listener, self._publisher):
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+        self._listener = self._publisher = self._supervisor = None
+
+    async def _connect(self):
+        import asyncpg
+
+        return await asyncpg.connect(self.dsn)
+
+    async def _listen(self) -> None:
+        self._lost = asyncio.Event()
+        self._listener = await self._connect()
+        self._listener.add_termination_listener(lambda connection: self._lost.set())
+        await self._listener.add_listener(self.channel, self._on_notify)
+
+    async def _supervise(self) -> None:
+        delay = self.reconnect_min_seconds
+        while True:
+            await self._lost.wait()
+            logger.warning("Lost the LISTEN connection for %s; reconnecting", self.channel)
+            while True:
+                await asyncio.sleep(delay)
+                try:
+                    await self._listen()
+                except Exception:
+                    delay = min(delay * 2, self.reconnect_max_seconds)
+                    logger.exception("Failed to re-LISTEN on %s; retrying in %.1fs", self.channel, delay)
+                    continue
+                self.reconnects += 1
+                delay = self.reconnect_min_seconds
+                break
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        try:
+            room_code, message = decode_envelope(payload)
+        except Exception:
+            logger.exception("Dropping malformed broadcast from Postgres")
+            return
+        task = asyncio.get_running_loop().create_task(self._deliver(room_code, message))
+        self._deliveries.add(task)
+        task.add_done_callback(self._delivered)
+
+    def _delivered(self, task: asyncio.Task) -> None:
+        self._deliveries.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Failed to deliver broadcast from Postgres", exc_info=task.exception())
+
+    async def publish(self, room_code: str, message: dict) -> None:
+        payload = encode_envelope(room_code, message)
+        if len(payload.encode("utf-8")) > self.max_payload_bytes:
+            logger.warning(
+                "Dropping %s broadcast for room %s: payload too large for NOTIFY", message.get("event"), room_code
+            )
+            return
+        async with self._publish_lock:
+            if self._publisher is None or self._publisher.is_closed():
+                self._publisher = await self._connect()
+            await self._publisher.execute("SELECT pg_notify($1, $2)", self.channel, payload)
+
+
+class RedisBus(BroadcastBus):
+    def __init__(self, url: str | None = None, channel: str = "grubble_ws", client=None) -> None:
+        self.url = url
+        self.channel = channel
+        self._client = client
+        self._pubsub = None
+        self._reader: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if self._client is None:
+            try:
+                from redis import asyncio as redis_asyncio
+            except ImportError as exc:
+                raise RuntimeError("BROADCAST_BACKEND=redis requires the 'redis' package") from exc
+            self._client = redis_asyncio.from_url(self.url)
+        await self._subscribe()
+        self._reader = asyncio.create_task(self._read())
+
+    async def _subscribe(self) -> None:
+        self._pubsub = self._client.pubsub()
+        await self._pubsub.subscribe(self.channel)
+
+    async def _close_pubsub(self) -> None:
+        pubsub, self._pubsub = self._pubsub, None
+        if pubsub is not None:
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
+
+    async def stop(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+        if self._pubsub is not None:
+            await self._pubsub.unsubscribe(self.channel)
+            await self._pubsub.aclose()
+        self._reader = self._pubsub = None
+
+    async def _read(self) -> None:
+        delay = self.reconnect_min_seconds
+        while True:
+            try:
+                if self._pubsub is None:
+                    await self._subscribe()
+                    self.reconnects += 1
+                    delay = self.reconnect_min_seconds
+                async for item in self._pubsub.listen():
+                    if item.get("type") != "message":
+                        continue
+                    try:
+                        room_code, message = decode_envelope(item["data"])
+                        await self._deliver(room_code, message)
+                    except Exception:
+                        logger.exception("Failed to deliver broadcast from Redis")
+                logger.warning("Redis subscription to %s ended; resubscribing in %.1fs", self.channel, delay)
+            except Exception:
+                logger.exception("Redis subscription to %s failed; resubscribing in %.1fs", self.channel, delay)
+            await self._close_pubsub()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.reconnect_max_seconds)
+
+    async def publish(self, room_code: str, message: dict) -> None:
+        await self._client.publish(self.channel, encode_envelope(room_code, message))
+
+
+def postgres_dsn(database_url: str) -> str:
+    scheme, sep, rest = database_url.partition("://")
+    return f"postgresql{sep}{rest}" if scheme.startswith("postgresql") else database_url
+
+
+def build_bus_from_env() -> BroadcastBus:
+    backend = os.getenv("BROADCAST_BACKEND", "memory").strip().lower()
+    if backend == "postgres":
+        return PostgresNotifyBus(postgres_dsn(os.getenv("BROADCAST_DATABASE_URL") or DATABASE_URL))
+    if backend == "redis":
+        return RedisBus(os.getenv("BROADCAST_REDIS_URL", "redis://localhost:6379/0"))
+    return InMemoryBus()
+
+
+class ClientChannel:
+    """One socket's bounded outbox, drained by its own sender task."""
+
+    def __init__(self, websocket: WebSocket, max_queue: int) -> None:
+        self.websocket = websocket
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=max_queue)
+        self.sender: asyncio.Task | None = None
+
+    def offer(self, text: str) -> bool:
+        try:
+            self.queue.put_nowait(text)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+
+class ConnectionManager:
+    def __init__(
+        self,
+        bus: BroadcastBus | None = None,
+        *,
+        max_queue: int = 64,
+        close_timeout_seconds: float = 5.0,
+    ) -> None:
+        self._connections: dict[str, dict[WebSocket, ClientChannel]] = defaultdict(dict)
+        self.max_queue = max_queue
+        self.close_timeout_seconds = close_timeout_seconds
+        self.bus = bus or InMemoryBus()
+        self.bus.attach(self.deliver)
+        self._control_listeners: list[ControlListener] = []
+        self.messages_sent = 0
+        self.messages_dropped = 0
+        self.evictions = 0
+        self.publish_failures = 0
+        self.send_seconds_total = 0.0
+        self.send_seconds_max = 0.0
+
+    async def connect(self, room_code: str, websocket: WebSocket) -> None:
+        await websocket.accept()
+        channel = ClientChannel(websocket, self.max_queue)
+        channel.sender = asyncio.create_task(self._drain(room_code, channel))
+        self._connections[room_code][websocket] = channel
+
+    def disconnect(self, room_code: str, websocket: WebSocket) -> None:
+        room_connections = self._connections.get(room_code)
+        if not room_connections:
+            return
+        channel = room_connections.pop(websocket, None)
+        if channel is not None and channel.sender is not None and channel.sender is not asyncio.current_task():
+            channel.sender.cancel()
+        if not room_connections:
+            self._connections.pop(room_code, None)
+
+    async def broadcast(self, room_code: str, message: dict) -> None:
+        await self._publish(room_code, message)
+
+    def add_control_listener(self, listener: ControlListener) -> None:
+        self._control_listeners.append(listener)
+
+    async def broadcast_control(self, room_code: str, message: dict) -> None:
+        """Tell every worker, this one included, about a change to the room; sockets never see it."""
+        await self._publish(room_code, {**message, CONTROL_KEY: True})
+
+    async def _publish(self, room_code: str, message: dict) -> None:
+        # Callers broadcast after committing; a bus outage must not turn a
+        # write that already happened into an error the client retries.
+        try:
+            await self.bus.publish(room_code, message)
+        except Exception:
+            self.publish_failures += 1
+            logger.exception("Failed to publish %s broadcast for room %s", message.get("event"), room_code)
+
+    async def deliver(self, room_code: str, message: dict) -> None:
+        """Queue one serialized copy of the message for every socket in the room without waiting on sends."""
+        if message.get(CONTROL_KEY):
+            for listener in self._control_listeners:
+                listener(room_code, message)
+            return
+        room_connections = list(self._connections.get(room_code, {}).values())
+        if not room_connections:
+            return
+        text = json.dumps(message, separators=(",", ":"))
+        for channel in room_connections:
+            if not channel.offer(text):
+                self.messages_dropped += 1
+                self._evict(room_code, channel)
+
+    async def _drain(self, room_code: str, channel: ClientChannel) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            text = await channel.queue.get()
+            started = loop.time()
+            try:
+                await channel.websocket.send_text(text)
+            except Exception:
+                self.disconnect(room_code, channel.websocket)
+                return
+            elapsed = loop.time() - started
+            self.messages_sent += 1
+            self.send_seconds_total += elapsed
+            self.send_seconds_max = max(self.send_seconds_max, elapsed)
+
+    def _evict(self, room_code: str, channel: ClientChannel) -> None:
+        # A consumer that cannot keep up is dropped; clients reconnect and
+        # refetch state, which is cheaper than holding the room back.
+        self.evictions += 1
+        self.disconnect(room_code, channel.websocket)
+        asyncio.get_running_loop().create_task(self._close_slow_consumer(channel.websocket))
+
+    async def _close_slow_consumer(self, websocket: WebSocket) -> None:
+        try:
+            await asyncio.wait_for(websocket.close(code=1013, reason="Too slow"), self.close_timeout_seconds)
+        except Exception:
+            pass
+
+    def stats(self) -> dict[str, float | int]:
+        channels = [channel for room in self._connections.values() for channel in room.values()]
+        depths = [channel.queue.qsize() for channel in channels]
+        return {
+            "rooms": len(self._connections),
+            "connections": len(channels),
+            "queued_messages": sum(depths),
+            "max_queue_depth": max(depths, default=0),
+            "messages_sent": self.messages_sent,
+            "messages_dropped": self.messages_dropped,
+            "evictions": self.evictions,
+            "publish_failures": self.publish_failures,
+            "avg_send_ms": round(self.send_seconds_total / self.messages_sent * 1000, 3) if self.messages_sent else 0.0,
+            "max_send_ms": round(self.send_seconds_max * 1000, 3),
+        }
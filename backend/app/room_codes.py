@@ -0,0 +1,104 @@
+import secrets
+import string
+from collections import Counter
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import exists, update
+from sqlalchemy.orm import Session, aliased
+
+from .config import env_int
+from .database import dialect_insert
+from .models import Session as SessionModel
+
+
+ROOM_CODE_ALPHABET = string.ascii_uppercase + string.digits
+ROOM_CODE_LENGTH = 6
+# Retired codes use lowercase, which live codes never do, and the column's full width.
+RETIRED_CODE_ALPHABET = string.ascii_lowercase + string.digits
+RETIRED_CODE_LENGTH = 8
+
+room_code_counters: Counter[str] = Counter()
+
+
+class RoomCodeExhaustedError(Exception):
+    pass
+
+
+def random_room_code(length: int = ROOM_CODE_LENGTH) -> str:
+    return "".join(secrets.choice(ROOM_CODE_ALPHABET) for _ in range(length))
+
+
+def get_recycle_after() -> timedelta:
+    return timedelta(hours=env_int("ROOM_CODE_RECYCLE_AFTER_HOURS", 720))
+
+
+def retire_expired_code(db: Session, code: str, *, now: datetime | None = None) -> bool:
+    """Move an expired session off ``code`` so it can be handed out again.
+
+    The old session keeps its history under a random lowercase code; only
+    ended sessions older than ROOM_CODE_RECYCLE_AFTER_HOURS are moved, so a
+    long-running room keeps its code. The UPDATE
+    skips a retired code already in use rather than raising, so it needs no
+    savepoint; only two retirements drawing the same code at once could clash.
+    """
+    cutoff = (now or datetime.now(timezone.utc)) - get_recycle_after()
+    retired = "".join(secrets.choice(RETIRED_CODE_ALPHABET) for _ in range(RETIRED_CODE_LENGTH))
+    holder = aliased(SessionModel)
+    result = db.execute(
+        update(SessionModel)
+        .where(
+            SessionModel.room_code == code,
+            SessionModel.status == "ended",
+            SessionModel.created_at < cutoff,
+            ~exists().where(holder.room_code == retired),
+        )
+        .values(room_code=retired)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+def get_allocation_attempts() -> int:
+    return env_int("ROOM_CODE_ALLOCATION_ATTEMPTS", 50)
+
+
+def allocate_room_code(
+    db: Session,
+    values: dict[str, Any],
+    *,
+    attempts: int | None = None,
+    length: int = ROOM_CODE_LENGTH,
+    on_recycled: Callable[[str], None] | None = None,
+) -> SessionModel:
+    """Insert a session row with ``values`` under a random room code.
+
+    Each attempt is a single INSERT ... ON CONFLICT (room_code) DO NOTHING,
+    so the common case costs no probe query and a clash neither raises nor
+    needs a savepoint; it just returns no row. A clash with an expired,
+    ended session recycles that code instead of drawing a new one, and
+    ``on_recycled`` hears about it.
+    """
+    insert = dialect_insert(db)
+    for _ in range(attempts or get_allocation_attempts()):
+        code = random_room_code(length)
+        for recycled in (False, True):
+            stmt = (
+                insert(SessionModel)
+                .values(room_code=code, **values)
+                .on_conflict_do_nothing(index_elements=["room_code"])
+                .returning(SessionModel)
+            )
+            session = db.scalar(stmt)
+            if session is not None:
+                room_code_counters["allocated"] += 1
+                return session
+            room_code_counters["collisions"] += 1
+            if recycled or not retire_expired_code(db, code):
+                break
+            room_code_counters["recycled"] += 1
+            if on_recycled is not None:
+                on_recycled(code)
+    room_code_counters["exhausted"] += 1
+    raise RoomCodeExhaustedError("Failed to generate unique room code")
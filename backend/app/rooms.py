@@ -0,0 +1,93 @@
+import threading
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .cache import TTLCache
+from .config import env_int
+from .models import Session as SessionModel
+
+
+ROOM_INVALIDATED = "room_invalidated"
+
+
+@dataclass(frozen=True)
+class RoomRef:
+    """What hot paths need to know about a room without loading its session row."""
+
+    session_id: str
+    status: str
+    host_name: str
+    owner_user_id: str | None
+
+
+ROOM_COLUMNS = (SessionModel.id, SessionModel.status, SessionModel.host_name, SessionModel.owner_user_id)
+
+
+class RoomCache:
+    """room_code -> RoomRef, dropped whenever the session row is written.
+
+    Every invalidation bumps a version. A lookup that read the database
+    while an invalidation happened does not store what it read, so a slow
+    reader cannot put a pre-write row back after the writer cleared it.
+    """
+
+    def __init__(self, *, max_bytes: int, ttl_seconds: float) -> None:
+        self._entries = TTLCache(max_bytes=max_bytes, ttl_seconds=ttl_seconds)
+        self._lock = threading.Lock()
+        self.version = 0
+        self.invalidations = 0
+
+    def get(self, room_code: str) -> RoomRef | None:
+        return self._entries.get(room_code)
+
+    def put(self, room_code: str, room: RoomRef, version: int) -> None:
+        with self._lock:
+            if version == self.version:
+                self._entries.set(room_code, room)
+
+    def invalidate(self, room_code: str) -> None:
+        with self._lock:
+            self.version += 1
+            self.invalidations += 1
+            self._entries.invalidate(room_code)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {**self._entries.stats(), "version": self.version, "invalidations": self.invalidations}
+
+
+room_cache = RoomCache(
+    max_bytes=env_int("ROOM_CACHE_MAX_BYTES", 1024 * 1024),
+    # Backstop for a missed cross-worker invalidation.
+    ttl_seconds=env_int("ROOM_CACHE_TTL_SECONDS", 300),
+)
+
+
+async def resolve_room(db: AsyncSession, room_code: str) -> RoomRef | None:
+    room = room_cache.get(room_code)
+    if room is not None:
+        return room
+    version = room_cache.version
+    row = (await db.execute(select(*ROOM_COLUMNS).where(SessionModel.room_code == room_code))).first()
+    if row is None:
+        return None
+    room = RoomRef(*row)
+    room_cache.put(room_code, room, version)
+    return room
+
+
+async def refresh_room(db: AsyncSession, room_code: str) -> RoomRef | None:
+    """Drop the cached entry and read the room again.
+
+    Used before refusing a request on a cached status: a start on another
+    worker only reaches this one through the bus, which the in-memory
+    default does not share across processes.
+    """
+    room_cache.invalidate(room_code)
+    return await resolve_room(db, room_code)
@@ -116,6 +116,18 @@ class SessionResultsResponse(BaseModel):
     results: List[SessionResultItem]
 
 
+class RestaurantEnrichmentItem(BaseModel):
+    restaurant_id: int
+    popular_dishes: List[dict] | None = None
+    reviews: List[dict] | None = None
+
+
+class RestaurantEnrichmentResponse(BaseModel):
+    results: List[RestaurantEnrichmentItem]
+    # Requested restaurants whose data missed the deadline; ask again shortly.
+    pending: List[int] = []
+
+
 class ParticipantSummary(BaseModel):
     user_name: str
 
@@ -146,3 +158,10 @@ class UpdateFiltersRequest(BaseModel):
 class MySessionsResponse(BaseModel):
     hosted: List[SessionSummary]
     joined: List[SessionSummary]
+    hosted_next_cursor: str | None = None
+    joined_next_cursor: str | None = None
+
+
+class SessionListResponse(BaseModel):
+    sessions: List[SessionResponse]
+    next_cursor: str | None = None
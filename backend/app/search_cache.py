@@ -0,0 +1,488 @@
+import asyncio
+import logging
+import math
+import statistics
+from collections import Counter
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from .cache import SingleFlight, TTLCache
+from .canonical import get_canonicalizer
+from .config import env_int
+from .integrations.yelp_client import YelpClient, YelpClientError
+from .models import YelpQueryCache
+
+
+# Memory tier in front of yelp_query_cache. Entries expire with the database
+# row they were read from, so both tiers agree on freshness.
+yelp_results_cache = TTLCache(
+    max_bytes=env_int("YELP_MEMORY_CACHE_MAX_BYTES", 32 * 1024 * 1024),
+    ttl_seconds=env_int("YELP_CACHE_TTL_MINUTES", 1440) * 60,
+)
+yelp_search_flight = SingleFlight()
+search_cache_counters: Counter[str] = Counter()
+
+logger = logging.getLogger(__name__)
+
+_refreshing_keys: set[str] = set()
+_refresh_tasks: set[asyncio.Task] = set()
+
+
+def get_cache_ttl_minutes() -> int:
+    return env_int("YELP_CACHE_TTL_MINUTES", 1440)
+
+
+def get_cache_hard_ttl_minutes() -> int:
+    """Rows older than the soft TTL but younger than this are served stale and refreshed in the background."""
+    return max(env_int("YELP_CACHE_HARD_TTL_MINUTES", 10080), get_cache_ttl_minutes())
+
+
+def build_query_key(
+    *, term: str, location_text: str, price: str | None, radius_meters: int | None, offset: int = 0
+) -> str:
+    canonicalizer = get_canonicalizer()
+    normalized_price = (price or "").strip()
+    normalized_radius = str(radius_meters or "")
+    parts = [canonicalizer.term(term), canonicalizer.location(location_text), normalized_price, normalized_radius]
+    # The first page keeps the original key so rows cached before paging still match.
+    if offset:
+        parts.append(f"@{offset}")
+    return "|".join(parts)
+
+
+def as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def is_cache_row_fresh(created_at: datetime, cutoff: datetime) -> bool:
+    return as_utc(created_at) >= cutoff
+
+
+def parse_price_tiers(price: str | None) -> set[int] | None:
+    """``"1,2"`` -> ``{1, 2}``; ``None`` means any price."""
+    tiers = {int(part) for part in (price or "").split(",") if part.strip().isdigit()}
+    return tiers or None
+
+
+def business_price_tier(business: dict) -> int | None:
+    price = business.get("price")
+    if isinstance(price, str) and price and set(price) == {"$"}:
+        return len(price)
+    return None
+
+
+def haversine_meters(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * 6371000 * math.asin(math.sqrt(a))
+
+
+def _coordinates(business: dict) -> tuple[float, float] | None:
+    coordinates = business.get("coordinates") or {}
+    lat, lng = coordinates.get("latitude"), coordinates.get("longitude")
+    if isinstance(lat, (int, float)) and isinstance(lng, (int, float)):
+        return float(lat), float(lng)
+    return None
+
+
+def covers_query(
+    cached_price: str | None, cached_radius: int | None, *, price: str | None, radius_meters: int | None
+) -> bool:
+    """Whether a search cached with these filters returns a superset of the requested one."""
+    cached_tiers, wanted_tiers = parse_price_tiers(cached_price), parse_price_tiers(price)
+    if cached_tiers is not None and (wanted_tiers is None or not wanted_tiers <= cached_tiers):
+        return False
+    # Without a radius the provider applies its own default, so only an
+    # unbounded request is covered by an unbounded row.
+    if cached_radius is None:
+        return radius_meters is None
+    return radius_meters is not None and radius_meters <= cached_radius
+
+
+def filter_superset_results(
+    businesses: list[dict], *, price: str | None, radius_meters: int | None, widened_radius: bool
+) -> list[dict]:
+    """Narrow a broader cached search down to the requested price tiers and radius.
+
+    Distances come from the provider's ``distance`` field when present;
+    otherwise from the median coordinates of the broader result, which
+    approximates the search center. Businesses whose distance or price
+    cannot be told are left out rather than guessed in.
+    """
+    tiers = parse_price_tiers(price)
+    points = [point for point in map(_coordinates, businesses) if point is not None]
+    center = (statistics.median(p[0] for p in points), statistics.median(p[1] for p in points)) if points else None
+
+    narrowed = []
+    for business in businesses:
+        if tiers is not None and business_price_tier(business) not in tiers:
+            continue
+        if widened_radius:
+            distance = business.get("distance")
+            if not isinstance(distance, (int, float)):
+                point = _coordinates(business)
+                if point is None or center is None:
+                    continue
+                distance = haversine_meters(*center, *point)
+            if distance > radius_meters:
+                continue
+        narrowed.append(business)
+    return narrowed
+
+
+def _fresh_results(cache_row: YelpQueryCache | None, now: datetime, ttl: timedelta) -> list[dict] | None:
+    if cache_row and is_cache_row_fresh(cache_row.created_at, now - ttl) and isinstance(cache_row.results, list):
+        return cache_row.results
+    return None
+
+
+async def _fetch_and_store(
+    db: AsyncSession,
+    cache_row: YelpQueryCache | None,
+    get_client: Callable[[], YelpClient],
+    *,
+    query_key: str,
+    term: str,
+    location_text: str,
+    price: str | None,
+    radius_meters: int | None,
+    limit: int,
+    offset: int,
+) -> list[dict]:
+    client = get_client()
+    businesses = await client.search_businesses_async(
+        term=term,
+        location=location_text,
+        price=price,
+        radius_meters=radius_meters,
+        limit=limit,
+        offset=offset,
+    )
+    if cache_row:
+        cache_row.results = businesses
+        cache_row.created_at = datetime.now(timezone.utc)
+    else:
+        db.add(
+            YelpQueryCache(
+                query_key=query_key,
+                term=term,
+                location_text=location_text,
+                price=price,
+                radius_meters=radius_meters,
+                results=businesses,
+            )
+        )
+    return businesses
+
+
+async def _fetch_under_lease(bind: AsyncEngine, query_key: str, fetch) -> list[dict]:
+    """Cross-worker single flight: hold a Postgres advisory lock on the query key.
+
+    The lock is taken in a short transaction of its own, so a worker that
+    waited on it re-reads the row the holder just committed instead of
+    calling upstream again.
+    """
+    async with AsyncSession(bind=bind, expire_on_commit=False) as lease_db:
+        async with lease_db.begin():
+            await lease_db.execute(select(func.pg_advisory_xact_lock(func.hashtextextended(query_key, 0))))
+            cache_row = await lease_db.scalar(select(YelpQueryCache).where(YelpQueryCache.query_key == query_key))
+            ttl = timedelta(minutes=get_cache_ttl_minutes())
+            fresh = _fresh_results(cache_row, datetime.now(timezone.utc), ttl)
+            if fresh is not None:
+                return fresh
+            return await fetch(lease_db, cache_row)
+
+
+async def _from_superset(
+    db: AsyncSession,
+    *,
+    query_key: str,
+    term: str,
+    location_text: str,
+    price: str | None,
+    radius_meters: int | None,
+    now: datetime,
+    ttl: timedelta,
+) -> list[dict] | None:
+    """Answer a first-page search from a fresh cached search for the same term and location with looser filters."""
+    prefix = build_query_key(term=term, location_text=location_text, price=None, radius_meters=None)[:-1]
+    rows = await db.scalars(
+        select(YelpQueryCache).where(
+            YelpQueryCache.query_key.startswith(prefix, autoescape=True),
+            YelpQueryCache.query_key != query_key,
+            YelpQueryCache.created_at >= now - ttl,
+        )
+    )
+    best: list[dict] | None = None
+    best_row: YelpQueryCache | None = None
+    for row in rows:
+        parts = row.query_key[len(prefix):].split("|")
+        # Later pages are offset into their own filtered result and cannot be narrowed.
+        if len(parts) != 2 or not isinstance(row.results, list):
+            continue
+        cached_price, cached_radius = parts[0] or None, int(parts[1]) if parts[1].isdigit() else None
+        if not covers_query(cached_price, cached_radius, price=price, radius_meters=radius_meters):
+            continue
+        narrowed = filter_superset_results(
+            row.results, price=price, radius_meters=radius_meters, widened_radius=cached_radius != radius_meters
+        )
+        if best is None or len(narrowed) > len(best):
+            best, best_row = narrowed, row
+
+    if best is None:
+        return None
+    if len(best) < env_int("YELP_SUBSUMPTION_MIN_RESULTS", 10):
+        search_cache_counters["subsumption_too_small"] += 1
+        return None
+    search_cache_counters["subsumption_hits"] += 1
+    remaining = as_utc(best_row.created_at) + ttl - now
+    yelp_results_cache.set(query_key, best, ttl_seconds=remaining.total_seconds())
+    return best
+
+
+async def _load_or_fetch(
+    db: AsyncSession,
+    get_client: Callable[[], YelpClient],
+    *,
+    query_key: str,
+    term: str,
+    location_text: str,
+    price: str | None,
+    radius_meters: int | None,
+    limit: int,
+    offset: int,
+) -> list[dict]:
+    ttl = timedelta(minutes=get_cache_ttl_minutes())
+    hard_ttl = timedelta(minutes=get_cache_hard_ttl_minutes())
+    now = datetime.now(timezone.utc)
+    cache_row = await db.scalar(select(YelpQueryCache).where(YelpQueryCache.query_key == query_key))
+    fresh = _fresh_results(cache_row, now, ttl)
+    if fresh is not None:
+        remaining = as_utc(cache_row.created_at) + ttl - now
+        yelp_results_cache.set(query_key, fresh, ttl_seconds=remaining.total_seconds())
+        return fresh
+    if offset == 0:
+        narrowed = await _from_superset(
+            db,
+            query_key=query_key,
+            term=term,
+            location_text=location_text,
+            price=price,
+            radius_meters=radius_meters,
+            now=now,
+            ttl=ttl,
+        )
+        if narrowed is not None:
+            return narrowed
+
+    async def fetch(target_db: AsyncSession, target_row: YelpQueryCache | None) -> list[dict]:
+        return await _fetch_and_store(
+            target_db,
+            target_row,
+            get_client,
+            query_key=query_key,
+            term=term,
+            location_text=location_text,
+            price=price,
+            radius_meters=radius_meters,
+            limit=limit,
+            offset=offset,
+        )
+
+    stale = _fresh_results(cache_row, now, hard_ttl)
+    if stale:
+        search_cache_counters["stale_serves"] += 1
+        _schedule_refresh(db.bind, query_key, fetch)
+        return stale
+
+    search_cache_counters["blocking_fetches"] += 1
+    if db.bind.dialect.name == "postgresql":
+        businesses = await _fetch_under_lease(db.bind, query_key, fetch)
+    else:
+        businesses = await fetch(db, cache_row)
+    if businesses:
+        yelp_results_cache.set(query_key, businesses, ttl_seconds=ttl.total_seconds())
+    return businesses
+
+
+def _schedule_refresh(bind: AsyncEngine, query_key: str, fetch) -> None:
+    if query_key in _refreshing_keys:
+        return
+    _refreshing_keys.add(query_key)
+    task = asyncio.create_task(_refresh(bind, query_key, fetch))
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_tasks.discard)
+
+
+async def _refresh(bind: AsyncEngine, query_key: str, fetch) -> None:
+    try:
+        if bind.dialect.name == "postgresql":
+            businesses = await _fetch_under_lease(bind, query_key, fetch)
+        else:
+            async with AsyncSession(bind=bind, expire_on_commit=False) as refresh_db:
+                cache_row = await refresh_db.scalar(
+                    select(YelpQueryCache).where(YelpQueryCache.query_key == query_key)
+                )
+                businesses = await fetch(refresh_db, cache_row)
+                await refresh_db.commit()
+        if businesses:
+            ttl_seconds = get_cache_ttl_minutes() * 60
+            yelp_results_cache.set(query_key, businesses, ttl_seconds=ttl_seconds)
+        search_cache_counters["background_refreshes"] += 1
+    except Exception:
+        search_cache_counters["background_refresh_failures"] += 1
+        logger.exception("Background refresh failed for Yelp query %s", query_key)
+    finally:
+        _refreshing_keys.discard(query_key)
+
+
+async def drain_background_refreshes() -> None:
+    """Wait for scheduled stale-while-revalidate refreshes to finish."""
+    while _refresh_tasks:
+        await asyncio.gather(*list(_refresh_tasks), return_exceptions=True)
+
+
+async def search_businesses_cached(
+    db: AsyncSession,
+    get_client: Callable[[], YelpClient],
+    *,
+    term: str,
+    location_text: str,
+    price: str | None,
+    radius_meters: int | None,
+    limit: int = 30,
+    offset: int = 0,
+) -> list[dict]:
+    """Resolve a search through the memory tier, then yelp_query_cache, then RapidAPI.
+
+    A first page with no fresh row of its own can be narrowed from a fresh
+    row for the same term and location with a wider radius or more price
+    tiers, provided enough businesses survive the filter. Otherwise, rows
+    past the soft TTL but inside the hard TTL are returned as-is while a
+    background task refreshes them; only rows past the hard TTL (or missing)
+    block on upstream. Concurrent misses for the same query key share one lookup in-process, and
+    on Postgres an advisory lock extends that across workers.
+    """
+    query_key = build_query_key(
+        term=term, location_text=location_text, price=price, radius_meters=radius_meters, offset=offset
+    )
+    cached = yelp_results_cache.get(query_key)
+    if cached is not None:
+        return cached
+
+    return await yelp_search_flight.do(
+        query_key,
+        lambda: _load_or_fetch(
+            db,
+            get_client,
+            query_key=query_key,
+            term=term,
+            location_text=location_text,
+            price=price,
+            radius_meters=radius_meters,
+            limit=limit,
+            offset=offset,
+        ),
+    )
+
+
+def dedupe_businesses(businesses: list[dict]) -> list[dict]:
+    """Drop repeats of a business id, keeping the first occurrence; entries without an id are kept."""
+    seen: set[str] = set()
+    unique: list[dict] = []
+    for business in businesses:
+        business_id = business.get("id") if isinstance(business, dict) else None
+        if business_id:
+            if business_id in seen:
+                continue
+            seen.add(business_id)
+        unique.append(business)
+    return unique
+
+
+async def search_businesses_paged(
+    db: AsyncSession,
+    get_client: Callable[[], YelpClient],
+    *,
+    term: str,
+    location_text: str,
+    price: str | None,
+    radius_meters: int | None,
+    pages: int,
+    first_page: int = 0,
+    page_size: int = 30,
+    concurrency: int = 4,
+    page_timeout_seconds: float = 8.0,
+) -> list[dict]:
+    """Fetch result pages ``first_page`` up to ``pages - 1`` concurrently, each cached under its own query key.
+
+    The first of them goes through ``db`` like a single search and its errors
+    propagate. Later pages use short sessions of their own, since one
+    AsyncSession cannot run statements concurrently; a later page that fails
+    or times out is logged and left out. Pages are not started once an
+    earlier page came back short, and everything after the first short page
+    is dropped, so a provider that ignores offsets cannot pad the deck.
+    """
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    last_page = max(pages, 1) - 1
+
+    async def search_page(page_db: AsyncSession, page: int) -> list[dict]:
+        return await asyncio.wait_for(
+            search_businesses_cached(
+                page_db,
+                get_client,
+                term=term,
+                location_text=location_text,
+                price=price,
+                radius_meters=radius_meters,
+                limit=page_size,
+                offset=page * page_size,
+            ),
+            page_timeout_seconds,
+        )
+
+    async def fetch_page(page: int) -> list[dict]:
+        nonlocal last_page
+        async with semaphore:
+            if page > last_page:
+                search_cache_counters["pages_skipped"] += 1
+                return []
+            if page == first_page:
+                try:
+                    businesses = await search_page(db, page)
+                except asyncio.TimeoutError as exc:
+                    search_cache_counters["page_timeouts"] += 1
+                    raise YelpClientError("Timed out fetching restaurants from RapidAPI Yelp") from exc
+            else:
+                try:
+                    async with AsyncSession(bind=db.bind, expire_on_commit=False) as page_db:
+                        businesses = await search_page(page_db, page)
+                        await page_db.commit()
+                except asyncio.TimeoutError:
+                    search_cache_counters["page_timeouts"] += 1
+                    logger.warning("Timed out fetching page %s of Yelp query %s", page, term)
+                    return []
+                except Exception:
+                    search_cache_counters["page_failures"] += 1
+                    logger.exception("Failed to fetch page %s of Yelp query %s", page, term)
+                    return []
+            search_cache_counters["pages_fetched"] += 1
+            if len(businesses) < page_size:
+                last_page = min(last_page, page)
+            return businesses
+
+    results = await asyncio.gather(*(fetch_page(page) for page in range(first_page, last_page + 1)))
+    return dedupe_businesses([business for page in results[: last_page + 1 - first_page] for business in page])
+
+
+def search_cache_stats() -> dict[str, float | int]:
+    counters = dict(search_cache_counters)
+    subsumed = counters.get("subsumption_hits", 0)
+    lookups = subsumed + counters.get("blocking_fetches", 0)
+    # Share of searches that would otherwise have blocked on upstream.
+    return {**counters, "subsumption_rate": round(subsumed / lookups, 4) if lookups else 0.0}
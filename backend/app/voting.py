@@ -0,0 +1,261 @@
+from collections import defaultdict
+from dataclasses import dataclass
+
+from fastapi import HTTPException
+from sqlalchemy import bindparam, delete, func, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from .database import dialect_insert
+from .models import Participant, Restaurant, RestaurantVoteTally, Session as SessionModel, Vote
+
+
+@dataclass
+class VoteOutcome:
+    duplicate: bool
+    total_participants: int
+    votes_submitted: int
+    yes_votes: int
+    restaurant_name: str | None
+    restaurant_image_url: str | None
+    next_restaurant: Restaurant | None
+    next_yes_votes: int
+    next_total_votes: int
+
+    @property
+    def matched(self) -> bool:
+        return self.total_participants > 0 and self.yes_votes == self.total_participants
+
+
+def _tally_value(session_id, restaurant_id, column: str):
+    tally = aliased(RestaurantVoteTally)
+    return (
+        select(getattr(tally, column))
+        .where(tally.session_id == session_id, tally.restaurant_id == restaurant_id)
+        .scalar_subquery()
+    )
+
+
+def _participant_count(session_id):
+    return select(func.count(Participant.id)).where(Participant.session_id == session_id).scalar_subquery()
+
+
+def _next_restaurant_id(session_id, user_name: str):
+    candidate = aliased(Restaurant)
+    voted_restaurant_ids = select(Vote.restaurant_id).where(
+        Vote.session_id == session_id,
+        Vote.participant_name == user_name,
+    )
+    return (
+        select(func.min(candidate.id))
+        .where(candidate.session_id == session_id, ~candidate.id.in_(voted_restaurant_ids))
+        .scalar_subquery()
+    )
+
+
+async def _insert_vote(db: AsyncSession, *, room_code: str, user_name: str, restaurant_id: int, decision: str):
+    """INSERT ... SELECT that only produces a row when session, participant and restaurant all check out."""
+    source = (
+        select(SessionModel.id, Participant.user_name, Restaurant.id, literal(decision))
+        .join(Participant, Participant.session_id == SessionModel.id)
+        .join(Restaurant, Restaurant.session_id == SessionModel.id)
+        .where(
+            SessionModel.room_code == room_code,
+            SessionModel.status == "active",
+            Participant.user_name == user_name,
+            Restaurant.id == restaurant_id,
+        )
+    )
+    insert = dialect_insert(db)
+    stmt = (
+        insert(Vote)
+        .from_select(["session_id", "participant_name", "restaurant_id", "decision"], source)
+        .on_conflict_do_nothing(index_elements=["session_id", "participant_name", "restaurant_id"])
+        .returning(Vote.session_id)
+    )
+    return await db.scalar(stmt)
+
+
+async def _resolve_rejected_vote(
+    db: AsyncSession, *, room_code: str, user_name: str, restaurant_id: int, decision: str
+) -> str:
+    """Explain why the insert produced no row; returns the session id when it was a same-decision duplicate."""
+    participant_exists = (
+        select(Participant.id)
+        .where(Participant.session_id == SessionModel.id, Participant.user_name == user_name)
+        .exists()
+    )
+    restaurant_exists = (
+        select(Restaurant.id)
+        .where(Restaurant.session_id == SessionModel.id, Restaurant.id == restaurant_id)
+        .exists()
+    )
+    existing_decision = (
+        select(Vote.decision)
+        .where(
+            Vote.session_id == SessionModel.id,
+            Vote.participant_name == user_name,
+            Vote.restaurant_id == restaurant_id,
+        )
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        select(
+            SessionModel.id,
+            SessionModel.status,
+            participant_exists,
+            restaurant_exists,
+            existing_decision,
+        ).where(SessionModel.room_code == room_code)
+    )
+    row = result.first()
+
+    if row is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    session_id, status, has_participant, has_restaurant, previous_decision = row
+    if status != "active":
+        raise HTTPException(status_code=409, detail="Session is not active")
+    if not has_participant:
+        raise HTTPException(status_code=404, detail="Participant not found in session")
+    if not has_restaurant:
+        raise HTTPException(status_code=404, detail="Restaurant not found in session")
+    if previous_decision != decision:
+        raise HTTPException(status_code=409, detail="Vote already exists with different decision")
+    return session_id
+
+
+async def _bump_tally(db: AsyncSession, *, session_id: str, restaurant_id: int, decision: str) -> None:
+    insert = dialect_insert(db)
+    stmt = insert(RestaurantVoteTally).values(
+        session_id=session_id,
+        restaurant_id=restaurant_id,
+        yes_count=1 if decision == "yes" else 0,
+        total_count=1,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["session_id", "restaurant_id"],
+        set_={
+            "yes_count": RestaurantVoteTally.yes_count + stmt.excluded.yes_count,
+            "total_count": RestaurantVoteTally.total_count + stmt.excluded.total_count,
+        },
+    )
+    await db.execute(stmt)
+
+
+def _next_card_query(session_id, user_name: str):
+    next_tally = aliased(RestaurantVoteTally)
+    return (
+        select(
+            Restaurant,
+            func.coalesce(next_tally.yes_count, 0),
+            func.coalesce(next_tally.total_count, 0),
+        )
+        .select_from(select(literal(1).label("anchor")).subquery())
+        .outerjoin(Restaurant, Restaurant.id == _next_restaurant_id(session_id, user_name))
+        .outerjoin(next_tally, next_tally.restaurant_id == Restaurant.id)
+    )
+
+
+async def cast_vote(
+    db: AsyncSession, *, room_code: str, user_name: str, restaurant_id: int, decision: str
+) -> VoteOutcome:
+    """Record a vote and read back tallies plus the voter's next card.
+
+    The happy path is three statements: the validating vote insert, the
+    tally upsert, and one read that gathers every count and the next
+    restaurant. Rejected inserts take one extra diagnostic query to pick the
+    right error or flag a duplicate, and leave the tallies untouched.
+    """
+    duplicate = False
+    session_id = await _insert_vote(
+        db, room_code=room_code, user_name=user_name, restaurant_id=restaurant_id, decision=decision
+    )
+    if session_id is None:
+        session_id = await _resolve_rejected_vote(
+            db, room_code=room_code, user_name=user_name, restaurant_id=restaurant_id, decision=decision
+        )
+        duplicate = True
+    else:
+        await _bump_tally(db, session_id=session_id, restaurant_id=restaurant_id, decision=decision)
+
+    voted = aliased(Restaurant)
+    result = await db.execute(
+        _next_card_query(session_id, user_name).add_columns(
+            _participant_count(session_id),
+            _tally_value(session_id, restaurant_id, "total_count"),
+            _tally_value(session_id, restaurant_id, "yes_count"),
+            select(voted.name).where(voted.id == restaurant_id).scalar_subquery(),
+            select(voted.image_url).where(voted.id == restaurant_id).scalar_subquery(),
+        )
+    )
+    next_restaurant, next_yes, next_total, total_participants, votes_submitted, yes_votes, name, image_url = (
+        result.one()
+    )
+    return VoteOutcome(
+        duplicate=duplicate,
+        total_participants=total_participants or 0,
+        votes_submitted=votes_submitted or 0,
+        yes_votes=yes_votes or 0,
+        restaurant_name=name,
+        restaurant_image_url=image_url,
+        next_restaurant=next_restaurant,
+        next_yes_votes=next_yes if next_restaurant else 0,
+        next_total_votes=next_total if next_restaurant else 0,
+    )
+
+
+async def load_next_card(
+    db: AsyncSession, session_id: str, user_name: str
+) -> tuple[Restaurant | None, int, int, int]:
+    """Return the voter's next restaurant with its yes/total tallies and the participant count."""
+    result = await db.execute(
+        _next_card_query(session_id, user_name).add_columns(_participant_count(session_id))
+    )
+    next_restaurant, yes_votes, total_votes, total_participants = result.one()
+    return next_restaurant, yes_votes, total_votes, total_participants or 0
+
+
+async def load_ranked_restaurants(db: AsyncSession, session_id: str) -> list[tuple[Restaurant, int, int]]:
+    yes_votes = func.coalesce(RestaurantVoteTally.yes_count, 0).label("yes_votes")
+    total_votes = func.coalesce(RestaurantVoteTally.total_count, 0).label("total_votes")
+    result = await db.execute(
+        select(Restaurant, yes_votes, total_votes)
+        .outerjoin(RestaurantVoteTally, RestaurantVoteTally.restaurant_id == Restaurant.id)
+        .where(Restaurant.session_id == session_id)
+        .order_by(yes_votes.desc(), total_votes.desc(), Restaurant.id.asc())
+    )
+    return [(restaurant, yes, total) for restaurant, yes, total in result.all()]
+
+
+async def remove_participant_votes(db: AsyncSession, session_id: str, user_name: str) -> None:
+    """Delete a participant's votes and take them back out of the tallies."""
+    result = await db.execute(
+        delete(Vote)
+        .where(Vote.session_id == session_id, Vote.participant_name == user_name)
+        .returning(Vote.restaurant_id, Vote.decision)
+    )
+    removed = result.all()
+    if not removed:
+        return
+
+    deltas: dict[int, list[int]] = defaultdict(lambda: [0, 0])
+    for restaurant_id, decision in removed:
+        deltas[restaurant_id][0] += 1 if decision == "yes" else 0
+        deltas[restaurant_id][1] += 1
+
+    tallies = RestaurantVoteTally.__table__
+    await db.execute(
+        update(tallies)
+        .where(
+            tallies.c.session_id == bindparam("b_session_id"),
+            tallies.c.restaurant_id == bindparam("b_restaurant_id"),
+        )
+        .values(
+            yes_count=tallies.c.yes_count - bindparam("b_yes"),
+            total_count=tallies.c.total_count - bindparam("b_total"),
+        ),
+        [
+            {"b_session_id": session_id, "b_restaurant_id": restaurant_id, "b_yes": yes, "b_total": total}
+            for restaurant_id, (yes, total) in deltas.items()
+        ],
+    )
@@ -1,8 +1,11 @@
 from collections import defaultdict
 
+from sqlalchemy.orm import joinedload
+
+from app.cards import stamp_card
 from app.database import SessionLocal
 from app.main import extract_business_image_url, search_pexels_fallback_images
-from app.models import Restaurant, Session
+from app.models import Business, Restaurant, Session
 
 
 def main() -> None:
@@ -15,12 +18,12 @@ def main() -> None:
     still_missing = 0
 
     try:
-        restaurants = db.query(Restaurant).all()
+        restaurants = db.query(Restaurant).options(joinedload(Restaurant.business).undefer(Business.payload)).all()
         missing_for_fallback: dict[tuple[str, str], list[Restaurant]] = defaultdict(list)
 
         for restaurant in restaurants:
             scanned += 1
-            payload = restaurant.source_payload
+            payload = restaurant.business.payload
             if not isinstance(payload, dict):
                 missing_payload += 1
                 session = db.get(Session, restaurant.session_id)
@@ -57,6 +60,9 @@ def main() -> None:
                 else:
                     still_missing += 1
 
+        # Cards embed image_url, so re-stamp every row whose image changed.
+        for restaurant in db.dirty:
+            stamp_card(restaurant)
         db.commit()
     finally:
         db.close()
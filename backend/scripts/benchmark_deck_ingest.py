@@ -0,0 +1,113 @@
+"""Time deck ingestion against deck size.
+
+Usage: python -m scripts.benchmark_deck_ingest [--sizes 30,100,250,500] [--repeat 3] [--database-url URL]
+
+Compares the bulk path used by session start (persist_deck: one catalog
+upsert plus one multi-row INSERT ... RETURNING) with the previous
+per-object unit of work (add_all + flush). Defaults to a throwaway SQLite
+file; pass a migrated Postgres URL (postgresql+asyncpg://...) for numbers
+that include real network round trips. Rows are written inside a
+transaction that is rolled back.
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.cards import stamp_card
+from app.catalog import upsert_businesses
+from app.deck import business_external_id, extract_business_image_url, persist_deck, restaurant_columns
+from app.models import Base, Restaurant, Session
+
+
+def fake_businesses(count: int) -> list[dict]:
+    return [
+        {
+            "id": f"bench-{uuid.uuid4().hex}",
+            "name": f"Bench Place {index}",
+            "location": {"display_address": [f"{index} Main St", "San Francisco, CA"]},
+            "coordinates": {"latitude": 37.77 + index / 1e4, "longitude": -122.41},
+            "price": random.choice(["$", "$$", "$$$"]),
+            "rating": round(random.uniform(3, 5), 1),
+            "review_count": random.randint(10, 900),
+            "categories": [{"alias": "sushi", "title": "Sushi Bars"}],
+            "photos": [{"url_prefix": f"https://example.com/{index}/", "url_suffix": ".jpg"}] * 6,
+            "hours": [{"hours_type": "REGULAR", "open": [{"day": d, "start": "1100", "end": "2200"} for d in range(7)]}],
+        }
+        for index in range(count)
+    ]
+
+
+async def unit_of_work(db: AsyncSession, session_id: str, businesses: list[dict]) -> None:
+    payloads = {business_external_id(item, index): item for index, item in enumerate(businesses)}
+    catalog = await upsert_businesses(db, payloads)
+    restaurants = [
+        Restaurant(
+            session_id=session_id,
+            external_id=external_id,
+            business=catalog[external_id],
+            **restaurant_columns(item, extract_business_image_url(item)),
+        )
+        for external_id, item in payloads.items()
+    ]
+    for restaurant in restaurants:
+        stamp_card(restaurant)
+    db.add_all(restaurants)
+    await db.flush()
+
+
+async def bulk(db: AsyncSession, session_id: str, businesses: list[dict]) -> None:
+    await persist_deck(db, session_id, businesses, fallback_image_urls=[])
+
+
+async def time_once(engine, strategy, size: int) -> float:
+    async with AsyncSession(bind=engine, expire_on_commit=False) as db:
+        session = Session(room_code=uuid.uuid4().hex[:8].upper(), host_name="bench", status="waiting")
+        db.add(session)
+        await db.flush()
+        businesses = fake_businesses(size)
+        started = time.perf_counter()
+        await strategy(db, session.id, businesses)
+        elapsed = time.perf_counter() - started
+        await db.rollback()
+    return elapsed
+
+
+async def run(database_url: str, sizes: list[int], repeat: int) -> None:
+    engine = create_async_engine(database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    print(f"{'deck size':>9}{'unit of work ms':>18}{'bulk ms':>12}{'speedup':>10}")
+    for size in sizes:
+        results = {}
+        for name, strategy in (("unit_of_work", unit_of_work), ("bulk", bulk)):
+            await time_once(engine, strategy, size)  # warm-up
+            samples = [await time_once(engine, strategy, size) for _ in range(repeat)]
+            results[name] = statistics.median(samples) * 1000
+        speedup = results["unit_of_work"] / results["bulk"] if results["bulk"] else 0.0
+        print(f"{size:>9}{results['unit_of_work']:>18.1f}{results['bulk']:>12.1f}{speedup:>9.1f}x")
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="30,100,250,500")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite+aiosqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}"
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    asyncio.run(run(database_url, sizes, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
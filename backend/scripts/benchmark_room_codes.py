@@ -0,0 +1,130 @@
+"""Time room code allocation as the code space fills up.
+
+Usage: python -m scripts.benchmark_room_codes [--length 3] [--occupancy 0,0.5,0.9,0.99]
+       [--expired-share 0.0] [--creations 200] [--database-url URL]
+
+Real codes are 6 characters, far too many to fill, so the table is filled
+to each occupancy of a shorter code space instead; collision odds depend
+only on the occupied share. ``--expired-share`` marks that share of the
+filler sessions as old enough to recycle. Compares the previous allocator
+(a SELECT per candidate) with allocate_room_code (an INSERT ... ON
+CONFLICT DO NOTHING per candidate), both allowed 50 draws, reporting
+creations per second, statements per creation and failures. Each creation
+is rolled back, so occupancy holds steady. Defaults to a throwaway SQLite
+file.
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from itertools import product
+from pathlib import Path
+
+from sqlalchemy import create_engine, delete, event, insert, select
+from sqlalchemy.orm import Session
+
+from app.models import Base, Participant, Session as SessionModel
+from app.room_codes import ROOM_CODE_ALPHABET, RoomCodeExhaustedError, allocate_room_code, random_room_code
+
+
+VALUES = {"host_name": "bench", "status": "waiting"}
+
+
+def add_host(db: Session, session: SessionModel) -> SessionModel:
+    db.add(Participant(session_id=session.id, user_name="bench"))
+    db.flush()
+    return session
+
+
+def probe_allocate(db: Session, length: int) -> SessionModel:
+    """The allocator this replaced: look before inserting."""
+    for _ in range(50):
+        code = random_room_code(length)
+        if db.scalar(select(SessionModel.id).where(SessionModel.room_code == code)) is None:
+            session = SessionModel(room_code=code, **VALUES)
+            session.participants.append(Participant(user_name="bench"))
+            db.add(session)
+            db.flush()
+            return session
+    raise RoomCodeExhaustedError("Failed to generate unique room code")
+
+
+def optimistic_allocate(db: Session, length: int) -> SessionModel:
+    return add_host(db, allocate_room_code(db, VALUES, attempts=50, length=length))
+
+
+def fill(engine, length: int, occupancy: float, expired_share: float) -> None:
+    codes = ["".join(chars) for chars in product(ROOM_CODE_ALPHABET, repeat=length)]
+    taken = random.sample(codes, int(len(codes) * occupancy))
+    now = datetime.now(timezone.utc)
+    old = now - timedelta(days=365)
+    rows = [
+        {
+            "room_code": code,
+            "host_name": "filler",
+            "status": "active",
+            "created_at": old if random.random() < expired_share else now,
+        }
+        for code in taken
+    ]
+    with Session(engine) as db:
+        db.execute(delete(SessionModel))
+        if rows:
+            db.execute(insert(SessionModel), rows)
+        db.commit()
+
+
+def run(engine, allocate, length: int, creations: int) -> tuple[float, float, int]:
+    statements = 0
+
+    def count(*_) -> None:
+        nonlocal statements
+        statements += 1
+
+    failures = 0
+    event.listen(engine, "before_cursor_execute", count)
+    started = time.perf_counter()
+    try:
+        for _ in range(creations):
+            with Session(engine) as db:
+                try:
+                    allocate(db, length)
+                except RoomCodeExhaustedError:
+                    failures += 1
+                db.rollback()
+    finally:
+        elapsed = time.perf_counter() - started
+        event.remove(engine, "before_cursor_execute", count)
+    return creations / elapsed, statements / creations, failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--length", type=int, default=3)
+    parser.add_argument("--occupancy", default="0,0.5,0.9,0.99")
+    parser.add_argument("--expired-share", type=float, default=0.0)
+    parser.add_argument("--creations", type=int, default=200)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite+pysqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}"
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+
+    print(f"{'occupancy':>9}{'allocator':>12}{'creations/s':>14}{'stmts/create':>14}{'failures':>10}")
+    for occupancy in (float(value) for value in args.occupancy.split(",") if value.strip()):
+        fill(engine, args.length, occupancy, args.expired_share)
+        for name, allocate in (("probe", probe_allocate), ("optimistic", optimistic_allocate)):
+            rate, statements, failures = run(engine, allocate, args.length, args.creations)
+            print(f"{occupancy:>9.0%}{name:>12}{rate:>14.0f}{statements:>14.1f}{failures:>10}")
+
+    with Session(engine) as db:
+        db.execute(delete(SessionModel))
+        db.commit()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
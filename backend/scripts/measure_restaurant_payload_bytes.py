@@ -0,0 +1,65 @@
+"""Compare bytes read per card endpoint with and without the raw Yelp payload.
+
+Usage: python -m scripts.measure_restaurant_payload_bytes ROOM_CODE
+
+"before" selects the restaurant columns plus its business payload, which is
+what every row carried when the payload lived on `restaurants`; "after"
+selects the columns a default Restaurant load now emits.
+Values are sized as their JSON text, which tracks what the driver hands
+back closely enough to compare the two.
+"""
+
+import json
+import sys
+
+from sqlalchemy import select
+
+from app.database import SessionLocal
+from app.models import Business, Restaurant, Session
+
+
+DEFAULT_COLUMNS = list(Restaurant.__table__.columns)
+WITH_PAYLOAD = [*DEFAULT_COLUMNS, Business.payload]
+
+
+def row_bytes(row) -> int:
+    return sum(len(json.dumps(value, default=str).encode("utf-8")) for value in row)
+
+
+def measure(db, columns, where) -> int:
+    stmt = select(*columns).join_from(Restaurant, Business, Restaurant.business_id == Business.id).where(*where)
+    return sum(row_bytes(row) for row in db.execute(stmt))
+
+
+def main() -> None:
+    if len(sys.argv) != 2:
+        raise SystemExit("usage: python -m scripts.measure_restaurant_payload_bytes ROOM_CODE")
+
+    db = SessionLocal()
+    try:
+        session = db.scalar(select(Session).where(Session.room_code == sys.argv[1]))
+        if session is None:
+            raise SystemExit("session not found")
+        first_id = db.scalar(select(Restaurant.id).where(Restaurant.session_id == session.id).order_by(Restaurant.id))
+        if first_id is None:
+            raise SystemExit("session has no restaurants")
+
+        one_card = [Restaurant.id == first_id]
+        whole_deck = [Restaurant.session_id == session.id]
+        endpoints = {
+            "GET /restaurants/next": one_card,
+            "POST /votes (next card)": one_card,
+            "GET /results": whole_deck,
+        }
+        print(f"{'endpoint':<28}{'before':>12}{'after':>12}{'saved':>8}")
+        for name, where in endpoints.items():
+            before = measure(db, WITH_PAYLOAD, where)
+            after = measure(db, DEFAULT_COLUMNS, where)
+            saved = 100 * (before - after) / before if before else 0.0
+            print(f"{name:<28}{before:>12}{after:>12}{saved:>7.1f}%")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Report how far canonicalization collapses the Yelp query cache's keys.
+
+Usage: python -m scripts.report_query_key_collapse [--aliases PATH] [--top N]
+
+Every yelp_query_cache row is keyed twice: the way keys were built before
+canonicalization (lowercased and stripped) and through the alias table.
+Fewer distinct canonical keys means rows, and upstream calls, that aliases
+now share. ``--aliases`` evaluates a candidate table on top of the bundled
+one before shipping it.
+"""
+
+import argparse
+from collections import defaultdict
+
+from sqlalchemy import select
+
+from app.canonical import BUNDLED_ALIASES_PATH, AliasTableCanonicalizer, get_canonicalizer, set_canonicalizer
+from app.database import SessionLocal
+from app.models import YelpQueryCache
+from app.search_cache import build_query_key
+
+
+def legacy_query_key(row: YelpQueryCache, offset: int) -> str:
+    parts = [
+        row.term.strip().lower(),
+        row.location_text.strip().lower(),
+        (row.price or "").strip(),
+        str(row.radius_meters or ""),
+    ]
+    if offset:
+        parts.append(f"@{offset}")
+    return "|".join(parts)
+
+
+def row_offset(row: YelpQueryCache) -> int:
+    last = row.query_key.rsplit("|", 1)[-1]
+    return int(last[1:]) if last.startswith("@") and last[1:].isdigit() else 0
+
+
+def collapse_rate(before: int, after: int) -> float:
+    return 100 * (before - after) / before if before else 0.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--aliases", help="extra alias table to merge over the bundled one")
+    parser.add_argument("--top", type=int, default=10, help="largest collapsed groups to list")
+    args = parser.parse_args()
+
+    if args.aliases:
+        set_canonicalizer(AliasTableCanonicalizer.from_paths(BUNDLED_ALIASES_PATH, args.aliases))
+    canonicalizer = get_canonicalizer()
+
+    db = SessionLocal()
+    try:
+        rows = list(db.scalars(select(YelpQueryCache)))
+    finally:
+        db.close()
+    if not rows:
+        raise SystemExit("yelp_query_cache is empty")
+
+    groups: dict[str, set[str]] = defaultdict(set)
+    raw_terms, raw_locations = set(), set()
+    terms, locations = set(), set()
+    for row in rows:
+        offset = row_offset(row)
+        canonical_key = build_query_key(
+            term=row.term,
+            location_text=row.location_text,
+            price=row.price,
+            radius_meters=row.radius_meters,
+            offset=offset,
+        )
+        groups[canonical_key].add(legacy_query_key(row, offset))
+        raw_terms.add(row.term.strip().lower())
+        raw_locations.add(row.location_text.strip().lower())
+        terms.add(canonicalizer.term(row.term))
+        locations.add(canonicalizer.location(row.location_text))
+
+    legacy_keys = set().union(*groups.values())
+    print(f"{'':<12}{'legacy':>10}{'canonical':>12}{'collapsed':>12}")
+    for name, before, after in (
+        ("query keys", len(legacy_keys), len(groups)),
+        ("terms", len(raw_terms), len(terms)),
+        ("locations", len(raw_locations), len(locations)),
+    ):
+        print(f"{name:<12}{before:>10}{after:>12}{collapse_rate(before, after):>11.1f}%")
+
+    merged = sorted(
+        ((key, sorted(keys)) for key, keys in groups.items() if len(keys) > 1), key=lambda item: -len(item[1])
+    )
+    if merged:
+        print(f"\nlargest collapsed groups (of {len(merged)}):")
+        for canonical_key, keys in merged[: args.top]:
+            print(f"  {canonical_key}  <-  {', '.join(keys)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,45 @@
-from collections.abc import Generator
+import tempfile
+from collections.abc import AsyncGenerator, Generator
+from pathlib import Path
 
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine, delete
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool
+
+from app.business_cache import business_enrichment_cache
+from app.main import app, get_async_db, get_db, jwks_keyring
+from app.rooms import room_cache
+from app.search_cache import yelp_results_cache
+from app.models import (
+    Base,
+    Business,
+    Participant,
+    Restaurant,
+    RestaurantVoteTally,
+    Session as SessionModel,
+    Vote,
+    YelpQueryCache,
+)
 
-from app.main import app, get_db
-from app.models import Base, Participant, Restaurant, Session as SessionModel, Vote, YelpQueryCache
 
+# The sync and async engines must see the same data, so the tests share an
+# on-disk SQLite file rather than a per-connection in-memory database.
+TEST_DATABASE_PATH = Path(tempfile.mkdtemp()) / "grubble-test.db"
 
 engine = create_engine(
-    "sqlite+pysqlite:///:memory:",
+    f"sqlite+pysqlite:///{TEST_DATABASE_PATH}",
     connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
     future=True,
 )
 TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 Base.metadata.create_all(bind=engine)
 
+async_engine = create_async_engine(f"sqlite+aiosqlite:///{TEST_DATABASE_PATH}", poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 
 def override_get_db() -> Generator[Session, None, None]:
     db = TestingSessionLocal()
@@ -28,12 +49,25 @@ def override_get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def override_get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
+
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
+
+
+async def skip_jwks_prefetch() -> None:
+    pass
 
 
 @pytest.fixture
-def client() -> TestClient:
-    return TestClient(app)
+def client(monkeypatch: pytest.MonkeyPatch) -> Generator[TestClient, None, None]:
+    # Startup would otherwise fetch the signing keys from the real SUPABASE_URL.
+    monkeypatch.setattr(jwks_keyring, "start", skip_jwks_prefetch)
+    with TestClient(app) as test_client:
+        yield test_client
 
 
 @pytest.fixture
@@ -44,11 +78,16 @@ def db_sessionmaker():
 @pytest.fixture(autouse=True)
 def cleanup_db(db_sessionmaker) -> Generator[None, None, None]:
     db = db_sessionmaker()
+    db.execute(delete(RestaurantVoteTally))
     db.execute(delete(Vote))
     db.execute(delete(Restaurant))
+    db.execute(delete(Business))
     db.execute(delete(YelpQueryCache))
     db.execute(delete(Participant))
     db.execute(delete(SessionModel))
     db.commit()
     db.close()
+    yelp_results_cache.clear()
+    business_enrichment_cache.clear()
+    room_cache.clear()
     yield
@@ -0,0 +1,95 @@
+import json
+import time
+
+import jwt as pyjwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+from jwt.exceptions import PyJWKClientError
+
+from app.auth import JWKSKeyring, verified_token_cache, verify_token
+
+
+@pytest.fixture(autouse=True)
+def clear_verified_tokens():
+    verified_token_cache.clear()
+    yield
+    verified_token_cache.clear()
+
+
+def make_signing_key(kid: str):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(RSAAlgorithm.to_jwk(private_key.public_key()))
+    return private_key, {**jwk, "kid": kid, "alg": "RS256", "use": "sig"}
+
+
+def make_token(private_key, kid: str, *, sub: str = "user-1", expires_in: int = 3600) -> str:
+    claims = {"sub": sub, "aud": "authenticated", "exp": int(time.time()) + expires_in}
+    return pyjwt.encode(claims, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+def test_verify_token_checks_each_token_signature_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    private_key, jwk = make_signing_key("key-1")
+    keyring = JWKSKeyring("https://auth.example/jwks", fetch=lambda: {"keys": [jwk]})
+    keyring.refresh()
+    token = make_token(private_key, "key-1")
+
+    decodes = {"count": 0}
+    real_decode = pyjwt.decode
+
+    def counting_decode(*args, **kwargs):
+        decodes["count"] += 1
+        return real_decode(*args, **kwargs)
+
+    monkeypatch.setattr(pyjwt, "decode", counting_decode)
+
+    assert verify_token(token, keyring)["sub"] == "user-1"
+    assert verify_token(token, keyring)["sub"] == "user-1"
+    assert decodes["count"] == 1
+    assert keyring.stats()["refreshes"] == 1
+
+
+def test_unknown_key_id_forces_one_rate_limited_refresh() -> None:
+    clock = {"now": 100.0}
+    old_key, old_jwk = make_signing_key("old")
+    new_key, new_jwk = make_signing_key("new")
+    published = {"keys": [old_jwk]}
+    keyring = JWKSKeyring(
+        "https://auth.example/jwks",
+        fetch=lambda: published,
+        min_refresh_seconds=30,
+        clock=lambda: clock["now"],
+    )
+    keyring.refresh()
+
+    # A rotated key is fetched the first time a token signed with it arrives.
+    published = {"keys": [old_jwk, new_jwk]}
+    clock["now"] += 31
+    assert verify_token(make_token(new_key, "new"), keyring)["sub"] == "user-1"
+    assert keyring.stats()["forced_refreshes"] == 1
+
+    # A burst of tokens with an unknown kid cannot hammer the JWKS endpoint.
+    stranger, _ = make_signing_key("stranger")
+    for _ in range(3):
+        with pytest.raises(PyJWKClientError):
+            verify_token(make_token(stranger, "stranger"), keyring)
+    assert keyring.stats()["forced_refreshes"] == 1
+    assert verify_token(make_token(old_key, "old"), keyring)["sub"] == "user-1"
+
+
+def test_failed_prefetch_does_not_lock_out_tokens_once_jwks_recovers() -> None:
+    private_key, jwk = make_signing_key("key-1")
+    endpoint = {"up": False}
+
+    def fetch() -> dict:
+        if not endpoint["up"]:
+            raise ConnectionError("JWKS endpoint unreachable")
+        return {"keys": [jwk]}
+
+    keyring = JWKSKeyring("https://auth.example/jwks", fetch=fetch, min_refresh_seconds=30, clock=lambda: 100.0)
+    with pytest.raises(ConnectionError):
+        keyring.refresh()
+
+    endpoint["up"] = True
+    assert verify_token(make_token(private_key, "key-1"), keyring)["sub"] == "user-1"
+    assert keyring.stats() == {"keys": 1, "refreshes": 1, "refresh_failures": 1, "forced_refreshes": 1}
@@ -0,0 +1,105 @@
+import asyncio
+
+from app.cache import SingleFlight, TTLCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_cache_expires_entries() -> None:
+    clock = FakeClock()
+    cache = TTLCache(max_bytes=1024, ttl_seconds=60, clock=clock)
+    cache.set("sushi|sf", [{"id": "a"}])
+
+    assert cache.get("sushi|sf") == [{"id": "a"}]
+    clock.now = 61
+    assert cache.get("sushi|sf") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["expirations"] == 1
+
+
+def test_ttl_cache_evicts_least_recently_used_by_size() -> None:
+    cache = TTLCache(max_bytes=100, ttl_seconds=60)
+    cache.set("a", "x", size_bytes=40)
+    cache.set("b", "y", size_bytes=40)
+    assert cache.get("a") == "x"
+
+    cache.set("c", "z", size_bytes=40)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "x"
+    assert cache.get("c") == "z"
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] == 80
+
+
+def test_ttl_cache_skips_values_larger_than_budget() -> None:
+    cache = TTLCache(max_bytes=10, ttl_seconds=60)
+    cache.set("big", "x" * 50)
+    assert cache.get("big") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_single_flight_shares_one_call_between_concurrent_callers() -> None:
+    flight = SingleFlight()
+    calls = {"count": 0}
+
+    async def search() -> list[dict]:
+        calls["count"] += 1
+        await asyncio.sleep(0.01)
+        return [{"id": "abc123"}]
+
+    async def run() -> list[list[dict]]:
+        return await asyncio.gather(*(flight.do("sushi|sf||", search) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert calls["count"] == 1
+    assert all(result == [{"id": "abc123"}] for result in results)
+    assert flight.stats() == {"in_flight": 0, "leaders": 1, "shared": 4}
+
+
+def test_single_flight_propagates_errors_to_followers() -> None:
+    flight = SingleFlight()
+
+    async def failing() -> None:
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    async def run() -> list:
+        return await asyncio.gather(*(flight.do("key", failing) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    async def recovered() -> str:
+        return "ok"
+
+    assert asyncio.run(flight.do("key", recovered)) == "ok"
+
+
+def test_single_flight_follower_takes_over_when_the_leader_is_cancelled() -> None:
+    flight = SingleFlight()
+    calls = {"count": 0}
+
+    async def search() -> str:
+        calls["count"] += 1
+        await asyncio.sleep(0.05)
+        return "fresh"
+
+    async def run() -> tuple:
+        leader = asyncio.create_task(asyncio.wait_for(flight.do("key", search), timeout=0.01))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("key", search))
+        return await asyncio.gather(leader, follower, return_exceptions=True)
+
+    leader_result, follower_result = asyncio.run(run())
+    assert isinstance(leader_result, asyncio.TimeoutError)
+    assert follower_result == "fresh"
+    assert calls["count"] == 2
+    assert flight.stats()["in_flight"] == 0
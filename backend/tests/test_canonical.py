@@ -0,0 +1,40 @@
+import json
+
+from app.canonical import BUNDLED_ALIASES_PATH, AliasTableCanonicalizer, get_canonicalizer
+from app.search_cache import build_query_key
+
+
+def test_location_aliases_and_state_names_share_one_canonical_form() -> None:
+    canonicalizer = get_canonicalizer()
+
+    assert {
+        canonicalizer.location(text)
+        for text in ("San Francisco, CA", "san francisco ca", "SF", "San Francisco, California", " san  francisco ")
+    } == {"san francisco ca"}
+    assert canonicalizer.location("Charleston, West Virginia") == "charleston wv"
+    # A bare state name is a place of its own, not a suffix to shorten.
+    assert canonicalizer.location("Washington") == "washington"
+    # Abbreviations that also name a state stay as typed.
+    assert canonicalizer.location("LA") == "la"
+
+
+def test_cuisine_spellings_share_one_cache_key() -> None:
+    keys = {
+        build_query_key(term=term, location_text=location, price="1,2", radius_meters=3000)
+        for term, location in (("bbq", "San Francisco, CA"), ("Barbecue", "SF"), ("bar-b-q", "san francisco"))
+    }
+
+    assert keys == {"bbq|san francisco ca|1,2|3000"}
+    # Related but different searches keep their own results.
+    assert get_canonicalizer().term("cafe") == "cafe"
+
+
+def test_extra_alias_tables_extend_the_bundled_one(tmp_path) -> None:
+    extra = tmp_path / "aliases.json"
+    extra.write_text(json.dumps({"locations": {"palo alto ca": ["stanford"]}, "terms": {"sushi": ["omakase"]}}))
+
+    canonicalizer = AliasTableCanonicalizer.from_paths(BUNDLED_ALIASES_PATH, extra)
+
+    assert canonicalizer.location("Stanford") == "palo alto ca"
+    assert canonicalizer.term("Omakase") == "sushi"
+    assert canonicalizer.term("Burger") == "burgers"
@@ -0,0 +1,199 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, update
+
+from app.business_cache import business_enrichment_cache, drain_enrichment_refreshes
+from app.models import Business
+
+
+def start_session_with(client, monkeypatch: pytest.MonkeyPatch, calls: dict[str, int], reviews: list[dict]) -> str:
+    monkeypatch.setenv("RAPIDAPI_KEY", "test-key")
+    monkeypatch.setenv("RAPIDAPI_HOST", "example-host")
+    monkeypatch.delenv("USE_MOCK_YELP", raising=False)
+
+    from app import main as main_module
+
+    monkeypatch.setattr(main_module, "search_pexels_fallback_images", lambda *args, **kwargs: [])
+
+    async def fake_search(self, **_):
+        return [{"id": "shared", "name": "Shared Place"}]
+
+    async def fake_dishes(self, business_id: str):
+        calls["dishes"] += 1
+        return [{"display_name": "house special", "review_count": calls["dishes"]}]
+
+    async def fake_reviews(self, business_id: str, count: int = 3):
+        calls["reviews"] += 1
+        return reviews
+
+    monkeypatch.setattr(main_module.YelpClient, "search_businesses_async", fake_search)
+    monkeypatch.setattr(main_module.YelpClient, "get_popular_dishes_async", fake_dishes)
+    monkeypatch.setattr(main_module.YelpClient, "get_reviews_async", fake_reviews)
+
+    room_code = client.post(
+        "/sessions",
+        json={"host_name": "Justin", "cuisine": "sushi", "location_text": "San Francisco, CA"},
+    ).json()["room_code"]
+    assert client.post(f"/sessions/{room_code}/start", json={"host_name": "Justin"}).status_code == 200
+    return room_code
+
+
+def first_restaurant_id(client, room_code: str) -> int:
+    return client.get(
+        f"/sessions/{room_code}/restaurants/next", params={"user_name": "Justin"}
+    ).json()["restaurant"]["id"]
+
+
+def test_enrichment_is_shared_across_sessions_and_empty_results_are_cached(
+    monkeypatch: pytest.MonkeyPatch, client
+) -> None:
+    calls = {"dishes": 0, "reviews": 0}
+    before = client.get("/metrics").json()["business_enrichment"]
+
+    for _ in range(2):
+        room_code = start_session_with(client, monkeypatch, calls, reviews=[])
+        restaurant_id = first_restaurant_id(client, room_code)
+        dishes = client.get(f"/sessions/{room_code}/restaurants/{restaurant_id}/popular_dishes").json()
+        assert dishes["popular_dishes"][0]["display_name"] == "house special"
+        for _ in range(2):
+            assert client.get(f"/sessions/{room_code}/restaurants/{restaurant_id}/reviews").json() == {"reviews": []}
+
+    assert calls == {"dishes": 1, "reviews": 1}
+    after = client.get("/metrics").json()["business_enrichment"]
+    assert after["misses"] - before.get("misses", 0) == 2
+    assert after["negative_hits"] - before.get("negative_hits", 0) == 3
+    assert after["hit_rate"] > 0
+
+
+def test_stale_enrichment_is_served_then_refreshed_in_background(
+    monkeypatch: pytest.MonkeyPatch, client, db_sessionmaker
+) -> None:
+    calls = {"dishes": 0, "reviews": 0}
+    room_code = start_session_with(client, monkeypatch, calls, reviews=[{"text": "Great"}])
+    restaurant_id = first_restaurant_id(client, room_code)
+    url = f"/sessions/{room_code}/restaurants/{restaurant_id}/popular_dishes"
+    assert client.get(url).json()["popular_dishes"][0]["review_count"] == 1
+
+    db = db_sessionmaker()
+    try:
+        db.execute(
+            update(Business).values(popular_dishes_fetched_at=datetime.now(timezone.utc) - timedelta(days=8))
+        )
+        db.commit()
+    finally:
+        db.close()
+    business_enrichment_cache.clear()
+
+    assert client.get(url).json()["popular_dishes"][0]["review_count"] == 1
+    client.portal.call(drain_enrichment_refreshes)
+    assert calls["dishes"] == 2
+
+    db = db_sessionmaker()
+    try:
+        business = db.scalar(select(Business))
+        assert business.popular_dishes[0]["review_count"] == 2
+    finally:
+        db.close()
+    card = client.get(f"/sessions/{room_code}/restaurants/next", params={"user_name": "Justin"}).json()
+    assert card["restaurant"]["popular_dishes"][0]["review_count"] == 2
+
+
+def test_batch_enrichment_returns_partial_results_at_the_deadline(monkeypatch: pytest.MonkeyPatch, client) -> None:
+    monkeypatch.setenv("RAPIDAPI_KEY", "test-key")
+    monkeypatch.setenv("RAPIDAPI_HOST", "example-host")
+    monkeypatch.delenv("USE_MOCK_YELP", raising=False)
+    monkeypatch.setenv("ENRICHMENT_BATCH_DEADLINE_SECONDS", "0.2")
+
+    from app import main as main_module
+
+    monkeypatch.setattr(main_module, "search_pexels_fallback_images", lambda *args, **kwargs: [])
+    release_slow = asyncio.Event()
+
+    async def fake_search(self, **_):
+        return [{"id": "fast", "name": "Fast Place"}, {"id": "slow", "name": "Slow Place"}]
+
+    async def fake_dishes(self, business_id: str):
+        if business_id == "slow":
+            await release_slow.wait()
+        return [{"display_name": f"{business_id} special", "review_count": 1}]
+
+    async def fake_reviews(self, business_id: str, count: int = 3):
+        return [{"text": f"{business_id} review"}]
+
+    monkeypatch.setattr(main_module.YelpClient, "search_businesses_async", fake_search)
+    monkeypatch.setattr(main_module.YelpClient, "get_popular_dishes_async", fake_dishes)
+    monkeypatch.setattr(main_module.YelpClient, "get_reviews_async", fake_reviews)
+
+    room_code = client.post(
+        "/sessions",
+        json={"host_name": "Justin", "cuisine": "sushi", "location_text": "San Francisco, CA"},
+    ).json()["room_code"]
+    assert client.post(f"/sessions/{room_code}/start", json={"host_name": "Justin"}).status_code == 200
+    ranked = client.get(f"/sessions/{room_code}/results").json()["results"]
+    ids = {item["restaurant"]["name"]: item["restaurant"]["id"] for item in ranked}
+    url = f"/sessions/{room_code}/restaurants/enrichment"
+    params = {"ids": f"{ids['Fast Place']},{ids['Slow Place']}", "include": "dishes,reviews"}
+
+    first = client.get(url, params=params).json()
+    by_id = {item["restaurant_id"]: item for item in first["results"]}
+    assert first["pending"] == [ids["Slow Place"]]
+    assert by_id[ids["Fast Place"]]["popular_dishes"][0]["display_name"] == "fast special"
+    assert by_id[ids["Slow Place"]]["popular_dishes"] is None
+    assert by_id[ids["Slow Place"]]["reviews"] == [{"text": "slow review"}]
+
+    client.portal.call(release_slow.set)
+    client.portal.call(drain_enrichment_refreshes)
+    second = client.get(url, params={**params, "include": "dishes"}).json()
+    assert second["pending"] == []
+    assert {item["restaurant_id"]: item["popular_dishes"][0]["display_name"] for item in second["results"]} == {
+        ids["Fast Place"]: "fast special",
+        ids["Slow Place"]: "slow special",
+    }
+    assert all(item["reviews"] is None for item in second["results"])
+
+    assert client.get(url, params={"ids": "abc"}).status_code == 400
+    assert client.get(url, params={"ids": "1", "include": "menus"}).status_code == 400
+
+
+def test_batch_enrichment_reports_a_late_fetch_already_being_stored(monkeypatch: pytest.MonkeyPatch, client) -> None:
+    monkeypatch.setenv("RAPIDAPI_KEY", "test-key")
+    monkeypatch.setenv("RAPIDAPI_HOST", "example-host")
+    monkeypatch.delenv("USE_MOCK_YELP", raising=False)
+    monkeypatch.setenv("ENRICHMENT_BATCH_DEADLINE_SECONDS", "0.1")
+
+    from app import main as main_module
+
+    monkeypatch.setattr(main_module, "search_pexels_fallback_images", lambda *args, **kwargs: [])
+    release_slow = asyncio.Event()
+
+    async def fake_search(self, **_):
+        return [{"id": "slow", "name": "Slow Place"}]
+
+    async def fake_dishes(self, business_id: str):
+        await release_slow.wait()
+        raise RuntimeError("upstream went away")
+
+    monkeypatch.setattr(main_module.YelpClient, "search_businesses_async", fake_search)
+    monkeypatch.setattr(main_module.YelpClient, "get_popular_dishes_async", fake_dishes)
+
+    room_code = client.post(
+        "/sessions",
+        json={"host_name": "Justin", "cuisine": "sushi", "location_text": "San Francisco, CA"},
+    ).json()["room_code"]
+    assert client.post(f"/sessions/{room_code}/start", json={"host_name": "Justin"}).status_code == 200
+    restaurant_id = first_restaurant_id(client, room_code)
+    url = f"/sessions/{room_code}/restaurants/enrichment"
+    before = client.get("/metrics").json()["business_enrichment"].get("late_fetches_failures", 0)
+
+    # The second request's late fetch finds the first one's store already scheduled.
+    for _ in range(2):
+        body = client.get(url, params={"ids": str(restaurant_id), "include": "dishes"}).json()
+        assert body["pending"] == [restaurant_id]
+
+    client.portal.call(release_slow.set)
+    client.portal.call(drain_enrichment_refreshes)
+    client.portal.call(asyncio.sleep, 0.05)
+    after = client.get("/metrics").json()["business_enrichment"]["late_fetches_failures"]
+    assert after - before == 2
@@ -0,0 +1,176 @@
+import asyncio
+import json
+
+import pytest
+
+from app.realtime import ConnectionManager, InMemoryBus, PostgresNotifyBus, RedisBus
+
+
+class FakeSocket:
+    def __init__(self) -> None:
+        self.sent: list[dict] = []
+        self.closed_with: int | None = None
+
+    async def accept(self) -> None:
+        pass
+
+    async def send_text(self, text: str) -> None:
+        self.sent.append(json.loads(text))
+
+    async def close(self, code: int = 1000, reason: str | None = None) -> None:
+        self.closed_with = code
+
+
+class StalledSocket(FakeSocket):
+    async def send_text(self, text: str) -> None:
+        await asyncio.Event().wait()
+
+
+def test_in_memory_bus_delivers_to_local_room_only() -> None:
+    manager = ConnectionManager(InMemoryBus())
+    in_room, other_room = FakeSocket(), FakeSocket()
+
+    async def run() -> None:
+        await manager.connect("ROOM01", in_room)
+        await manager.connect("ROOM02", other_room)
+        await manager.broadcast("ROOM01", {"event": "vote_progress"})
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert in_room.sent == [{"event": "vote_progress"}]
+    assert other_room.sent == []
+
+
+def test_slow_consumer_is_evicted_without_holding_back_the_room() -> None:
+    manager = ConnectionManager(InMemoryBus(), max_queue=2)
+    fast, slow = FakeSocket(), StalledSocket()
+
+    async def run() -> None:
+        await manager.connect("ROOM01", fast)
+        await manager.connect("ROOM01", slow)
+        for index in range(4):
+            await manager.broadcast("ROOM01", {"event": "vote_progress", "yes": index})
+            await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert [message["yes"] for message in fast.sent] == [0, 1, 2, 3]
+    assert slow.closed_with == 1013
+    stats = manager.stats()
+    assert stats["evictions"] == 1
+    assert stats["connections"] == 1
+
+
+def test_redis_bus_fans_out_across_workers() -> None:
+    fakeredis = pytest.importorskip("fakeredis")
+
+    async def run() -> tuple[FakeSocket, FakeSocket]:
+        server = fakeredis.FakeServer()
+        worker_a = ConnectionManager(RedisBus(client=fakeredis.FakeAsyncRedis(server=server)))
+        worker_b = ConnectionManager(RedisBus(client=fakeredis.FakeAsyncRedis(server=server)))
+        socket_a, socket_b = FakeSocket(), FakeSocket()
+        await worker_a.bus.start()
+        await worker_b.bus.start()
+        await worker_a.connect("ROOM01", socket_a)
+        await worker_b.connect("ROOM01", socket_b)
+
+        await worker_a.broadcast("ROOM01", {"event": "match_found", "restaurant_id": 7})
+        for _ in range(50):
+            if socket_a.sent and socket_b.sent:
+                break
+            await asyncio.sleep(0.01)
+
+        await worker_a.bus.stop()
+        await worker_b.bus.stop()
+        return socket_a, socket_b
+
+    socket_a, socket_b = asyncio.run(run())
+    assert socket_a.sent == [{"event": "match_found", "restaurant_id": 7}]
+    assert socket_b.sent == [{"event": "match_found", "restaurant_id": 7}]
+
+
+def test_broadcast_survives_a_bus_outage() -> None:
+    class DownBus(InMemoryBus):
+        async def publish(self, room_code: str, message: dict) -> None:
+            raise ConnectionError("bus unreachable")
+
+    manager = ConnectionManager(DownBus())
+
+    asyncio.run(manager.broadcast("ROOM01", {"event": "vote_progress"}))
+    asyncio.run(manager.broadcast_control("ROOM01", {"event": "room_invalidated"}))
+    assert manager.stats()["publish_failures"] == 2
+
+
+def test_redis_bus_resubscribes_after_the_subscription_drops() -> None:
+    fakeredis = pytest.importorskip("fakeredis")
+
+    async def run() -> tuple[FakeSocket, RedisBus]:
+        server = fakeredis.FakeServer()
+        client = fakeredis.FakeAsyncRedis(server=server)
+        open_pubsub = client.pubsub
+        opened = {"count": 0}
+
+        def pubsub():
+            pubsub = open_pubsub()
+            opened["count"] += 1
+            if opened["count"] == 1:
+                async def dropped():
+                    raise ConnectionError("connection reset by peer")
+                    yield
+
+                pubsub.listen = dropped
+            return pubsub
+
+        client.pubsub = pubsub
+        bus = RedisBus(client=client)
+        bus.reconnect_min_seconds = 0.01
+        manager = ConnectionManager(bus)
+        socket = FakeSocket()
+        await bus.start()
+        await manager.connect("ROOM01", socket)
+        publisher = RedisBus(client=fakeredis.FakeAsyncRedis(server=server))
+        for _ in range(100):
+            if socket.sent:
+                break
+            await publisher.publish("ROOM01", {"event": "match_found"})
+            await asyncio.sleep(0.01)
+        await bus.stop()
+        return socket, bus
+
+    socket, bus = asyncio.run(run())
+    assert socket.sent[0] == {"event": "match_found"}
+    assert bus.reconnects == 1
+
+
+def test_postgres_bus_drops_malformed_notifications() -> None:
+    delivered: list[tuple[str, dict]] = []
+
+    async def deliver(room_code: str, message: dict) -> None:
+        delivered.append((room_code, message))
+
+    async def run() -> None:
+        bus = PostgresNotifyBus("postgresql://unused")
+        bus.attach(deliver)
+        bus._on_notify(None, 1, bus.channel, "not json")
+        bus._on_notify(None, 1, bus.channel, '{"room_code":"ROOM01","message":{"event":"vote_progress"}}')
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert delivered == [("ROOM01", {"event": "vote_progress"})]
+
+
+def test_failed_bus_start_still_closes_the_yelp_http_client(monkeypatch: pytest.MonkeyPatch) -> None:
+    from app import main as main_module
+
+    async def refuse() -> None:
+        raise ConnectionError("bus unreachable")
+
+    monkeypatch.setattr(main_module.ws_manager.bus, "start", refuse)
+
+    async def run() -> None:
+        async with main_module.lifespan(main_module.app):
+            pass
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(run())
+    assert main_module.yelp_http_client is None
@@ -1,4 +1,8 @@
 import pytest
+from sqlalchemy import select, update
+
+from app.cards import CARD_SCHEMA_VERSION
+from app.models import Restaurant
 
 
 def create_active_session(client, monkeypatch: pytest.MonkeyPatch, participants: list[str] | None = None) -> str:
@@ -9,8 +13,9 @@ def create_active_session(client, monkeypatch: pytest.MonkeyPatch, participants:
 
     from app import main as main_module
 
-    def fake_search(
-        self, *, term: str, location: str, price: str | None, radius_meters: int | None, limit: int = 30
+    async def fake_search(
+        self, *, term: str, location: str, price: str | None, radius_meters: int | None,
+        limit: int = 30, offset: int = 0,
     ):
         return [
             {"id": "rest-a", "name": "A Place", "location": {"display_address": ["1 Main St"]}},
@@ -18,7 +23,7 @@ def create_active_session(client, monkeypatch: pytest.MonkeyPatch, participants:
             {"id": "rest-c", "name": "C Place", "location": {"display_address": ["3 Main St"]}},
         ]
 
-    monkeypatch.setattr(main_module.YelpClient, "search_businesses", fake_search)
+    monkeypatch.setattr(main_module.YelpClient, "search_businesses_async", fake_search)
 
     create_res = client.post(
         "/sessions",
@@ -123,3 +128,54 @@ def test_results_tie_breaker_uses_total_votes_desc(monkeypatch: pytest.MonkeyPat
     assert payload["results"][1]["restaurant"]["id"] == second_restaurant_id
     assert payload["results"][1]["yes_votes"] == 1
     assert payload["results"][1]["total_votes"] == 1
+
+
+def test_results_drop_votes_of_removed_participant(monkeypatch: pytest.MonkeyPatch, client) -> None:
+    room_code = create_active_session(client, monkeypatch, participants=["Alex", "Sam"])
+
+    first_restaurant_id = client.get(
+        f"/sessions/{room_code}/restaurants/next", params={"user_name": "Justin"}
+    ).json()["restaurant"]["id"]
+    for user_name, decision in (("Justin", "yes"), ("Alex", "no"), ("Sam", "yes")):
+        assert client.post(
+            f"/sessions/{room_code}/votes",
+            json={"user_name": user_name, "restaurant_id": first_restaurant_id, "decision": decision},
+        ).status_code == 200
+
+    assert client.delete(f"/sessions/{room_code}/participants/Sam").status_code == 204
+
+    res = client.get(f"/sessions/{room_code}/results")
+    assert res.status_code == 200
+    payload = res.json()
+    assert payload["total_participants"] == 2
+    assert payload["results"][0]["restaurant"]["id"] == first_restaurant_id
+    assert payload["results"][0]["yes_votes"] == 1
+    assert payload["results"][0]["total_votes"] == 2
+
+
+def test_results_rebuild_cards_from_older_schema_version(
+    monkeypatch: pytest.MonkeyPatch, client, db_sessionmaker
+) -> None:
+    room_code = create_active_session(client, monkeypatch)
+
+    db = db_sessionmaker()
+    try:
+        stored = db.scalars(select(Restaurant)).all()
+        assert {restaurant.card_version for restaurant in stored} == {CARD_SCHEMA_VERSION}
+        assert stored[0].card["address"] == "1 Main St"
+        db.execute(update(Restaurant).values(card={"name": "stale"}, card_version=CARD_SCHEMA_VERSION - 1))
+        db.commit()
+    finally:
+        db.close()
+
+    res = client.get(f"/sessions/{room_code}/results")
+    assert res.status_code == 200
+    assert {item["restaurant"]["name"] for item in res.json()["results"]} == {"A Place", "B Place", "C Place"}
+
+    db = db_sessionmaker()
+    try:
+        rebuilt = db.scalars(select(Restaurant)).all()
+        assert {restaurant.card_version for restaurant in rebuilt} == {CARD_SCHEMA_VERSION}
+        assert {restaurant.card["name"] for restaurant in rebuilt} == {"A Place", "B Place", "C Place"}
+    finally:
+        db.close()
@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+from app import room_codes
+from app.models import Session as SessionModel
+from app.room_codes import RoomCodeExhaustedError, allocate_room_code
+
+
+def add_session(db, room_code: str, *, age: timedelta = timedelta(), status: str = "active") -> SessionModel:
+    session = SessionModel(
+        room_code=room_code,
+        host_name="Old Host",
+        status=status,
+        created_at=datetime.now(timezone.utc) - age,
+    )
+    db.add(session)
+    db.commit()
+    return session
+
+
+VALUES = {"host_name": "Justin", "status": "waiting"}
+
+
+def draw(monkeypatch: pytest.MonkeyPatch, codes: list[str]) -> None:
+    queue = iter(codes)
+    monkeypatch.setattr(room_codes, "random_room_code", lambda length=6: next(queue))
+
+
+def test_allocation_retries_a_code_held_by_a_live_session(monkeypatch: pytest.MonkeyPatch, db_sessionmaker) -> None:
+    db = db_sessionmaker()
+    add_session(db, "TAKEN1", age=timedelta(hours=1))
+    draw(monkeypatch, ["TAKEN1", "FRESH1"])
+
+    session = allocate_room_code(db, VALUES)
+    db.commit()
+
+    assert session.room_code == "FRESH1"
+    assert session.host_name == "Justin"
+    assert db.scalar(select(SessionModel.room_code).where(SessionModel.host_name == "Old Host")) == "TAKEN1"
+    db.close()
+
+
+def test_allocation_recycles_a_code_held_by_an_expired_session(
+    monkeypatch: pytest.MonkeyPatch, db_sessionmaker
+) -> None:
+    monkeypatch.setenv("ROOM_CODE_RECYCLE_AFTER_HOURS", "24")
+    db = db_sessionmaker()
+    add_session(db, "OLD123", age=timedelta(days=3), status="ended")
+    draw(monkeypatch, ["OLD123"])
+    recycled: list[str] = []
+
+    session = allocate_room_code(db, VALUES, on_recycled=recycled.append)
+    db.commit()
+
+    retired_code = db.scalar(select(SessionModel.room_code).where(SessionModel.host_name == "Old Host"))
+    assert session.room_code == "OLD123"
+    assert recycled == ["OLD123"]
+    assert len(retired_code) == 8 and retired_code == retired_code.lower()
+    db.close()
+
+
+def test_allocation_never_recycles_a_code_from_a_session_still_in_play(
+    monkeypatch: pytest.MonkeyPatch, db_sessionmaker
+) -> None:
+    monkeypatch.setenv("ROOM_CODE_RECYCLE_AFTER_HOURS", "24")
+    db = db_sessionmaker()
+    add_session(db, "OLD123", age=timedelta(days=3))
+    draw(monkeypatch, ["OLD123", "FRESH1"])
+
+    session = allocate_room_code(db, VALUES)
+    db.commit()
+
+    assert session.room_code == "FRESH1"
+    assert db.scalar(select(SessionModel.room_code).where(SessionModel.host_name == "Old Host")) == "OLD123"
+    db.close()
+
+
+def test_allocation_gives_up_after_its_attempts(monkeypatch: pytest.MonkeyPatch, db_sessionmaker) -> None:
+    db = db_sessionmaker()
+    add_session(db, "TAKEN1")
+    draw(monkeypatch, ["TAKEN1"] * 3)
+
+    with pytest.raises(RoomCodeExhaustedError):
+        allocate_room_code(db, VALUES, attempts=3)
+    db.rollback()
+    assert db.scalar(select(SessionModel).where(SessionModel.host_name == "Justin")) is None
+    db.close()
@@ -0,0 +1,154 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.main import app, require_auth
+from app.models import Participant, Session as SessionModel
+
+
+BASE_TIME = datetime(2026, 10, 1, 12, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def signed_in(monkeypatch: pytest.MonkeyPatch) -> str:
+    monkeypatch.setitem(app.dependency_overrides, require_auth, lambda: "user-1")
+    return "user-1"
+
+
+def seed_session(
+    db, room_code: str, *, owner: str | None, minutes: int, guests: list[tuple[str, str | None]]
+) -> None:
+    session = SessionModel(
+        room_code=room_code,
+        host_name="Host",
+        status="ended",
+        owner_user_id=owner,
+        created_at=BASE_TIME + timedelta(minutes=minutes),
+    )
+    session.participants.append(Participant(user_name="Host", user_id=owner))
+    for user_name, user_id in guests:
+        session.participants.append(Participant(user_name=user_name, user_id=user_id))
+    db.add(session)
+
+
+def test_hosted_history_pages_by_created_at_with_counts_from_sql(client, db_sessionmaker, signed_in) -> None:
+    db = db_sessionmaker()
+    for index in range(5):
+        guests = [(f"guest{g}", None) for g in range(index)]
+        seed_session(db, f"HOST{index}0", owner=signed_in, minutes=index, guests=guests)
+    seed_session(db, "OTHER1", owner="user-2", minutes=10, guests=[])
+    db.commit()
+    db.close()
+
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        first = client.get("/sessions/my", params={"limit": 2, "include": "hosted,participants"}).json()
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+    assert [s["room_code"] for s in first["hosted"]] == ["HOST40", "HOST30"]
+    assert [s["participant_count"] for s in first["hosted"]] == [5, 4]
+    assert [p["user_name"] for p in first["hosted"][1]["participants"]] == ["Host", "guest0", "guest1", "guest2"]
+    assert first["joined"] == [] and first["joined_next_cursor"] is None
+    # The page itself and one selectinload for every session's participants.
+    assert len(statements) == 2
+
+    second = client.get(
+        "/sessions/my", params={"limit": 2, "include": "hosted", "hosted_cursor": first["hosted_next_cursor"]}
+    ).json()
+    assert [s["room_code"] for s in second["hosted"]] == ["HOST20", "HOST10"]
+    assert all(s["participants"] is None for s in second["hosted"])
+
+    last = client.get(
+        "/sessions/my", params={"limit": 2, "include": "hosted", "hosted_cursor": second["hosted_next_cursor"]}
+    ).json()
+    assert [s["room_code"] for s in last["hosted"]] == ["HOST00"]
+    assert last["hosted_next_cursor"] is None
+
+
+def test_joined_history_names_the_user_once_per_session(client, db_sessionmaker, signed_in) -> None:
+    db = db_sessionmaker()
+    seed_session(db, "JOIN01", owner="user-2", minutes=0, guests=[("Alex", signed_in), ("Sam", None)])
+    seed_session(db, "JOIN02", owner="user-3", minutes=1, guests=[("Bea", signed_in), ("Alex", signed_in)])
+    seed_session(db, "MINE01", owner=signed_in, minutes=2, guests=[])
+    db.commit()
+    db.close()
+
+    res = client.get("/sessions/my")
+
+    assert res.status_code == 200
+    body = res.json()
+    assert [s["room_code"] for s in body["hosted"]] == ["MINE01"]
+    assert [(s["room_code"], s["my_participant_name"], s["participant_count"]) for s in body["joined"]] == [
+        ("JOIN02", "Alex", 3),
+        ("JOIN01", "Alex", 3),
+    ]
+
+
+def test_session_history_rejects_bad_cursors_and_includes(client, signed_in) -> None:
+    assert client.get("/sessions/my", params={"hosted_cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/sessions/my", params={"include": "participants"}).status_code == 400
+    assert client.get("/sessions/my", params={"limit": 0}).status_code == 422
+
+
+def seed_listing(db_sessionmaker) -> None:
+    db = db_sessionmaker()
+    for index in range(6):
+        seed_session(db, f"LIST{index}0", owner="user-2", minutes=index, guests=[(f"guest{index}", None)])
+    db.commit()
+    for room_code in ("LIST10", "LIST30"):
+        db.query(SessionModel).filter_by(room_code=room_code).update({"status": "active"})
+    db.commit()
+    db.close()
+
+
+def test_list_sessions_pages_with_filters_and_batch_loaded_participants(client, db_sessionmaker) -> None:
+    seed_listing(db_sessionmaker)
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        first = client.get("/sessions", params={"limit": 2, "status": "ended"}).json()
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+    assert [s["room_code"] for s in first["sessions"]] == ["LIST50", "LIST40"]
+    assert first["sessions"][0]["participants"] == ["Host", "guest5"]
+    assert len(statements) == 2
+
+    rest = client.get("/sessions", params={"limit": 2, "status": "ended", "cursor": first["next_cursor"]}).json()
+    assert [s["room_code"] for s in rest["sessions"]] == ["LIST20", "LIST00"]
+    assert rest["next_cursor"] is None
+
+    window = client.get(
+        "/sessions",
+        params={
+            "created_after": (BASE_TIME + timedelta(minutes=1)).isoformat(),
+            "created_before": (BASE_TIME + timedelta(minutes=4)).isoformat(),
+        },
+    ).json()
+    assert [s["room_code"] for s in window["sessions"]] == ["LIST30", "LIST20", "LIST10"]
+    assert client.get("/sessions", params={"cursor": "%%%"}).status_code == 400
+
+
+def test_list_sessions_streams_ndjson_in_batches(monkeypatch: pytest.MonkeyPatch, client, db_sessionmaker) -> None:
+    monkeypatch.setattr("app.main.SESSION_STREAM_BATCH_SIZE", 4)
+    seed_listing(db_sessionmaker)
+
+    with client.stream("GET", "/sessions", params={"format": "ndjson", "limit": 1}) as res:
+        assert res.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in res.iter_lines() if line]
+
+    assert [row["room_code"] for row in rows] == [f"LIST{index}0" for index in reversed(range(6))]
+    assert all(row["participants"] == ["Host", f"guest{row['room_code'][4]}"] for row in rows)
@@ -1,7 +1,12 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
 import pytest
-from sqlalchemy import select
+from sqlalchemy import delete, event, select, update
+from sqlalchemy.engine import Engine
 
-from app.models import Restaurant, Session as SessionModel
+from app.models import Business, Restaurant, Session as SessionModel, YelpQueryCache
+from app.search_cache import as_utc
 
 
 def create_default_session(client) -> str:
@@ -39,8 +44,9 @@ def test_create_and_start_session_caches_restaurants(monkeypatch: pytest.MonkeyP
 
     from app import main as main_module
 
-    def fake_search(
-        self, *, term: str, location: str, price: str | None, radius_meters: int | None, limit: int = 30
+    async def fake_search(
+        self, *, term: str, location: str, price: str | None, radius_meters: int | None,
+        limit: int = 30, offset: int = 0,
     ):
         assert term == "sushi"
         assert location == "San Francisco, CA"
@@ -59,7 +65,7 @@ def test_create_and_start_session_caches_restaurants(monkeypatch: pytest.MonkeyP
             }
         ]
 
-    monkeypatch.setattr(main_module.YelpClient, "search_businesses", fake_search)
+    monkeypatch.setattr(main_module.YelpClient, "search_businesses_async", fake_search)
 
     room_code = create_default_session(client)
     start_res = client.post(f"/sessions/{room_code}/start", json={"host_name": "Justin"})
@@ -86,8 +92,9 @@ def test_start_session_uses_photo_url_when_image_url_missing(
 
     monkeypatch.setattr(main_module, "search_pexels_fallback_images", lambda *args, **kwargs: [])
 
-    def fake_search(
-        self, *, term: str, location: str, price: str | None, radius_meters: int | None, limit: int = 30
+    async def fake_search(
+        self, *, term: str, location: str, price: str | None, radius_meters: int | None,
+        limit: int = 30, offset: int = 0,
     ):
         return [
             {
@@ -99,7 +106,7 @@ def test_start_session_uses_photo_url_when_image_url_missing(
             }
         ]
 
-    monkeypatch.setattr(main_module.YelpClient, "search_businesses", fake_search)
+    monkeypatch.setattr(main_module.YelpClient, "search_businesses_async", fake_search)
 
     room_code = create_default_session(client)
     start_res = client.post(f"/sessions/{room_code}/start", json={"host_name": "Justin"})
@@ -126,8 +133,9 @@ def test_start_session_prefers_full_size_photo_over_preview_url(
 
     monkeypatch.setattr(main_module, "search_pexels_fallback_images", lambda *args, **kwargs: [])
 
-    def fake_search(
-        self, *, term: str, location: str, price: str | None, radius_meters: int | None, limit: int = 30
+    async def fake_search(
+        self, *, term: str, location: str, price: str | None, radius_meters: int | None,
+        limit: int = 30, offset: int = 0,
     ):
         return [
             {
@@ -145,7 +153,7 @@ def test_start_session_prefers_full_size_photo_over_preview_url(
             }
         ]
 
-    monkeypatch.setattr(main_module.YelpClient, "search_businesses", fake_search)
+    monkeypatch.setattr(main_module.YelpClient, "search_businesses_async", fake_search)
 
     room_code = create_default_session(client)
     start_res = client.post(f"/sessions/{room_code}/start", json={"host_name": "Justin"})
@@ -176,8 +184,9 @@ def test_start_session_uses_pexels_fallback_when_provider_has_no_image(
         lambda query, limit: ["https://images.pexels.com/fallback-one.jpg"][:limit],
     )
 
-    def fake_search(
-        self, *, term: str, location: str, price: str | None, radius_meters: int | None, limit: int = 30
+    async def fake_search(
+        self, *, term: str, location: str, price: str | None, radius_meters: int | None,
+        limit: int = 30, offset: int = 0,
     ):
         return [
             {
@@ -188,7 +197,7 @@ def test_start_session_uses_pexels_fallback_when_provider_has_no_image(
             }
         ]
 
-    monkeypatch.setattr(main_module.YelpClient, "search_businesses", fake_search)
+    monkeypatch.setattr(main_module.YelpClient, "search_businesses_async", fake_search)
 
     room_code = create_default_session(client)
     start_res = client.post(f"/sessions/{room_code}/start", json={"host_name": "Justin"})
@@ -222,12 +231,13 @@ def test_start_session_fails_when_no_restaurants_found(monkeypatch: pytest.Monke
 
     from app import main as main_module
 
-    def fake_empty(
-        self, *, term: str, location: str, price: str | None, radius_meters: int | None, limit: int = 30
+    async def fake_empty(
+        self, *, term: str, location: str, price: str | None, radius_meters: int | None,
+        limit: int = 30, offset: int = 0,
     ):
         return []
 
-    monkeypatch.setattr(main_module.YelpClient, "search_businesses", fake_empty)
+    monkeypatch.setattr(main_module.YelpClient, "search_businesses_async", fake_empty)
 
     room_code = create_default_session(client)
     start_res = client.post(f"/sessions/{room_code}/start", json={"host_name": "Justin"})
@@ -242,7 +252,10 @@ def test_start_session_rejects_non_host(monkeypatch: pytest.MonkeyPatch, client)
 
     from app import main as main_module
 
-    monkeypatch.setattr(main_module.YelpClient, "search_businesses", lambda self, **_: [])
+    async def fake_empty(self, **_):
+        return []
+
+    monkeypatch.setattr(main_module.YelpClient, "search_businesses_async", fake_empty)
     room_code = create_default_session(client)
 
     start_res = client.post(f"/sessions/{room_code}/start", json={"host_name": "Alex"})
@@ -256,11 +269,10 @@ def test_start_session_rejects_non_waiting_state(monkeypatch: pytest.MonkeyPatch
 
     from app import main as main_module
 
-    monkeypatch.setattr(
-        main_module.YelpClient,
-        "search_businesses",
-        lambda self, **_: [{"id": "abc123", "name": "Sushi Place"}],
-    )
+    async def fake_search(self, **_):
+        return [{"id": "abc123", "name": "Sushi Place"}]
+
+    monkeypatch.setattr(main_module.YelpClient, "search_businesses_async", fake_search)
     room_code = create_default_session(client)
 
     first_start = client.post(f"/sessions/{room_code}/start", json={"host_name": "Justin"})
@@ -298,13 +310,14 @@ def test_start_session_uses_query_cache_without_second_api_call(monkeypatch: pyt
 
     call_count = {"count": 0}
 
-    def fake_search(
-        self, *, term: str, location: str, price: str | None, radius_meters: int | None, limit: int = 30
+    async def fake_search(
+        self, *, term: str, location: str, price: str | None, radius_meters: int | None,
+        limit: int = 30, offset: int = 0,
     ):
         call_count["count"] += 1
         return [{"id": "cache-1", "name": "Cached Place"}]
 
-    monkeypatch.setattr(main_module.YelpClient, "search_businesses", fake_search)
+    monkeypatch.setattr(main_module.YelpClient, "search_businesses_async", fake_search)
 
     room_code_one = create_default_session(client)
     first_start = client.post(f"/sessions/{room_code_one}/start", json={"host_name": "Justin"})
@@ -315,3 +328,665 @@ def test_start_session_uses_query_cache_without_second_api_call(monkeypatch: pyt
     second_start = client.post(f"/sessions/{room_code_two}/start", json={"host_name": "Justin"})
     assert second_start.status_code == 200
     assert call_count["count"] == 1
+
+
+def test_start_session_enriches_restaurants_within_time_budget(
+    monkeypatch: pytest.MonkeyPatch, client, db_sessionmaker
+) -> None:
+    monkeypatch.setenv("RAPIDAPI_KEY", "test-key")
+    monkeypatch.setenv("RAPIDAPI_HOST", "example-host")
+    monkeypatch.delenv("USE_MOCK_YELP", raising=False)
+    monkeypatch.setenv("YELP_ENRICH_ON_START", "true")
+    monkeypatch.setenv("YELP_ENRICH_TIME_BUDGET_SECONDS", "0.5")
+
+    from app import main as main_module
+
+    monkeypatch.setattr(main_module, "search_pexels_fallback_images", lambda *args, **kwargs: [])
+
+    async def fake_search(self, **_):
+        return [{"id": "fast", "name": "Fast Place"}, {"id": "slow", "name": "Slow Place"}]
+
+    async def fake_dishes(self, business_id: str):
+        if business_id == "slow":
+            await asyncio.sleep(5)
+        return [{"display_name": f"{business_id} special", "review_count": 3}]
+
+    async def fake_reviews(self, business_id: str, count: int = 3):
+        return []
+
+    monkeypatch.setattr(main_module.YelpClient, "search_businesses_async", fake_search)
+    monkeypatch.setattr(main_module.YelpClient, "get_popular_dishes_async", fake_dishes)
+    monkeypatch.setattr(main_module.YelpClient, "get_reviews_async", fake_reviews)
+
+    room_code = create_default_session(client)
+    start_res = client.post(f"/sessions/{room_code}/start", json={"host_name": "Justin"})
+    assert start_res.status_code == 200
+
+    db = db_sessionmaker()
+    businesses = {business.external_id: business for business in db.scalars(select(Business))}
+    db.close()
+
+    assert businesses["fast"].popular_dishes == [{"display_name": "fast special", "review_count": 3}]
+    assert businesses["fast"].reviews == []
+    assert businesses["slow"].popular_dishes is None
+
+
+def test_start_session_writes_a_large_deck_in_one_insert(
+    monkeypatch: pytest.MonkeyPatch, client, db_sessionmaker
+) -> None:
+    monkeypatch.setenv("RAPIDAPI_KEY", "test-key")
+    monkeypatch.setenv("RAPIDAPI_HOST", "example-host")
+    monkeypatch.delenv("USE_MOCK_YELP", raising=False)
+
+    from app import main as main_module
+
+    monkeypatch.setattr(main_module, "search_pexels_fallback_images", lambda *args, **kwargs: [])
+
+    async def fake_search(self, **_):
+        return [{"id": f"biz-{index}", "name": f"Place {index}"} for index in range(120)]
+
+    monkeypatch.setattr(main_module.YelpClient, "search_businesses_async", fake_search)
+    room_code = create_default_session(client)
+    inserts: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.lstrip().upper().startswith("INSERT INTO RESTAURANTS"):
+            inserts.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        assert client.post(f"/sessions/{room_code}/start", json={"host_name": "Justin"}).status_code == 200
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+    assert len(inserts) == 1
+    db = db_sessionmaker()
+    try:
+        restaurants = db.scalars(select(Restaurant).order_by(Restaurant.id)).all()
+        assert [restaurant.external_id for restaurant in restaurants] == [f"biz-{index}" for index in range(120)]
+        assert all(restaurant.card["name"] == restaurant.name for restaurant in restaurants)
+    finally:
+        db.close()
+
+
+def test_sessions_share_catalog_businesses_and_their_enrichment(
+    monkeypatch: pytest.MonkeyPatch, client, db_sessionmaker
+) -> None:
+    monkeypatch.setenv("RAPIDAPI_KEY", "test-key")
+    monkeypatch.setenv("RAPIDAPI_HOST", "example-host")
+    monkeypatch.delenv("USE_MOCK_YELP", raising=False)
+    monkeypatch.setenv("YELP_ENRICH_ON_START", "true")
+
+    from app import main as main_module
+
+    monkeypatch.setattr(main_module, "search_pexels_fallback_images", lambda *args, **kwargs: [])
+    dish_calls: list[str] = []
+
+    async def fake_search(self, **_):
+        return [{"id": "shared", "name": "Shared Place"}]
+
+    async def fake_dishes(self, business_id: str):
+        dish_calls.append(business_id)
+        return [{"display_name": "house special", "review_count": 9}]
+
+    async def fake_reviews(self, business_id: str, count: int = 3):
+        return []
+
+    monkeypatch.setattr(main_module.YelpClient, "search_businesses_async", fake_search)
+    monkeypatch.setattr(main_module.YelpClient, "get_popular_dishes_async", fake_dishes)
+    monkeypatch.setattr(main_module.YelpClient, "get_reviews_async", fake_reviews)
+
+    room_codes = [create_default_session(client) for _ in range(2)]
+    for room_code in room_codes:
+        assert client.post(f"/sessions/{room_code}/start", json={"host_name": "Justin"}).status_code == 200
+
+    assert dish_calls == ["shared"]
+    second_card = client.get(
+        f"/sessions/{room_codes[1]}/restaurants/next", params={"user_name": "Justin"}
+    ).json()["restaurant"]
+    assert second_card["popular_dishes"][0]["display_name"] == "house special"
+
+    db = db_sessionmaker()
+    try:
+        assert len(db.scalars(select(Business)).all()) == 1
+        assert {restaurant.business_id for restaurant in db.scalars(select(Restaurant))} == {
+            db.scalar(select(Business.id))
+        }
+    finally:
+        db.close()
+
+
+def test_results_without_an_id_stay_out_of_the_shared_catalog(
+    monkeypatch: pytest.MonkeyPatch, client, db_sessionmaker
+) -> None:
+    monkeypatch.setenv("RAPIDAPI_KEY", "test-key")
+    monkeypatch.setenv("RAPIDAPI_HOST", "example-host")
+    monkeypatch.delenv("USE_MOCK_YELP", raising=False)
+    monkeypatch.setenv("YELP_ENRICH_ON_START", "true")
+
+    from app import main as main_module
+
+    monkeypatch.setattr(main_module, "search_pexels_fallback_images", lambda *args, **kwargs: [])
+    dish_calls: list[str] = []
+
+    async def fake_search(self, **_):
+        return [{"name": "Nameless Place"}]
+
+    async def fake_dishes(self, business_id: str):
+        dish_calls.append(business_id)
+        return []
+
+    monkeypatch.setattr(main_module.YelpClient, "search_businesses_async", fake_search)
+    monkeypatch.setattr(main_module.YelpClient, "get_popular_dishes_async", fake_dishes)
+    monkeypatch.setattr(main_module.YelpClient, "get_reviews_async", fake_dishes)
+
+    for _ in range(2):
+        room_code = create_default_session(client)
+        assert client.post(f"/sessions/{room_code}/start", json={"host_name": "Justin"}).status_code == 200
+
+    db = db_sessionmaker()
+    try:
+        business_ids = [restaurant.business_id for restaurant in db.scalars(select(Restaurant))]
+    finally:
+        db.close()
+    assert len(business_ids) == 2 and len(set(business_ids)) == 2
+    assert dish_calls == []
+
+
+def test_start_session_refreshes_only_the_stale_kind_of_enrichment(
+    monkeypatch: pytest.MonkeyPatch, client, db_sessionmaker
+) -> None:
+    monkeypatch.setenv("RAPIDAPI_KEY", "test-key")
+    monkeypatch.setenv("RAPIDAPI_HOST", "example-host")
+    monkeypatch.delenv("USE_MOCK_YELP", raising=False)
+    monkeypatch.setenv("YELP_ENRICH_ON_START", "true")
+
+    from app import main as main_module
+
+    monkeypatch.setattr(main_module, "search_pexels_fallback_images", lambda *args, **kwargs: [])
+    calls: list[tuple[str, str]] = []
+
+    async def fake_search(self, **_):
+        return [{"id": "stale-reviews", "name": "One"}, {"id": "stale-dishes", "name": "Two"}]
+
+    async def fake_dishes(self, business_id: str):
+        calls.append(("dishes", business_id))
+        return [{"display_name": "house special", "review_count": 9}]
+
+    async def fake_reviews(self, business_id: str, count: int = 3):
+        calls.append(("reviews", business_id))
+        return [{"text": "great", "rating": 5}]
+
+    monkeypatch.setattr(main_module.YelpClient, "search_businesses_async", fake_search)
+    monkeypatch.setattr(main_module.YelpClient, "get_popular_dishes_async", fake_dishes)
+    monkeypatch.setattr(main_module.YelpClient, "get_reviews_async", fake_reviews)
+
+    first_room = create_default_session(client)
+    assert client.post(f"/sessions/{first_room}/start", json={"host_name": "Justin"}).status_code == 200
+    assert len(calls) == 4
+
+    long_ago = datetime.now(timezone.utc) - timedelta(days=365)
+    db = db_sessionmaker()
+    db.execute(
+        update(Business).where(Business.external_id == "stale-reviews").values(reviews_fetched_at=long_ago)
+    )
+    db.execute(
+        update(Business).where(Business.external_id == "stale-dishes").values(popular_dishes_fetched_at=long_ago)
+    )
+    db.commit()
+    db.close()
+    calls.clear()
+
+    second_room = create_default_session(client)
+    assert client.post(f"/sessions/{second_room}/start", json={"host_name": "Justin"}).status_code == 200
+
+    assert sorted(calls) == [("dishes", "stale-dishes"), ("reviews", "stale-reviews")]
+    db = db_sessionmaker()
+    try:
+        businesses = {business.external_id: business for business in db.scalars(select(Business))}
+        assert as_utc(businesses["stale-dishes"].popular_dishes_fetched_at) > long_ago + timedelta(days=300)
+        assert as_utc(businesses["stale-reviews"].reviews_fetched_at) > long_ago + timedelta(days=300)
+        assert businesses["stale-reviews"].reviews == [{"text": "great", "rating": 5}]
+    finally:
+        db.close()
+
+
+def test_start_session_serves_repeat_query_from_memory_cache(
+    monkeypatch: pytest.MonkeyPatch, client, db_sessionmaker
+) -> None:
+    monkeypatch.delenv("USE_MOCK_YELP", raising=False)
+    monkeypatch.setenv("RAPIDAPI_KEY", "test-key")
+    monkeypatch.setenv("RAPIDAPI_HOST", "example-host")
+
+    from app import main as main_module
+
+    call_count = {"count": 0}
+
+    async def fake_search(self, **_):
+        call_count["count"] += 1
+        return [{"id": "cache-1", "name": "Cached Place"}]
+
+    monkeypatch.setattr(main_module.YelpClient, "search_businesses_async", fake_search)
+
+    room_code_one = create_default_session(client)
+    assert client.post(f"/sessions/{room_code_one}/start", json={"host_name": "Justin"}).status_code == 200
+
+    # With the database tier emptied, only the memory tier can satisfy the next start.
+    db = db_sessionmaker()
+    db.execute(delete(YelpQueryCache))
+    db.commit()
+    db.close()
+
+    hits_before = client.get("/metrics").json()["yelp_query_cache"]["hits"]
+    room_code_two = create_default_session(client)
+    assert client.post(f"/sessions/{room_code_two}/start", json={"host_name": "Justin"}).status_code == 200
+    assert call_count["count"] == 1
+    assert client.get("/metrics").json()["yelp_query_cache"]["hits"] == hits_before + 1
+
+
+def test_start_session_serves_stale_cache_row_and_refreshes_in_background(
+    monkeypatch: pytest.MonkeyPatch, client, db_sessionmaker
+) -> None:
+    monkeypatch.delenv("USE_MOCK_YELP", raising=False)
+    monkeypatch.setenv("RAPIDAPI_KEY", "test-key")
+    monkeypatch.setenv("RAPIDAPI_HOST", "example-host")
+    monkeypatch.setenv("YELP_CACHE_TTL_MINUTES", "60")
+    monkeypatch.setenv("YELP_CACHE_HARD_TTL_MINUTES", "1440")
+
+    from app import main as main_module
+    from app.search_cache import build_query_key, drain_background_refreshes
+
+    monkeypatch.setattr(main_module, "search_pexels_fallback_images", lambda *args, **kwargs: [])
+
+    async def fake_search(self, **_):
+        return [{"id": "fresh-1", "name": "Fresh Place"}]
+
+    monkeypatch.setattr(main_module.YelpClient, "search_businesses_async", fake_search)
+
+    db = db_sessionmaker()
+    db.add(
+        YelpQueryCache(
+            query_key=build_query_key(
+                term="sushi", location_text="San Francisco, CA", price="1,2", radius_meters=3000
+            ),
+            term="sushi",
+            location_text="San Francisco, CA",
+            price="1,2",
+            radius_meters=3000,
+            results=[{"id": "stale-1", "name": "Stale Place"}],
+            created_at=datetime.now(timezone.utc) - timedelta(hours=2),
+        )
+    )
+    db.commit()
+    db.close()
+
+    room_code = create_default_session(client)
+    assert client.post(f"/sessions/{room_code}/start", json={"host_name": "Justin"}).status_code == 200
+    client.portal.call(drain_background_refreshes)
+
+    db = db_sessionmaker()
+    session = db.scalar(select(SessionModel).where(SessionModel.room_code == room_code))
+    restaurant = db.scalar(select(Restaurant).where(Restaurant.session_id == session.id))
+    cache_row = db.scalar(select(YelpQueryCache))
+    db.close()
+
+    assert restaurant.external_id == "stale-1"
+    assert cache_row.results == [{"id": "fresh-1", "name": "Fresh Place"}]
+    counters = client.get("/metrics").json()["yelp_search"]
+    assert counters["stale_serves"] >= 1
+    assert counters["background_refreshes"] >= 1
+
+
+def test_start_session_fetches_pages_concurrently_and_stops_after_a_short_page(
+    monkeypatch: pytest.MonkeyPatch, client, db_sessionmaker
+) -> None:
+    monkeypatch.delenv("USE_MOCK_YELP", raising=False)
+    monkeypatch.setenv("RAPIDAPI_KEY", "test-key")
+    monkeypatch.setenv("RAPIDAPI_HOST", "example-host")
+    monkeypatch.setenv("YELP_SEARCH_PAGES", "4")
+    monkeypatch.setenv("YELP_SEARCH_PAGE_SIZE", "2")
+
+    from app import main as main_module
+
+    monkeypatch.setattr(main_module, "search_pexels_fallback_images", lambda *args, **kwargs: [])
+    pages = {
+        0: [{"id": "a", "name": "A"}, {"id": "b", "name": "B"}],
+        2: [{"id": "b", "name": "B"}, {"id": "c", "name": "C"}],
+        4: [{"id": "d", "name": "D"}],
+        6: [{"id": "e", "name": "E"}],
+    }
+    offsets: list[int] = []
+
+    async def fake_search(self, *, limit: int, offset: int, **_):
+        assert limit == 2
+        offsets.append(offset)
+        await asyncio.sleep(0)
+        return pages[offset]
+
+    monkeypatch.setattr(main_module.YelpClient, "search_businesses_async", fake_search)
+
+    room_code = create_default_session(client)
+    assert client.post(f"/sessions/{room_code}/start", json={"host_name": "Justin"}).status_code == 200
+
+    db = db_sessionmaker()
+    session = db.scalar(select(SessionModel).where(SessionModel.room_code == room_code))
+    external_ids = list(
+        db.scalars(select(Restaurant.external_id).where(Restaurant.session_id == session.id).order_by(Restaurant.id))
+    )
+    cached_keys = set(db.scalars(select(YelpQueryCache.query_key)))
+    db.close()
+
+    assert external_ids == ["a", "b", "c", "d"]
+    assert sorted(offsets)[:3] == [0, 2, 4]
+    assert {key.rsplit("|", 1)[-1] for key in cached_keys} >= {"3000", "@2", "@4"}
+
+
+def test_start_session_keeps_earlier_pages_when_a_later_page_times_out(
+    monkeypatch: pytest.MonkeyPatch, client, db_sessionmaker
+) -> None:
+    monkeypatch.delenv("USE_MOCK_YELP", raising=False)
+    monkeypatch.setenv("RAPIDAPI_KEY", "test-key")
+    monkeypatch.setenv("RAPIDAPI_HOST", "example-host")
+    monkeypatch.setenv("YELP_SEARCH_PAGES", "2")
+    monkeypatch.setenv("YELP_SEARCH_PAGE_SIZE", "1")
+    monkeypatch.setenv("YELP_SEARCH_PAGE_TIMEOUT_SECONDS", "0.05")
+
+    from app import main as main_module
+
+    monkeypatch.setattr(main_module, "search_pexels_fallback_images", lambda *args, **kwargs: [])
+
+    async def fake_search(self, *, offset: int, **_):
+        if offset:
+            await asyncio.sleep(1)
+        return [{"id": f"page-{offset}", "name": "Place"}]
+
+    monkeypatch.setattr(main_module.YelpClient, "search_businesses_async", fake_search)
+
+    room_code = create_default_session(client)
+    assert client.post(f"/sessions/{room_code}/start", json={"host_name": "Justin"}).status_code == 200
+
+    db = db_sessionmaker()
+    session = db.scalar(select(SessionModel).where(SessionModel.room_code == room_code))
+    external_ids = list(db.scalars(select(Restaurant.external_id).where(Restaurant.session_id == session.id)))
+    db.close()
+
+    assert external_ids == ["page-0"]
+    assert client.get("/metrics").json()["yelp_search"]["page_timeouts"] == 1
+
+
+def test_progressive_start_deals_the_first_page_and_extends_the_deck_in_background(
+    monkeypatch: pytest.MonkeyPatch, client, db_sessionmaker
+) -> None:
+    monkeypatch.delenv("USE_MOCK_YELP", raising=False)
+    monkeypatch.setenv("RAPIDAPI_KEY", "test-key")
+    monkeypatch.setenv("RAPIDAPI_HOST", "example-host")
+    monkeypatch.setenv("PROGRESSIVE_SESSION_START", "true")
+    monkeypatch.setenv("YELP_SEARCH_PAGES", "2")
+    monkeypatch.setenv("YELP_SEARCH_PAGE_SIZE", "1")
+
+    from app import main as main_module
+
+    pexels_calls: list[int] = []
+
+    def fake_pexels(query: str, limit: int) -> list[str]:
+        pexels_calls.append(limit)
+        return [f"https://pexels.example/{index}.jpg" for index in range(limit)]
+
+    async def fake_search(self, *, offset: int, **_):
+        return [{"id": f"page-{offset}", "name": f"Place {offset}"}]
+
+    broadcasts: list[dict] = []
+
+    async def record_broadcast(room_code: str, message: dict) -> None:
+        broadcasts.append(message)
+
+    monkeypatch.setattr(main_module, "search_pexels_fallback_images", fake_pexels)
+    monkeypatch.setattr(main_module.YelpClient, "search_businesses_async", fake_search)
+    monkeypatch.setattr(main_module.ws_manager, "broadcast", record_broadcast)
+
+    room_code = create_default_session(client)
+    start_res = client.post(f"/sessions/{room_code}/start", json={"host_name": "Justin"})
+    assert start_res.status_code == 200
+    assert start_res.json()["status"] == "active"
+    client.portal.call(main_module.drain_deck_extensions)
+
+    db = db_sessionmaker()
+    session = db.scalar(select(SessionModel).where(SessionModel.room_code == room_code))
+    restaurants = list(
+        db.scalars(select(Restaurant).where(Restaurant.session_id == session.id).order_by(Restaurant.id))
+    )
+    db.close()
+
+    assert [restaurant.external_id for restaurant in restaurants] == ["page-0", "page-1"]
+    assert [restaurant.image_url for restaurant in restaurants] == [
+        "https://pexels.example/0.jpg",
+        "https://pexels.example/1.jpg",
+    ]
+    # The first page is dealt without waiting on Pexels; one lookup covers the whole deck afterwards.
+    assert pexels_calls == [2]
+    assert [message["event"] for message in broadcasts] == ["session_started", "deck_extended"]
+    assert broadcasts[1]["added"] == 1
+    assert broadcasts[1]["updated"] == 1
+    assert broadcasts[1]["restaurant_count"] == 2
+
+    next_res = client.get(f"/sessions/{room_code}/restaurants/next", params={"user_name": "Justin"})
+    assert next_res.status_code == 200
+    assert next_res.json()["restaurant"]["image_url"] == "https://pexels.example/0.jpg"
+
+
+def test_progressive_start_still_pictures_the_dealt_cards_when_a_later_page_fails(
+    monkeypatch: pytest.MonkeyPatch, client, db_sessionmaker
+) -> None:
+    monkeypatch.delenv("USE_MOCK_YELP", raising=False)
+    monkeypatch.setenv("RAPIDAPI_KEY", "test-key")
+    monkeypatch.setenv("RAPIDAPI_HOST", "example-host")
+    monkeypatch.setenv("PROGRESSIVE_SESSION_START", "true")
+    monkeypatch.setenv("YELP_SEARCH_PAGES", "2")
+    monkeypatch.setenv("YELP_SEARCH_PAGE_SIZE", "1")
+
+    from app import main as main_module
+    from app.integrations.yelp_client import YelpClientError
+
+    async def fake_search(self, *, offset: int, **_):
+        if offset:
+            raise YelpClientError("RapidAPI Yelp returned 503")
+        return [{"id": "page-0", "name": "Place 0"}]
+
+    monkeypatch.setattr(
+        main_module, "search_pexels_fallback_images", lambda query, limit: ["https://pexels.example/0.jpg"] * limit
+    )
+    monkeypatch.setattr(main_module.YelpClient, "search_businesses_async", fake_search)
+
+    room_code = create_default_session(client)
+    assert client.post(f"/sessions/{room_code}/start", json={"host_name": "Justin"}).status_code == 200
+    client.portal.call(main_module.drain_deck_extensions)
+
+    db = db_sessionmaker()
+    restaurants = list(db.scalars(select(Restaurant)))
+    db.close()
+    assert [restaurant.image_url for restaurant in restaurants] == ["https://pexels.example/0.jpg"]
+
+
+def test_progressive_start_skips_later_pages_after_a_short_first_page(
+    monkeypatch: pytest.MonkeyPatch, client, db_sessionmaker
+) -> None:
+    monkeypatch.delenv("USE_MOCK_YELP", raising=False)
+    monkeypatch.setenv("RAPIDAPI_KEY", "test-key")
+    monkeypatch.setenv("RAPIDAPI_HOST", "example-host")
+    monkeypatch.setenv("PROGRESSIVE_SESSION_START", "true")
+    monkeypatch.setenv("YELP_SEARCH_PAGES", "2")
+    monkeypatch.setenv("YELP_SEARCH_PAGE_SIZE", "2")
+
+    from app import main as main_module
+
+    offsets: list[int] = []
+
+    async def fake_search(self, *, offset: int, **_):
+        offsets.append(offset)
+        return [{"id": f"page-{offset}", "name": f"Place {offset}", "image_url": "https://yelp.example/0.jpg"}]
+
+    monkeypatch.setattr(main_module.YelpClient, "search_businesses_async", fake_search)
+
+    room_code = create_default_session(client)
+    assert client.post(f"/sessions/{room_code}/start", json={"host_name": "Justin"}).status_code == 200
+    client.portal.call(main_module.drain_deck_extensions)
+
+    db = db_sessionmaker()
+    external_ids = list(db.scalars(select(Restaurant.external_id)))
+    db.close()
+    assert external_ids == ["page-0"]
+    assert offsets == [0]
+
+
+def seed_broad_sushi_search(db_sessionmaker, results: list[dict]) -> None:
+    from app.search_cache import build_query_key
+
+    db = db_sessionmaker()
+    db.add(
+        YelpQueryCache(
+            query_key=build_query_key(
+                term="sushi", location_text="San Francisco, CA", price=None, radius_meters=10000
+            ),
+            term="sushi",
+            location_text="San Francisco, CA",
+            price=None,
+            radius_meters=10000,
+            results=results,
+        )
+    )
+    db.commit()
+    db.close()
+
+
+def test_start_session_narrows_a_broader_cached_search_instead_of_going_upstream(
+    monkeypatch: pytest.MonkeyPatch, client, db_sessionmaker
+) -> None:
+    monkeypatch.delenv("USE_MOCK_YELP", raising=False)
+    monkeypatch.setenv("RAPIDAPI_KEY", "test-key")
+    monkeypatch.setenv("RAPIDAPI_HOST", "example-host")
+    monkeypatch.setenv("YELP_SUBSUMPTION_MIN_RESULTS", "3")
+
+    from app import main as main_module
+
+    monkeypatch.setattr(main_module, "search_pexels_fallback_images", lambda *args, **kwargs: [])
+
+    async def fail_search(self, **_):
+        raise AssertionError("a covered search should not go upstream")
+
+    monkeypatch.setattr(main_module.YelpClient, "search_businesses_async", fail_search)
+    hits_before = client.get("/metrics").json()["yelp_search"].get("subsumption_hits", 0)
+    seed_broad_sushi_search(
+        db_sessionmaker,
+        [
+            {"id": "near-cheap", "name": "A", "price": "$", "distance": 500},
+            {"id": "near-mid", "name": "B", "price": "$$", "distance": 2900},
+            {"id": "near-pricey", "name": "C", "price": "$$$$", "distance": 800},
+            {"id": "far-cheap", "name": "D", "price": "$", "distance": 7000},
+            {"id": "near-unpriced", "name": "E", "distance": 100},
+            {"id": "near-mid-2", "name": "F", "price": "$$", "distance": 1200},
+        ],
+    )
+
+    room_code = create_default_session(client)
+    assert client.post(f"/sessions/{room_code}/start", json={"host_name": "Justin"}).status_code == 200
+
+    db = db_sessionmaker()
+    session = db.scalar(select(SessionModel).where(SessionModel.room_code == room_code))
+    external_ids = list(
+        db.scalars(select(Restaurant.external_id).where(Restaurant.session_id == session.id).order_by(Restaurant.id))
+    )
+    db.close()
+
+    assert external_ids == ["near-cheap", "near-mid", "near-mid-2"]
+    assert client.get("/metrics").json()["yelp_search"]["subsumption_hits"] == hits_before + 1
+
+
+def test_start_session_goes_upstream_when_the_narrowed_result_is_too_small(
+    monkeypatch: pytest.MonkeyPatch, client, db_sessionmaker
+) -> None:
+    monkeypatch.delenv("USE_MOCK_YELP", raising=False)
+    monkeypatch.setenv("RAPIDAPI_KEY", "test-key")
+    monkeypatch.setenv("RAPIDAPI_HOST", "example-host")
+    monkeypatch.setenv("YELP_SUBSUMPTION_MIN_RESULTS", "3")
+
+    from app import main as main_module
+
+    monkeypatch.setattr(main_module, "search_pexels_fallback_images", lambda *args, **kwargs: [])
+    calls = {"count": 0}
+
+    async def fake_search(self, **_):
+        calls["count"] += 1
+        return [{"id": "upstream-1", "name": "Upstream"}]
+
+    monkeypatch.setattr(main_module.YelpClient, "search_businesses_async", fake_search)
+    before = client.get("/metrics").json()["yelp_search"]
+    seed_broad_sushi_search(
+        db_sessionmaker,
+        [
+            {"id": "near-cheap", "name": "A", "price": "$", "coordinates": {"latitude": 37.78, "longitude": -122.41}},
+            {"id": "far-cheap", "name": "B", "price": "$", "coordinates": {"latitude": 37.87, "longitude": -122.27}},
+        ],
+    )
+
+    room_code = create_default_session(client)
+    assert client.post(f"/sessions/{room_code}/start", json={"host_name": "Justin"}).status_code == 200
+
+    assert calls["count"] == 1
+    counters = client.get("/metrics").json()["yelp_search"]
+    assert counters["subsumption_too_small"] == before.get("subsumption_too_small", 0) + 1
+    assert counters.get("subsumption_hits", 0) == before.get("subsumption_hits", 0)
+
+
+def test_filter_superset_results_measures_from_the_median_center_without_distances() -> None:
+    from app.search_cache import filter_superset_results
+
+    businesses = [
+        {"id": "center", "coordinates": {"latitude": 37.7749, "longitude": -122.4194}},
+        {"id": "1km", "coordinates": {"latitude": 37.7839, "longitude": -122.4194}},
+        {"id": "5km", "coordinates": {"latitude": 37.8199, "longitude": -122.4194}},
+        {"id": "no-coordinates"},
+    ]
+
+    narrowed = filter_superset_results(businesses, price=None, radius_meters=2000, widened_radius=True)
+
+    assert [business["id"] for business in narrowed] == ["center", "1km"]
+
+
+def test_room_cache_is_invalidated_by_session_writes(monkeypatch: pytest.MonkeyPatch, client) -> None:
+    monkeypatch.setenv("USE_MOCK_YELP", "true")
+
+    from app.rooms import room_cache
+
+    room_code = create_default_session(client)
+    next_url = f"/sessions/{room_code}/restaurants/next"
+    assert client.get(next_url, params={"user_name": "Justin"}).status_code == 409
+    assert room_cache.get(room_code).status == "waiting"
+
+    assert client.patch(f"/sessions/{room_code}", json={"cuisine": "ramen"}).status_code == 200
+    assert room_cache.get(room_code) is None
+
+    assert client.post(f"/sessions/{room_code}/start", json={"host_name": "Justin"}).status_code == 200
+    assert client.get(next_url, params={"user_name": "Justin"}).status_code == 200
+    assert room_cache.get(room_code).status == "active"
+
+    assert client.delete(f"/sessions/{room_code}").status_code == 200
+    assert client.get(next_url, params={"user_name": "Justin"}).status_code == 404
+
+
+def test_room_invalidations_from_other_workers_clear_the_local_entry(
+    monkeypatch: pytest.MonkeyPatch, client
+) -> None:
+    from app import main as main_module
+    from app.realtime import CONTROL_KEY
+    from app.rooms import ROOM_INVALIDATED, room_cache
+
+    room_code = create_default_session(client)
+    assert client.get(f"/sessions/{room_code}/results").status_code == 200
+    assert room_cache.get(room_code) is not None
+
+    # What the bus hands this worker when another one writes the session.
+    client.portal.call(
+        main_module.ws_manager.deliver, room_code, {"event": ROOM_INVALIDATED, CONTROL_KEY: True}
+    )
+
+    assert room_cache.get(room_code) is None
@@ -1,4 +1,6 @@
 import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 
 
 def create_active_session(client, monkeypatch: pytest.MonkeyPatch, participants: list[str] | None = None) -> str:
@@ -9,15 +11,16 @@ def create_active_session(client, monkeypatch: pytest.MonkeyPatch, participants:
 
     from app import main as main_module
 
-    def fake_search(
-        self, *, term: str, location: str, price: str | None, radius_meters: int | None, limit: int = 30
+    async def fake_search(
+        self, *, term: str, location: str, price: str | None, radius_meters: int | None,
+        limit: int = 30, offset: int = 0,
     ):
         return [
             {"id": "rest-a", "name": "A Place", "location": {"display_address": ["1 Main St"]}},
             {"id": "rest-b", "name": "B Place", "location": {"display_address": ["2 Main St"]}},
         ]
 
-    monkeypatch.setattr(main_module.YelpClient, "search_businesses", fake_search)
+    monkeypatch.setattr(main_module.YelpClient, "search_businesses_async", fake_search)
 
     create_res = client.post(
         "/sessions",
@@ -127,3 +130,110 @@ def test_match_detected_when_all_participants_vote_yes(monkeypatch: pytest.Monke
     payload = second_vote.json()
     assert payload["matched"] is True
     assert payload["matched_restaurant_id"] == first_restaurant
+
+
+def test_submit_vote_rejects_restaurant_outside_session(monkeypatch: pytest.MonkeyPatch, client) -> None:
+    room_code = create_active_session(client, monkeypatch)
+
+    vote_res = client.post(
+        f"/sessions/{room_code}/votes",
+        json={"user_name": "Justin", "restaurant_id": 999999, "decision": "yes"},
+    )
+    assert vote_res.status_code == 404
+    assert vote_res.json()["detail"] == "Restaurant not found in session"
+
+
+def test_submit_vote_rejects_unknown_participant(monkeypatch: pytest.MonkeyPatch, client) -> None:
+    room_code = create_active_session(client, monkeypatch)
+    restaurant_id = client.get(
+        f"/sessions/{room_code}/restaurants/next", params={"user_name": "Justin"}
+    ).json()["restaurant"]["id"]
+
+    vote_res = client.post(
+        f"/sessions/{room_code}/votes",
+        json={"user_name": "Stranger", "restaurant_id": restaurant_id, "decision": "yes"},
+    )
+    assert vote_res.status_code == 404
+    assert vote_res.json()["detail"] == "Participant not found in session"
+
+
+def test_submit_vote_on_last_card_returns_no_next_restaurant(monkeypatch: pytest.MonkeyPatch, client) -> None:
+    room_code = create_active_session(client, monkeypatch)
+    first_id = client.get(
+        f"/sessions/{room_code}/restaurants/next", params={"user_name": "Justin"}
+    ).json()["restaurant"]["id"]
+    first_vote = client.post(
+        f"/sessions/{room_code}/votes",
+        json={"user_name": "Justin", "restaurant_id": first_id, "decision": "no"},
+    ).json()
+    second_id = first_vote["next_restaurant"]["id"]
+
+    last_vote = client.post(
+        f"/sessions/{room_code}/votes",
+        json={"user_name": "Justin", "restaurant_id": second_id, "decision": "yes"},
+    )
+    assert last_vote.status_code == 200
+    payload = last_vote.json()
+    assert payload["next_restaurant"] is None
+    assert payload["next_total_votes"] == 0
+    assert payload["matched"] is True
+
+
+def test_card_paths_do_not_select_business_payload(monkeypatch: pytest.MonkeyPatch, client) -> None:
+    room_code = create_active_session(client, monkeypatch)
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        restaurant_id = client.get(
+            f"/sessions/{room_code}/restaurants/next", params={"user_name": "Justin"}
+        ).json()["restaurant"]["id"]
+        assert client.post(
+            f"/sessions/{room_code}/votes",
+            json={"user_name": "Justin", "restaurant_id": restaurant_id, "decision": "yes"},
+        ).status_code == 200
+        assert client.get(f"/sessions/{room_code}/results").status_code == 200
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+    assert statements
+    assert not [statement for statement in statements if "payload" in statement]
+
+
+def test_swipes_resolve_the_room_without_querying_sessions(monkeypatch: pytest.MonkeyPatch, client) -> None:
+    room_code = create_active_session(client, monkeypatch)
+    assert client.get(f"/sessions/{room_code}/restaurants/next", params={"user_name": "Justin"}).status_code == 200
+
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        assert client.get(f"/sessions/{room_code}/restaurants/next", params={"user_name": "Justin"}).status_code == 200
+        assert client.get(f"/sessions/{room_code}/results").status_code == 200
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+    assert statements
+    assert not [statement for statement in statements if "FROM sessions" in statement]
+
+
+def test_next_card_rechecks_a_cached_status_before_refusing(monkeypatch: pytest.MonkeyPatch, client) -> None:
+    from app.rooms import RoomRef, room_cache
+
+    room_code = create_active_session(client, monkeypatch)
+    assert client.get(f"/sessions/{room_code}/restaurants/next", params={"user_name": "Justin"}).status_code == 200
+    room = room_cache.get(room_code)
+    # As left behind on a worker that never heard about the start.
+    stale = RoomRef(room.session_id, "waiting", room.host_name, room.owner_user_id)
+    room_cache.put(room_code, stale, room_cache.version)
+
+    res = client.get(f"/sessions/{room_code}/restaurants/next", params={"user_name": "Justin"})
+
+    assert res.status_code == 200
+    assert room_cache.get(room_code).status == "active"
@@ -0,0 +1,54 @@
+import asyncio
+
+import httpx
+
+from app.integrations.yelp_client import HostLimitedTransport, YelpClient
+
+
+def test_async_variants_reuse_shared_http_client() -> None:
+    seen_paths: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_paths.append(request.url.path)
+        assert request.headers["X-RapidAPI-Key"] == "test-key"
+        if request.url.path == "/search":
+            return httpx.Response(200, json={"businesses": [{"id": "abc123"}]})
+        if request.url.path == "/popular_dish":
+            return httpx.Response(200, json={"data": {"popular_dishes": [{"display_name": "Nigiri"}]}})
+        return httpx.Response(200, json={"reviews": [{"text": {"full": "Great"}, "rating": 5}]})
+
+    async def run() -> tuple[list[dict], list[dict], list[dict]]:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+            client = YelpClient("test-key", "example-host", "https://yelp.example", http_client=http_client)
+            return (
+                await client.search_businesses_async(
+                    term="sushi", location="San Francisco, CA", price=None, radius_meters=None
+                ),
+                await client.get_popular_dishes_async("abc123"),
+                await client.get_reviews_async("abc123"),
+            )
+
+    businesses, dishes, reviews = asyncio.run(run())
+    assert businesses == [{"id": "abc123"}]
+    assert dishes == [{"display_name": "Nigiri"}]
+    assert reviews[0]["text"] == "Great"
+    assert seen_paths == ["/search", "/popular_dish", "/reviews"]
+
+
+def test_host_limited_transport_caps_in_flight_requests_per_host() -> None:
+    in_flight = {"current": 0, "peak": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        in_flight["current"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["current"])
+        await asyncio.sleep(0.01)
+        in_flight["current"] -= 1
+        return httpx.Response(200, json={})
+
+    async def run() -> None:
+        transport = HostLimitedTransport(httpx.MockTransport(handler), max_per_host=2)
+        async with httpx.AsyncClient(transport=transport) as http_client:
+            await asyncio.gather(*(http_client.get("https://yelp.example/search") for _ in range(6)))
+
+    asyncio.run(run())
+    assert in_flight["peak"] == 2
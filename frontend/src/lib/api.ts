@@ -6,6 +6,7 @@ import type {
   MySessionsResponse,
   NextRestaurantResponse,
   PopularDishItem,
+  RestaurantEnrichmentResponse,
   ReviewItem,
   SessionResultsResponse,
   SessionResponse,
@@ -14,6 +15,16 @@ import type {
   VoteResponse,
 } from "../types";
 
+export type EnrichmentInclude = "dishes" | "reviews";
+export type MySessionsInclude = "hosted" | "joined" | "participants";
+
+export interface MySessionsQuery {
+  limit?: number;
+  hostedCursor?: string | null;
+  joinedCursor?: string | null;
+  include?: MySessionsInclude[];
+}
+
 export interface UpdateFiltersPayload {
   location_text?: string | null;
   cuisine?: string | null;
@@ -101,8 +112,15 @@ export async function validateLocation(locationText: string): Promise<{ valid: b
   return data;
 }
 
-export async function getMySessions(): Promise<MySessionsResponse> {
-  const { data } = await api.get<MySessionsResponse>("/sessions/my");
+export async function getMySessions(query: MySessionsQuery = {}): Promise<MySessionsResponse> {
+  const { data } = await api.get<MySessionsResponse>("/sessions/my", {
+    params: {
+      limit: query.limit,
+      hosted_cursor: query.hostedCursor ?? undefined,
+      joined_cursor: query.joinedCursor ?? undefined,
+      include: (query.include ?? ["hosted", "joined"]).join(","),
+    },
+  });
   return data;
 }
 
@@ -134,3 +152,15 @@ export async function getPopularDishes(
   );
   return data;
 }
+
+export async function getRestaurantsEnrichment(
+  roomCode: string,
+  restaurantIds: number[],
+  include: EnrichmentInclude[] = ["dishes", "reviews"],
+): Promise<RestaurantEnrichmentResponse> {
+  const { data } = await api.get<RestaurantEnrichmentResponse>(
+    `/sessions/${roomCode}/restaurants/enrichment`,
+    { params: { ids: restaurantIds.join(","), include: include.join(",") } },
+  );
+  return data;
+}
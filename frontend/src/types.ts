@@ -97,6 +97,17 @@ export interface SessionResultsResponse {
   results: SessionResultItem[];
 }
 
+export interface RestaurantEnrichmentItem {
+  restaurant_id: number;
+  popular_dishes?: PopularDishItem[] | null;
+  reviews?: ReviewItem[] | null;
+}
+
+export interface RestaurantEnrichmentResponse {
+  results: RestaurantEnrichmentItem[];
+  pending: number[];
+}
+
 export interface SessionResponse {
   id: string;
   room_code: string;
@@ -131,4 +142,6 @@ export interface SessionSummary {
 export interface MySessionsResponse {
   hosted: SessionSummary[];
   joined: SessionSummary[];
+  hosted_next_cursor: string | null;
+  joined_next_cursor: string | null;
 }